@@ -0,0 +1,131 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from backend.timeline import WordTimeline
+from backend.config import (
+    ACOUSTIC_FRAME_SECONDS,
+    ACOUSTIC_HOP_SECONDS,
+    ACOUSTIC_BLOCK_SECONDS,
+    PITCH_MIN_HZ,
+    PITCH_MAX_HZ,
+    VOICING_THRESHOLD,
+)
+
+FRAME_BLOCK = 2048
+SILENCE_DB = -60.0
+
+
+def frame_signal(pcm: np.ndarray, sample_rate: int) -> np.ndarray:
+    frame_len = int(ACOUSTIC_FRAME_SECONDS * sample_rate)
+    hop = int(ACOUSTIC_HOP_SECONDS * sample_rate)
+    if pcm.size < frame_len:
+        pcm = np.pad(pcm, (0, frame_len - pcm.size))
+    return sliding_window_view(pcm, frame_len)[::hop]
+
+
+def frame_power(frames: np.ndarray) -> np.ndarray:
+    return np.mean(np.square(frames, dtype=np.float64), axis=1)
+
+
+def frame_pitch(frames: np.ndarray, sample_rate: int, power: np.ndarray) -> np.ndarray:
+    frame_len = frames.shape[1]
+    n_fft = 1 << int(np.ceil(np.log2(2 * frame_len)))
+    min_lag = max(1, int(sample_rate / PITCH_MAX_HZ))
+    max_lag = min(frame_len - 1, int(sample_rate / PITCH_MIN_HZ))
+    f0 = np.zeros(frames.shape[0], dtype=np.float32)
+
+    for block_start in range(0, frames.shape[0], FRAME_BLOCK):
+        block = frames[block_start:block_start + FRAME_BLOCK]
+        block = block - block.mean(axis=1, keepdims=True)
+        spectrum = np.fft.rfft(block, n=n_fft, axis=1)
+        autocorr = np.fft.irfft(np.abs(spectrum) ** 2, n=n_fft, axis=1)[:, :max_lag + 1]
+
+        energy = np.maximum(autocorr[:, 0], 1e-12)
+        lags = autocorr[:, min_lag:max_lag + 1] / energy[:, None]
+        best = np.argmax(lags, axis=1)
+        strength = lags[np.arange(lags.shape[0]), best]
+
+        voiced = (strength > VOICING_THRESHOLD) & (
+            10 * np.log10(np.maximum(power[block_start:block_start + len(block)], 1e-12)) > SILENCE_DB + 20
+        )
+        f0[block_start:block_start + len(block)] = np.where(
+            voiced, sample_rate / (best + min_lag), 0.0
+        )
+
+    return f0
+
+
+def syllable_peaks(power: np.ndarray) -> np.ndarray:
+    envelope_db = 10 * np.log10(np.maximum(power, 1e-12))
+    envelope_db = np.convolve(envelope_db, np.ones(5) / 5, mode="same")
+    floor = np.percentile(envelope_db, 20) if envelope_db.size else SILENCE_DB
+
+    peaks = np.zeros(envelope_db.shape, dtype=bool)
+    if envelope_db.size >= 3:
+        middle = envelope_db[1:-1]
+        peaks[1:-1] = (
+            (middle > envelope_db[:-2])
+            & (middle >= envelope_db[2:])
+            & (middle > floor + 10)
+        )
+    return peaks
+
+
+def _range_sums(prefix: np.ndarray, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+    return prefix[last] - prefix[first]
+
+
+def compute_word_features(
+    pcm: np.ndarray,
+    sample_rate: int,
+    starts: np.ndarray,
+    ends: np.ndarray,
+) -> dict:
+    frames = frame_signal(pcm, sample_rate)
+    power = frame_power(frames)
+    f0 = frame_pitch(frames, sample_rate, power)
+    peaks = syllable_peaks(power)
+
+    n_frames = power.shape[0]
+    first = np.clip(np.floor(starts / ACOUSTIC_HOP_SECONDS).astype(np.int64), 0, n_frames)
+    last = np.clip(np.ceil(ends / ACOUSTIC_HOP_SECONDS).astype(np.int64), 0, n_frames)
+    last = np.maximum(last, np.minimum(first + 1, n_frames))
+
+    def prefix(values: np.ndarray) -> np.ndarray:
+        return np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+
+    frame_counts = np.maximum(last - first, 1)
+    voiced = f0 > 0
+    voiced_counts = _range_sums(prefix(voiced), first, last)
+
+    mean_power = _range_sums(prefix(power), first, last) / frame_counts
+    mean_f0 = np.divide(
+        _range_sums(prefix(f0), first, last),
+        voiced_counts,
+        out=np.zeros_like(voiced_counts),
+        where=voiced_counts > 0,
+    )
+    syllables = _range_sums(prefix(peaks), first, last)
+    durations = np.maximum(ends - starts, ACOUSTIC_HOP_SECONDS)
+
+    return {
+        "rms_db": np.maximum(10 * np.log10(np.maximum(mean_power, 1e-12)), SILENCE_DB),
+        "f0_hz": mean_f0,
+        "syllable_rate": syllables / durations,
+    }
+
+
+def annotate_timeline(pcm: np.ndarray, sample_rate: int, timeline: WordTimeline) -> None:
+    """Features for every word, computed over ~ACOUSTIC_BLOCK_SECONDS of audio at a time to bound the frame matrices."""
+    if not len(timeline):
+        return
+    starts, ends = timeline.starts, timeline.ends
+    hop = int(ACOUSTIC_HOP_SECONDS * sample_rate)
+    bounds = np.flatnonzero(np.diff(np.floor(starts / ACOUSTIC_BLOCK_SECONDS))) + 1
+    blocks = []
+    for first, last in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(timeline)]))):
+        # A second of context either side keeps edge frames and the syllable envelope whole.
+        offset = max(0, int((starts[first] - 1.0) * sample_rate) // hop * hop)
+        end = int(np.ceil((ends[first:last].max() + 1.0) * sample_rate))
+        shift = offset / sample_rate
+        blocks.append(compute_word_features(pcm[offset:end], sample_rate, starts[first:last] - shift, ends[first:last] - shift))
+    timeline.features.update({name: np.concatenate([b[name] for b in blocks]) for name in blocks[0]})
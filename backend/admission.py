@@ -0,0 +1,145 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from backend.config import (
+    ADMISSION_BUDGET,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_COST_WEIGHT,
+    ADMISSION_INITIAL_SECONDS_PER_UNIT,
+    MODEL_COST_FACTORS,
+)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Server busy, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class AdmissionTicket:
+    """A held slot; `recharge` corrects the cost once the real audio length is known."""
+
+    def __init__(self, controller: "AdmissionController", cost: float, estimated_wait: float, queued_seconds: float):
+        self._controller = controller
+        self.cost = cost
+        self.estimated_cost = cost
+        self.estimated_wait = estimated_wait
+        self.queued_seconds = queued_seconds
+
+    def recharge(self, cost: float):
+        self._controller.in_use = max(0.0, self._controller.in_use + cost - self.cost)
+        self.cost = cost
+        self._controller._dispatch()
+
+    def to_dict(self) -> dict:
+        return {
+            "cost": round(self.cost, 1),
+            "estimated_cost": round(self.estimated_cost, 1),
+            "estimated_wait_seconds": round(self.estimated_wait, 2),
+            "queued_seconds": round(self.queued_seconds, 2),
+        }
+
+
+class AdmissionController:
+    def __init__(self, budget: float = ADMISSION_BUDGET, max_queue: int = ADMISSION_MAX_QUEUE):
+        self.budget = budget
+        self.max_queue = max_queue
+        self.in_use = 0.0
+        self.running = 0
+        self._queue: list = []
+        self._queued_cost = 0.0
+        self._counter = itertools.count()
+        self._seconds_per_unit = ADMISSION_INITIAL_SECONDS_PER_UNIT
+
+    @staticmethod
+    def estimate_cost(duration_seconds: float, model: str) -> float:
+        return max(duration_seconds, 1.0) * MODEL_COST_FACTORS.get(model, 1.0)
+
+    def estimate_wait(self, cost: float) -> float:
+        backlog = self._queued_cost + max(0.0, self.in_use + cost - self.budget)
+        if backlog <= 0:
+            return 0.0
+        parallelism = max(1, self.running)
+        return backlog * self._seconds_per_unit / parallelism
+
+    def stats(self) -> dict:
+        return {
+            "budget": self.budget,
+            "in_use": round(self.in_use, 1),
+            "running": self.running,
+            "queued": len(self._queue),
+            "max_queue": self.max_queue,
+            "seconds_per_unit": round(self._seconds_per_unit, 4),
+        }
+
+    def _fits(self, cost: float) -> bool:
+        return self.in_use == 0 or self.in_use + cost <= self.budget
+
+    def _grant(self, cost: float):
+        self.in_use += cost
+        self.running += 1
+
+    def _dispatch(self):
+        while self._queue:
+            _, _, cost, future = self._queue[0]
+            if not self._fits(cost):
+                break
+            heapq.heappop(self._queue)
+            self._queued_cost -= cost
+            self._grant(cost)
+            future.set_result(None)
+
+    async def acquire(self, cost: float) -> float:
+        if not self._queue and self._fits(cost):
+            self._grant(cost)
+            return 0.0
+
+        estimated_wait = self.estimate_wait(cost)
+        if len(self._queue) >= self.max_queue:
+            raise AdmissionRejected(max(1.0, estimated_wait))
+
+        future = asyncio.get_running_loop().create_future()
+        priority = time.monotonic() + cost * ADMISSION_COST_WEIGHT
+        entry = (priority, next(self._counter), cost, future)
+        heapq.heappush(self._queue, entry)
+        self._queued_cost += cost
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(cost)
+            else:
+                # Drop the waiter now so it stops counting toward max_queue and the wait estimate.
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._queued_cost -= cost
+                self._dispatch()
+            raise
+        return estimated_wait
+
+    def release(self, cost: float, elapsed: float | None = None):
+        self.in_use = max(0.0, self.in_use - cost)
+        self.running = max(0, self.running - 1)
+        if elapsed is not None and cost > 0:
+            self._seconds_per_unit = 0.8 * self._seconds_per_unit + 0.2 * (elapsed / cost)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, cost: float):
+        queued_at = time.monotonic()
+        estimated_wait = await self.acquire(cost)
+        started = time.monotonic()
+        ticket = AdmissionTicket(self, cost, estimated_wait, started - queued_at)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket.cost, time.monotonic() - started)
+
+
+# Web workers share one inference backend, so each one gets its slice of the budget.
+admission = AdmissionController(budget=ADMISSION_BUDGET / max(1, int(os.getenv("SPEECHLAB_WORKERS", "1"))))
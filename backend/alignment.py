@@ -0,0 +1,81 @@
+import time
+import numpy as np
+from backend.timeline import WordTimeline
+from backend.audio_chunks import frame_energy_db, calibrate_threshold
+from backend.config import (
+    ALIGNMENT_FRAME_SECONDS,
+    ALIGNMENT_MAX_SHIFT_SECONDS,
+    ALIGNMENT_MIN_WORD_SECONDS,
+)
+
+
+def _run_bounds(active: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Per frame: start/end (exclusive) of the active run it belongs to, and the nearest active frame before/after."""
+    n = active.size
+    index = np.arange(n)
+    run_start = np.maximum.accumulate(np.where(~active, index, -1)) + 1
+    run_end = np.minimum.accumulate(np.where(~active, index, n)[::-1])[::-1]
+    prev_active = np.maximum.accumulate(np.where(active, index, -1))
+    next_active = np.minimum.accumulate(np.where(active, index, n)[::-1])[::-1]
+    return run_start, run_end, prev_active, next_active
+
+
+def snap_word_boundaries(
+    pcm: np.ndarray,
+    sample_rate: int,
+    timeline: WordTimeline,
+    max_shift: float = ALIGNMENT_MAX_SHIFT_SECONDS,
+) -> dict:
+    """Move each word start/end onto the nearest speech onset/offset of the energy envelope, in place.
+
+    A boundary inside speech is widened to the edge of that voiced run; a boundary in
+    silence is pulled in to the first/last voiced frame. Shifts are capped at `max_shift`
+    and words never overlap their neighbours or shrink below ALIGNMENT_MIN_WORD_SECONDS.
+    """
+    started = time.perf_counter()
+    frame_samples = max(1, int(ALIGNMENT_FRAME_SECONDS * sample_rate))
+    hop = frame_samples / sample_rate
+    energy_db = frame_energy_db(pcm, frame_samples)
+    if not len(timeline) or energy_db.size < 2:
+        return {"words_adjusted": 0, "mean_shift_ms": 0.0, "elapsed_ms": 0.0}
+
+    _, _, threshold = calibrate_threshold(energy_db)
+    active = energy_db >= threshold
+    run_start, run_end, prev_active, next_active = _run_bounds(active)
+    n = active.size
+    reach = max_shift / hop
+
+    starts, ends = timeline.starts, timeline.ends
+    first = np.clip((starts / hop).astype(np.int64), 0, n - 1)
+    last = np.clip(np.ceil(ends / hop).astype(np.int64) - 1, 0, n - 1)
+
+    onset = np.where(
+        active[first],
+        np.maximum(run_start[first], first - reach),
+        np.where(next_active[first] - first <= reach, next_active[first], first),
+    ) * hop
+    offset = np.where(
+        active[last],
+        np.minimum(run_end[last], last + 1 + reach),
+        np.where(last - prev_active[last] <= reach, prev_active[last] + 1, last + 1),
+    ) * hop
+
+    new_starts = np.where(np.abs(onset - starts) <= max_shift, onset, starts)
+    new_ends = np.where(np.abs(offset - ends) <= max_shift, offset, ends)
+    new_ends = np.minimum(new_ends, pcm.size / sample_rate)
+    new_starts[1:] = np.maximum(new_starts[1:], np.minimum(new_ends[:-1], starts[1:]))
+    new_ends[:-1] = np.minimum(new_ends[:-1], new_starts[1:])
+
+    valid = new_ends - new_starts >= np.minimum(ALIGNMENT_MIN_WORD_SECONDS, ends - starts)
+    new_starts = np.where(valid, new_starts, starts)
+    new_ends = np.where(valid, new_ends, ends)
+    new_starts[1:] = np.maximum(new_starts[1:], np.minimum(new_ends[:-1], starts[1:]))
+
+    shift = np.abs(new_starts - starts) + np.abs(new_ends - ends)
+    timeline.starts = new_starts
+    timeline.ends = new_ends
+    return {
+        "words_adjusted": int(np.count_nonzero(shift > 1e-6)),
+        "mean_shift_ms": round(float(shift.mean()) * 500, 1),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -1,49 +1,172 @@
-from pydub import AudioSegment, silence
 from io import BytesIO
+import numpy as np
+from backend.config import (
+    CHUNK_MIN_SILENCE_MS,
+    CHUNK_KEEP_SILENCE_MS,
+    CHUNK_TARGET_SECONDS,
+    CHUNK_MAX_SECONDS,
+    CHUNK_MIN_SECONDS,
+    CHUNK_FRAME_MS,
+    CHUNK_THRESHOLD_RATIO,
+    CHUNK_MIN_MARGIN_DB,
+)
+
+SAMPLE_RATE = 16000
+
+
+def frame_energy_db(pcm: np.ndarray, frame_samples: int) -> np.ndarray:
+    frames = pcm[:pcm.size // frame_samples * frame_samples].reshape(-1, frame_samples)
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame_samples)
+    return 20 * np.log10(rms + 1e-10)
+
+
+def calibrate_threshold(energy_db: np.ndarray) -> tuple[float, float, float]:
+    """Noise floor = densest histogram bin of the quieter half; threshold sits part-way up to the speech level."""
+    clipped = np.clip(energy_db, -100.0, 0.0)
+    quiet = clipped[clipped <= np.median(clipped)]
+    counts, edges = np.histogram(quiet, bins=np.arange(-100.0, 1.0, 1.0))
+    noise_floor = float(edges[np.argmax(counts)] + 0.5)
+    speech_level = float(np.percentile(clipped, 95))
+    threshold = noise_floor + max(CHUNK_MIN_MARGIN_DB, CHUNK_THRESHOLD_RATIO * (speech_level - noise_floor))
+    return noise_floor, speech_level, min(threshold, speech_level)
+
+
+def _runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
 
 
 class AudioChunker:
-    def __init__(self, min_silence_len: int = 400, silence_thresh: int = -40,
-                 keep_silence: int = 200, fmt: str = "webm"):
+    def __init__(self, min_silence_len: int = CHUNK_MIN_SILENCE_MS, silence_thresh: float | None = None,
+                 keep_silence: int = CHUNK_KEEP_SILENCE_MS, fmt: str = "webm",
+                 target_seconds: float = CHUNK_TARGET_SECONDS, max_seconds: float = CHUNK_MAX_SECONDS,
+                 min_seconds: float = CHUNK_MIN_SECONDS):
         self.min_silence_len = min_silence_len
         self.silence_thresh = silence_thresh
         self.keep_silence = keep_silence
         self.fmt = fmt
+        self.target_seconds = target_seconds
+        self.max_seconds = max_seconds
+        self.min_seconds = min_seconds
+
+    def decode(self, audio_bytes: bytes) -> np.ndarray:
+        from pydub import AudioSegment
 
-    def split_audio_bytes(self, audio_bytes: bytes) -> tuple[list[dict], float]:
         audio = AudioSegment.from_file(BytesIO(audio_bytes), format=self.fmt)
-        duration_ms = len(audio)
+        audio = audio.set_channels(1).set_frame_rate(SAMPLE_RATE).set_sample_width(2)
+        return np.frombuffer(audio.raw_data, dtype="<i2").astype(np.float32) / 32768.0
+
+    def split_audio_bytes(self, audio_bytes: bytes) -> tuple[list[dict], dict]:
+        return self.split_pcm(self.decode(audio_bytes))
+
+    def split_pcm(self, pcm: np.ndarray) -> tuple[list[dict], dict]:
+        """Split 16 kHz mono float PCM; each chunk is an (offset, length) view into `pcm`, never a copy."""
+        return self._split(pcm)
+
+    @staticmethod
+    def _chunk(pcm: np.ndarray, start_sample: int, end_sample: int) -> dict:
+        return {
+            "start_time": start_sample * 1000 // SAMPLE_RATE,
+            "end_time": end_sample * 1000 // SAMPLE_RATE,
+            "offset": start_sample,
+            "length": end_sample - start_sample,
+            "pcm": pcm[start_sample:end_sample],
+        }
+
+    def _speech_regions(self, energy_db: np.ndarray, threshold: float) -> list[list[int]]:
+        silent_starts, silent_ends = _runs(energy_db < threshold)
+        min_frames = max(1, self.min_silence_len // CHUNK_FRAME_MS)
+        long_enough = silent_ends - silent_starts >= min_frames
+        silent_starts, silent_ends = silent_starts[long_enough], silent_ends[long_enough]
+
+        marks = np.zeros(energy_db.size + 1, dtype=np.int32)
+        np.add.at(marks, silent_starts, 1)
+        np.add.at(marks, silent_ends, -1)
+        starts, ends = _runs(np.cumsum(marks[:-1]) == 0)
+
+        keep = self.keep_silence // CHUNK_FRAME_MS
+        padded_starts = np.maximum(starts - keep, np.concatenate([[0], (ends[:-1] + starts[1:]) // 2]))
+        padded_ends = np.minimum(ends + keep, np.concatenate([(ends[:-1] + starts[1:]) // 2, [energy_db.size]]))
+        return [[s, e] for s, e in zip(padded_starts.tolist(), padded_ends.tolist())]
+
+    def _cut_long(self, regions: list[list[int]], energy_db: np.ndarray, frames_per_second: float) -> list[list[int]]:
+        """Split regions longer than max_seconds at their quietest frame past half the target length."""
+        max_frames = int(self.max_seconds * frames_per_second)
+        min_cut = max(1, int(self.target_seconds * frames_per_second / 2))
+        output = []
+        for start, end in regions:
+            while end - start > max_frames:
+                window = energy_db[start + min_cut:start + max_frames]
+                cut = start + min_cut + int(np.argmin(window))
+                output.append([start, cut])
+                start = cut
+            output.append([start, end])
+        return output
+
+    def _pack(self, regions: list[list[int]], frames_per_second: float) -> list[list[int]]:
+        """Greedily merge neighbouring regions up to the target length; fold short tails into a neighbour."""
+        target = self.target_seconds * frames_per_second
+        max_frames = self.max_seconds * frames_per_second
+        min_frames = self.min_seconds * frames_per_second
+
+        packed = [list(regions[0])]
+        for start, end in regions[1:]:
+            if end - packed[-1][0] <= target:
+                packed[-1][1] = end
+            else:
+                packed.append([start, end])
 
-        chunks = silence.split_on_silence(
-            audio,
-            min_silence_len=self.min_silence_len,
-            silence_thresh=self.silence_thresh,
-            keep_silence=self.keep_silence,
-        )
+        merged = [packed[0]]
+        for start, end in packed[1:]:
+            previous = merged[-1]
+            short = end - start < min_frames or previous[1] - previous[0] < min_frames
+            if short and end - previous[0] <= max_frames:
+                previous[1] = end
+            else:
+                merged.append([start, end])
+        return merged
 
-        if not chunks:
-            buf = BytesIO()
-            audio.export(buf, format="wav")
-            return [{"start_time": 0, "end_time": duration_ms, "audio_bytes": buf.getvalue()}], duration_ms
+    def _split(self, pcm: np.ndarray) -> tuple[list[dict], dict]:
+        pcm = pcm.astype(np.float32, copy=False)
+        frame_samples = SAMPLE_RATE * CHUNK_FRAME_MS // 1000
+        frames_per_second = 1000 / CHUNK_FRAME_MS
+        duration_ms = int(round(pcm.size * 1000 / SAMPLE_RATE))
 
-        output_chunks = []
-        search_start = 0
+        energy_db = frame_energy_db(pcm, frame_samples)
+        if energy_db.size == 0:
+            return [self._chunk(pcm, 0, pcm.size)], self._stats(
+                [(0, duration_ms)], duration_ms, None, None, None
+            )
 
-        for chunk in chunks:
-            chunk_duration = len(chunk)
+        if self.silence_thresh is None:
+            noise_floor, speech_level, threshold = calibrate_threshold(energy_db)
+        else:
+            noise_floor, speech_level, threshold = None, None, float(self.silence_thresh)
 
-            buf = BytesIO()
-            chunk.export(buf, format="wav")
-            wav_bytes = buf.getvalue()
+        regions = self._speech_regions(energy_db, threshold) or [[0, energy_db.size]]
+        regions = self._pack(self._cut_long(regions, energy_db, frames_per_second), frames_per_second)
 
-            start_time = search_start
-            end_time = start_time + chunk_duration
-            search_start = end_time
+        chunks = []
+        for start, end in regions:
+            start_sample = start * frame_samples
+            end_sample = pcm.size if end >= energy_db.size else end * frame_samples
+            chunks.append(self._chunk(pcm, start_sample, end_sample))
 
-            output_chunks.append({
-                "start_time": start_time,
-                "end_time": end_time,
-                "audio_bytes": wav_bytes,
-            })
+        spans = [(c["start_time"], c["end_time"]) for c in chunks]
+        return chunks, self._stats(spans, duration_ms, noise_floor, speech_level, threshold)
 
-        return output_chunks, duration_ms
+    @staticmethod
+    def _stats(spans: list[tuple[int, int]], duration_ms: int, noise_floor, speech_level, threshold) -> dict:
+        lengths = np.array([end - start for start, end in spans], dtype=np.float64) / 1000
+        return {
+            "duration_seconds": round(duration_ms / 1000, 2),
+            "chunk_count": len(spans),
+            "chunk_seconds_mean": round(float(lengths.mean()), 2),
+            "chunk_seconds_min": round(float(lengths.min()), 2),
+            "chunk_seconds_max": round(float(lengths.max()), 2),
+            "chunk_seconds_std": round(float(lengths.std()), 2),
+            "kept_ratio": round(float(lengths.sum()) * 1000 / duration_ms, 3) if duration_ms else 0,
+            "noise_floor_db": None if noise_floor is None else round(noise_floor, 1),
+            "speech_level_db": None if speech_level is None else round(speech_level, 1),
+            "silence_threshold_db": None if threshold is None else round(threshold, 1),
+        }
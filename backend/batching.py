@@ -0,0 +1,169 @@
+import queue
+import threading
+import time
+import numpy as np
+from concurrent.futures import Future
+from backend.config import (
+    BATCH_WINDOW_MS,
+    BATCH_MAX_SIZE,
+    BATCH_MAX_PIECES,
+    BATCH_PIECE_SECONDS,
+)
+
+SAMPLE_RATE = 16000
+
+
+class _BatchRequest:
+    __slots__ = ("audio", "cancel", "future", "enqueued")
+
+    def __init__(self, audio: np.ndarray, cancel: threading.Event | None):
+        self.audio = audio
+        self.cancel = cancel
+        self.future: Future = Future()
+        self.enqueued = time.perf_counter()
+
+    def pieces(self, piece_samples: int) -> int:
+        return max(1, -(-self.audio.size // piece_samples))
+
+
+class BatchScheduler:
+    """Coalesces concurrent short-clip requests into one batched encoder/decoder pass per model."""
+
+    def __init__(
+        self,
+        window_ms: float = BATCH_WINDOW_MS,
+        max_size: int = BATCH_MAX_SIZE,
+        max_pieces: int = BATCH_MAX_PIECES,
+        piece_seconds: float = BATCH_PIECE_SECONDS,
+    ):
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self.max_pieces = max_pieces
+        self.piece_samples = int(piece_seconds * SAMPLE_RATE)
+        self._queues: dict[str, queue.Queue] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "batches": 0,
+            "requests": 0,
+            "pieces": 0,
+            "cancelled": 0,
+            "wait_seconds": 0.0,
+            "run_seconds": 0.0,
+            "size_histogram": {},
+        }
+
+    def submit(self, key: tuple[str, str], audio: np.ndarray, runner, cancel: threading.Event | None = None) -> Future:
+        """Queue `audio` under `key` (model, language, or None to detect it in the pass); `runner(key, clips, cancels, piece_samples)` does the batched pass."""
+        request = _BatchRequest(audio, cancel)
+        with self._lock:
+            if key not in self._queues:
+                self._queues[key] = queue.Queue()
+                threading.Thread(
+                    target=self._worker,
+                    args=(key, self._queues[key], runner),
+                    name=f"batch-{'-'.join(key)}",
+                    daemon=True,
+                ).start()
+            self._queues[key].put(request)
+        return request.future
+
+    def _collect(
+        self, pending: queue.Queue, carry: _BatchRequest | None
+    ) -> tuple[list[_BatchRequest], _BatchRequest | None]:
+        batch = [carry if carry is not None else pending.get()]
+        pieces = batch[0].pieces(self.piece_samples)
+        deadline = batch[0].enqueued + self.window
+
+        while len(batch) < self.max_size and pieces < self.max_pieces:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = pending.get(timeout=remaining) if remaining > 0 else pending.get_nowait()
+            except queue.Empty:
+                break
+            needed = request.pieces(self.piece_samples)
+            if pieces + needed > self.max_pieces:
+                return batch, request
+            batch.append(request)
+            pieces += needed
+        return batch, None
+
+    def _worker(self, key: tuple[str, str], pending: queue.Queue, runner):
+        carry = None
+        while True:
+            batch, carry = self._collect(pending, carry)
+            started = time.perf_counter()
+
+            live = []
+            for request in batch:
+                if request.cancel is not None and request.cancel.is_set():
+                    request.future.set_exception(_cancelled())
+                    self._record_cancel()
+                elif request.future.set_running_or_notify_cancel():
+                    live.append(request)
+            if not live:
+                continue
+
+            try:
+                results = runner(key, [r.audio for r in live], [r.cancel for r in live], self.piece_samples)
+            except BaseException as e:
+                for request in live:
+                    request.future.set_exception(e)
+                continue
+            finally:
+                self._record(live, started)
+
+            for request, result in zip(live, results):
+                if request.cancel is not None and request.cancel.is_set():
+                    request.future.set_exception(_cancelled())
+                    self._record_cancel()
+                else:
+                    request.future.set_result(result)
+            batch = live = request = results = None
+
+    def _record(self, batch: list[_BatchRequest], started: float):
+        now = time.perf_counter()
+        size = len(batch)
+        with self._lock:
+            stats = self._stats
+            stats["batches"] += 1
+            stats["requests"] += size
+            stats["pieces"] += sum(r.pieces(self.piece_samples) for r in batch)
+            stats["wait_seconds"] += sum(started - r.enqueued for r in batch)
+            stats["run_seconds"] += now - started
+            stats["size_histogram"][size] = stats["size_histogram"].get(size, 0) + 1
+
+    def _record_cancel(self):
+        with self._lock:
+            self._stats["cancelled"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            histogram = dict(sorted(stats.pop("size_histogram").items()))
+            queued = sum(q.qsize() for q in self._queues.values())
+        batches = stats["batches"]
+        requests = stats["requests"]
+        return {
+            "window_ms": round(self.window * 1000, 1),
+            "max_size": self.max_size,
+            "max_pieces": self.max_pieces,
+            "queued": queued,
+            "batches": batches,
+            "requests": requests,
+            "cancelled": stats["cancelled"],
+            "avg_batch_size": round(requests / batches, 2) if batches else 0.0,
+            "avg_fill": round(requests / (batches * self.max_size), 3) if batches else 0.0,
+            "avg_pieces_per_batch": round(stats["pieces"] / batches, 2) if batches else 0.0,
+            "avg_wait_ms": round(1000 * stats["wait_seconds"] / requests, 1) if requests else 0.0,
+            "avg_run_ms": round(1000 * stats["run_seconds"] / batches, 1) if batches else 0.0,
+            "size_histogram": {str(k): v for k, v in histogram.items()},
+        }
+
+
+def _cancelled():
+    from backend.transcription import TranscriptionCancelled
+
+    return TranscriptionCancelled("Transcription cancelled")
+
+
+batch_scheduler = BatchScheduler()
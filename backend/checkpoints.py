@@ -0,0 +1,81 @@
+import hashlib
+import os
+import shutil
+import time
+import orjson
+from backend.timeline import WordTimeline
+from backend.config import CHECKPOINT_DIR, CHECKPOINT_MAX_AGE_HOURS
+
+
+class CheckpointStore:
+    def __init__(self, root: str = CHECKPOINT_DIR):
+        self.root = root
+
+    @staticmethod
+    def job_id(audio, model_size: str) -> str:
+        """`audio` is the upload bytes or its contiguous PCM array, hashed without copying."""
+        digest = hashlib.sha256(audio)
+        digest.update(model_size.encode())
+        return digest.hexdigest()[:32]
+
+    def _job_dir(self, job_id: str) -> str:
+        return os.path.join(self.root, job_id)
+
+    def save(self, job_id: str, chunk_result: dict):
+        job_dir = self._job_dir(job_id)
+        os.makedirs(job_dir, exist_ok=True)
+
+        result = dict(chunk_result["result"])
+        result["word_timestamps"] = WordTimeline.coerce(result.get("word_timestamps")).to_columns()
+        payload = orjson.dumps(
+            {**chunk_result, "result": result},
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+        path = os.path.join(job_dir, f"chunk-{int(chunk_result['start_time']):010d}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def load(self, job_id: str) -> dict[int, dict]:
+        job_dir = self._job_dir(job_id)
+        if not os.path.isdir(job_dir):
+            return {}
+
+        completed = {}
+        for name in sorted(os.listdir(job_dir)):
+            if not (name.startswith("chunk-") and name.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(job_dir, name), "rb") as f:
+                    chunk_result = orjson.loads(f.read())
+            except (OSError, orjson.JSONDecodeError) as e:
+                print(f"[CheckpointStore] Ignoring unreadable checkpoint {job_id}/{name}: {e}")
+                continue
+            chunk_result["result"]["word_timestamps"] = WordTimeline.from_columns(
+                chunk_result["result"]["word_timestamps"]
+            )
+            completed[chunk_result["start_time"]] = chunk_result
+        return completed
+
+    def discard(self, job_id: str):
+        shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+
+    def prune(self, max_age_hours: float = CHECKPOINT_MAX_AGE_HOURS) -> int:
+        if not os.path.isdir(self.root):
+            return 0
+
+        cutoff = time.time() - max_age_hours * 3600
+        removed = 0
+        for name in os.listdir(self.root):
+            job_dir = os.path.join(self.root, name)
+            if os.path.isdir(job_dir) and os.path.getmtime(job_dir) < cutoff:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                removed += 1
+        return removed
+
+
+checkpoints = CheckpointStore()
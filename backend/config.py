@@ -9,6 +9,49 @@ WHISPER_COMPUTE_TYPE = "int8"
 
 WHISPER_MODEL_SIZE = DEFAULT_MODEL
 
+WARMUP_ON_STARTUP = True
+
+MODEL_VARIANTS = {
+    "base": [
+        {"name": "int8", "compute_type": "int8"},
+        {"name": "int8_float32", "compute_type": "int8_float32"},
+        {"name": "float32", "compute_type": "float32"},
+        {"name": "distil_int8", "compute_type": "int8", "path_env": "BASE_DISTIL"},
+    ],
+    "medium": [
+        {"name": "int8", "compute_type": "int8"},
+        {"name": "int8_float32", "compute_type": "int8_float32"},
+        {"name": "float32", "compute_type": "float32"},
+        {"name": "distil_int8", "compute_type": "int8", "path_env": "MEDIUM_DISTIL"},
+    ],
+    # English-only checkpoints, used instead of the multilingual ones when a recording is detected as English.
+    "base.en": [
+        {"name": "int8", "compute_type": "int8", "path_env": "BASE_EN"},
+        {"name": "int8_float32", "compute_type": "int8_float32", "path_env": "BASE_EN"},
+        {"name": "float32", "compute_type": "float32", "path_env": "BASE_EN"},
+    ],
+    "medium.en": [
+        {"name": "int8", "compute_type": "int8", "path_env": "MEDIUM_EN"},
+        {"name": "int8_float32", "compute_type": "int8_float32", "path_env": "MEDIUM_EN"},
+        {"name": "float32", "compute_type": "float32", "path_env": "MEDIUM_EN"},
+    ],
+}
+ENGLISH_ONLY_SUFFIX = ".en"
+DEFAULT_VARIANT = WHISPER_COMPUTE_TYPE
+REFERENCE_VARIANT = "float32"
+MODEL_CALIBRATE_ON_STARTUP = True
+MODEL_CALIBRATION_SECONDS = 8.0
+MODEL_ACCURACY_TOLERANCE = 0.1
+
+HYBRID_MODEL = "hybrid"
+HYBRID_DRAFT_MODEL = "base"
+HYBRID_REFINE_MODEL = "medium"
+HYBRID_LOGPROB_THRESHOLD = -0.6
+HYBRID_NO_SPEECH_THRESHOLD = 0.5
+HYBRID_PADDING_SECONDS = 0.3
+
+TRANSCRIPTION_MODES = AVAILABLE_MODELS + [HYBRID_MODEL]
+
 
 SINGLE_FILLERS = ["uh", "um", "like", "basically", "actually"]
 
@@ -17,14 +60,126 @@ MULTI_FILLERS = ["you know"]
 SENTENCE_START_FILLERS = ["so"]
 ALL_FILLER_LABELS = SINGLE_FILLERS + MULTI_FILLERS + SENTENCE_START_FILLERS
 
+# Per-language lexicons; English uses the lists above.
+FILLER_LEXICONS = {
+    "en": {"single": SINGLE_FILLERS, "multi": MULTI_FILLERS, "sentence_start": SENTENCE_START_FILLERS},
+    # Hesitation words that are also very common ordinary words ("este", "é") are left out to avoid false positives.
+    "es": {"single": ["eh", "em", "pues", "bueno"], "multi": ["o sea", "es decir"], "sentence_start": ["entonces"]},
+    "fr": {"single": ["euh", "ben", "bah", "genre", "voilà"], "multi": ["en fait", "du coup", "tu vois"], "sentence_start": ["alors"]},
+    "de": {"single": ["äh", "ähm", "halt", "eigentlich", "quasi"], "multi": ["weißt du"], "sentence_start": ["also"]},
+    "pt": {"single": ["tipo", "né", "hum", "sabe"], "multi": ["quer dizer"], "sentence_start": ["então"]},
+    "it": {"single": ["ehm", "cioè", "tipo", "praticamente"], "multi": ["diciamo che"], "sentence_start": ["allora"]},
+}
+NO_SPACE_LANGUAGES = ("zh", "ja", "th", "lo", "km", "my")
+
 PAUSE_THRESHOLD_SECONDS = 1.0
 
+ACOUSTIC_FRAME_SECONDS = 0.04
+ACOUSTIC_HOP_SECONDS = 0.01
+ACOUSTIC_BLOCK_SECONDS = 30.0
+PITCH_MIN_HZ = 75
+PITCH_MAX_HZ = 400
+VOICING_THRESHOLD = 0.45
+
+ALIGNMENT_ENABLED = True
+ALIGNMENT_FRAME_SECONDS = 0.01
+ALIGNMENT_MAX_SHIFT_SECONDS = 0.2
+ALIGNMENT_MIN_WORD_SECONDS = 0.05
+
+LIVE_FRAME_MS = 10
+LIVE_HISTORY_SECONDS = 30.0
+LIVE_WINDOW_SECONDS = 10.0
+LIVE_LOUDNESS_SECONDS = 1.0
+LIVE_MIN_SPEECH_DB = -45.0
+LIVE_SMOOTHING_FRAMES = 5
+LIVE_SYLLABLE_GAP_SECONDS = 0.1
+LIVE_SYLLABLE_PROMINENCE_DB = 4.0
+LIVE_ARTICULATION_GAP_SECONDS = 0.25
+PCM_MIN_SAMPLE_RATE = 8000
+PCM_MAX_SAMPLE_RATE = 48000
+LIVE_MAX_MESSAGE_BYTES = 64 * 1024
+
+LOW_CONFIDENCE_WORD_PROBABILITY = 0.5
+MONOTONY_FULL_RANGE_SEMITONES = 4.0
+VOLUME_FULL_RANGE_DB = 12.0
+
+METRIC_WORKERS = 2
+METRIC_INTERMEDIATE_CACHE_SIZE = 2048
+
+TIMESERIES_WINDOW_SECONDS = 30.0
+TIMESERIES_HOP_SECONDS = 10.0
+TIMESERIES_MAX_POINTS = 240
+
+DIARIZATION_WINDOW_SECONDS = 1.5
+DIARIZATION_HOP_SECONDS = 0.75
+DIARIZATION_BANDS = 24
+DIARIZATION_MAX_SPEAKERS = 4
+DIARIZATION_MIN_SILHOUETTE = 0.2
+DIARIZATION_MIN_SEPARATION = 0.5
+
+CHUNK_FRAME_MS = 10
+CHUNK_MIN_SILENCE_MS = 400
+CHUNK_KEEP_SILENCE_MS = 200
+CHUNK_TARGET_SECONDS = 28.0
+CHUNK_MAX_SECONDS = 30.0
+CHUNK_MIN_SECONDS = 5.0
+CHUNK_THRESHOLD_RATIO = 0.35
+CHUNK_MIN_MARGIN_DB = 6.0
+
 MIN_PHRASE_LENGTH = 2
 MAX_PHRASE_LENGTH = 3
 
+MODEL_COST_FACTORS = {"base": 1.0, "medium": 3.5, "hybrid": 1.6}
+ADMISSION_BUDGET = 900.0
+ADMISSION_MAX_QUEUE = 16
+ADMISSION_COST_WEIGHT = 0.05
+ADMISSION_INITIAL_SECONDS_PER_UNIT = 0.15
+# ~32 kbit/s, what browsers record Opus at; only used when the container has no duration header.
+ADMISSION_FALLBACK_BYTES_PER_SECOND = 4000
+DISCONNECT_POLL_SECONDS = 0.5
+
+# Only the shared server sees concurrent requests to coalesce: server.py turns batching on in its
+# inference process unless SPEECHLAB_BATCHING=0, while the desktop app opts in with SPEECHLAB_BATCHING=1.
+BATCH_ENABLED = os.getenv("SPEECHLAB_BATCHING") == "1"
+SERVER_BATCHING = os.getenv("SPEECHLAB_BATCHING", "1") != "0"
+BATCH_WINDOW_MS = float(os.getenv("SPEECHLAB_BATCH_WINDOW_MS", "50"))
+BATCH_MAX_SIZE = int(os.getenv("SPEECHLAB_BATCH_MAX_SIZE", "8"))
+BATCH_MAX_PIECES = 16
+BATCH_PIECE_SECONDS = 30.0
+BATCH_MAX_CLIP_SECONDS = 90.0
+BATCH_CANCEL_POLL_SECONDS = 0.1
+
+SESSION_EXPORT_BATCH_SIZE = 500
+SESSION_IMPORT_MAX_ERRORS = 20
+
+COMPRESSION_MIN_BYTES = 16 * 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 5
+
+CATEGORY_WEIGHTS: dict[str, float] = {}
+TOPIC_CYCLE_CACHE_SIZE = 4096
+
+RELEVANCE_DIMENSIONS = 4096
+RELEVANCE_NEIGHBOURS = 3
+
 SERVER_HOST = "127.0.0.1"
 SERVER_PORT = 8690
+SERVER_WORKERS = 2
+SERVER_DRAIN_SECONDS = 10.0
+SERVER_GRACEFUL_TIMEOUT = 300
+INFERENCE_HOST = "127.0.0.1"
+INFERENCE_PORT = 8691
+MULTI_TENANT = os.getenv("SPEECHLAB_MULTI_TENANT") == "1"
+USER_COOKIE_NAME = "speechlab_user"
+USER_COOKIE_MAX_AGE = 365 * 24 * 3600
 
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 FRONTEND_DIR = os.path.join(PROJECT_ROOT, "frontend")
+TOPIC_PACKS_DIR = os.path.join(PROJECT_ROOT, "backend", "topic_packs")
+MODEL_SELECTION_FILE = os.path.join(PROJECT_ROOT, "model_selection.json")
+SESSION_FILE = os.path.join(PROJECT_ROOT, "sessions.json")
+SESSIONS_DIR = os.path.join(PROJECT_ROOT, "sessions")
+SESSION_SECRET_FILE = os.path.join(PROJECT_ROOT, "session_secret")
+CHECKPOINT_DIR = os.path.join(PROJECT_ROOT, ".checkpoints")
+CHECKPOINT_MAX_AGE_HOURS = 48
@@ -0,0 +1,255 @@
+import numpy as np
+from backend.acoustics import frame_signal, frame_power, frame_pitch
+from backend.timeline import WordTimeline
+from backend.config import (
+    ACOUSTIC_HOP_SECONDS,
+    DIARIZATION_WINDOW_SECONDS,
+    DIARIZATION_HOP_SECONDS,
+    DIARIZATION_BANDS,
+    DIARIZATION_MAX_SPEAKERS,
+    DIARIZATION_MIN_SILHOUETTE,
+    DIARIZATION_MIN_SEPARATION,
+)
+
+SAMPLE_RATE = 16000
+SILHOUETTE_SAMPLE = 1000
+PITCH_WEIGHT = 8.0
+
+
+def _band_edges(n_fft: int, sample_rate: int) -> np.ndarray:
+    freqs = np.geomspace(80.0, min(7600.0, sample_rate / 2 - 1), DIARIZATION_BANDS + 1)
+    return np.unique(np.round(freqs * n_fft / sample_rate).astype(np.int64))
+
+
+def frame_features(pcm: np.ndarray, sample_rate: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per-frame log band energies plus log pitch, and a mask of frames that carry speech."""
+    frames = frame_signal(pcm, sample_rate)
+    power = frame_power(frames)
+    n_fft = 1 << int(np.ceil(np.log2(frames.shape[1])))
+    edges = _band_edges(n_fft, sample_rate)
+
+    bands = np.empty((frames.shape[0], edges.size - 1), dtype=np.float32)
+    window = np.hanning(frames.shape[1]).astype(np.float32)
+    for block_start in range(0, frames.shape[0], 2048):
+        block = frames[block_start:block_start + 2048] * window
+        spectrum = np.abs(np.fft.rfft(block, n=n_fft, axis=1)) ** 2
+        cumulative = np.concatenate([np.zeros((len(block), 1)), np.cumsum(spectrum, axis=1)], axis=1)
+        energy = (cumulative[:, edges[1:]] - cumulative[:, edges[:-1]]) / np.diff(edges)
+        bands[block_start:block_start + len(block)] = np.log(np.maximum(energy, 1e-10))
+
+    f0 = frame_pitch(frames, sample_rate, power)
+    log_f0 = np.where(f0 > 0, np.log(np.maximum(f0, 1.0)), np.nan)
+
+    power_db = 10 * np.log10(np.maximum(power, 1e-12))
+    if power_db.size:
+        floor, loud = np.percentile(power_db, [5, 95])
+        speech = power_db > min(floor + 6, loud - 25)
+    else:
+        speech = np.zeros(0, dtype=bool)
+    return np.column_stack([bands, log_f0]), speech
+
+
+def window_embeddings(pcm: np.ndarray, sample_rate: int, spans: list[tuple[float, float]]) -> tuple[np.ndarray, np.ndarray]:
+    """Mean/std of frame features over sliding windows that never cross a span boundary."""
+    features, speech = frame_features(pcm, sample_rate)
+    frame_rate = sample_rate / int(ACOUSTIC_HOP_SECONDS * sample_rate)
+    width = max(1, int(DIARIZATION_WINDOW_SECONDS * frame_rate))
+    hop = max(1, int(DIARIZATION_HOP_SECONDS * frame_rate))
+
+    embeddings, centers = [], []
+    for span_start, span_end in spans:
+        first = int(span_start * frame_rate)
+        last = min(int(span_end * frame_rate), features.shape[0])
+        starts = range(first, max(first + 1, last - width + 1), hop)
+        for start in starts:
+            stop = min(start + width, last)
+            mask = speech[start:stop]
+            if mask.sum() < width // 4:
+                continue
+            window = features[start:stop][mask]
+            spectral = window[:, :-1]
+            pitch = window[:, -1]
+            voiced = pitch[~np.isnan(pitch)]
+            embeddings.append(np.concatenate([
+                spectral.mean(axis=0),
+                spectral.std(axis=0),
+                [np.median(voiced) if voiced.size else np.nan],
+            ]))
+            centers.append((start + stop) / 2 / frame_rate)
+
+    if not embeddings:
+        return np.zeros((0, 0)), np.zeros(0)
+
+    matrix = np.vstack(embeddings)
+    pitch = matrix[:, -1]
+    matrix[:, -1] = PITCH_WEIGHT * np.where(np.isnan(pitch), np.nanmean(pitch) if np.isfinite(pitch).any() else 0.0, pitch)
+    matrix -= matrix.mean(axis=0)
+    return matrix, np.asarray(centers)
+
+
+def _kmeans(points: np.ndarray, k: int, iterations: int = 50, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centroids = [points[rng.integers(points.shape[0])]]
+    for _ in range(1, k):
+        distances = np.min(((points[:, None, :] - np.array(centroids)[None]) ** 2).sum(-1), axis=1)
+        total = distances.sum()
+        choice = rng.choice(points.shape[0], p=distances / total) if total > 0 else rng.integers(points.shape[0])
+        centroids.append(points[choice])
+    centroids = np.array(centroids)
+
+    labels = np.zeros(points.shape[0], dtype=np.int64)
+    for iteration in range(iterations):
+        distances = ((points[:, None, :] - centroids[None]) ** 2).sum(-1)
+        new_labels = distances.argmin(axis=1)
+        if iteration and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for c in range(k):
+            members = points[labels == c]
+            if members.size:
+                centroids[c] = members.mean(axis=0)
+    return labels
+
+
+def _silhouette(points: np.ndarray, labels: np.ndarray) -> float:
+    if points.shape[0] > SILHOUETTE_SAMPLE:
+        keep = np.random.default_rng(0).choice(points.shape[0], SILHOUETTE_SAMPLE, replace=False)
+        points, labels = points[keep], labels[keep]
+
+    clusters = np.unique(labels)
+    if clusters.size < 2:
+        return 0.0
+
+    squared = (points ** 2).sum(axis=1)
+    distances = np.sqrt(np.maximum(squared[:, None] + squared[None] - 2 * points @ points.T, 0.0))
+    one_hot = labels[:, None] == clusters[None]
+    sizes = one_hot.sum(axis=0)
+    mean_to = (distances @ one_hot) / np.maximum(sizes, 1)
+
+    own = np.searchsorted(clusters, labels)
+    rows = np.arange(points.shape[0])
+    own_sizes = sizes[own]
+    a = mean_to[rows, own] * own_sizes / np.maximum(own_sizes - 1, 1)
+    mean_to[rows, own] = np.inf
+    b = mean_to.min(axis=1)
+    s = np.where(own_sizes > 1, (b - a) / np.maximum(np.maximum(a, b), 1e-12), 0.0)
+    return float(s.mean())
+
+
+def _separation(points: np.ndarray, labels: np.ndarray, k: int) -> float:
+    centroids = np.array([points[labels == c].mean(axis=0) for c in range(k) if np.any(labels == c)])
+    if centroids.shape[0] < 2:
+        return 0.0
+    differences = centroids[:, None, :] - centroids[None]
+    rms = np.sqrt(np.mean(differences ** 2, axis=-1))
+    return float(rms[np.triu_indices(centroids.shape[0], 1)].min())
+
+
+def _smooth(labels: np.ndarray, k: int) -> np.ndarray:
+    if labels.size < 3:
+        return labels
+    votes = np.stack([np.convolve(labels == c, np.ones(3), mode="same") for c in range(k)])
+    return votes.argmax(axis=0)
+
+
+def cluster_speakers(embeddings: np.ndarray, num_speakers: int | None = None) -> np.ndarray:
+    n = embeddings.shape[0]
+    if n < 4 or num_speakers == 1:
+        return np.zeros(n, dtype=np.int64)
+
+    if num_speakers:
+        k = min(num_speakers, n)
+        return _smooth(_kmeans(embeddings, k), k)
+
+    best_labels, best_score = np.zeros(n, dtype=np.int64), DIARIZATION_MIN_SILHOUETTE
+    for k in range(2, min(DIARIZATION_MAX_SPEAKERS, n // 2) + 1):
+        labels = _kmeans(embeddings, k)
+        if _separation(embeddings, labels, k) < DIARIZATION_MIN_SEPARATION:
+            continue
+        score = _silhouette(embeddings, labels)
+        if score > best_score:
+            best_labels, best_score = _smooth(labels, k), score
+    return best_labels
+
+
+def _turns(centers: np.ndarray, labels: np.ndarray, spans: list[tuple[float, float]]) -> list[dict]:
+    turns: list[dict] = []
+    half = DIARIZATION_HOP_SECONDS / 2
+    span_starts = np.array([s for s, _ in spans])
+    span_ends = np.array([e for _, e in spans])
+    span_of = np.clip(np.searchsorted(span_starts, centers, side="right") - 1, 0, len(spans) - 1)
+
+    order = {}
+    for center, label, span in zip(centers.tolist(), labels.tolist(), span_of.tolist()):
+        speaker = order.setdefault(label, len(order))
+        start = max(center - half, span_starts[span])
+        end = min(center + half, span_ends[span])
+        if turns and turns[-1]["speaker"] == speaker and start - turns[-1]["end"] < DIARIZATION_HOP_SECONDS:
+            turns[-1]["end"] = end
+        else:
+            if turns and turns[-1]["end"] > start:
+                turns[-1]["end"] = start
+            turns.append({"speaker": speaker, "start": start, "end": end})
+    return turns
+
+
+def diarize_pcm(
+    pcm: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    spans: list[tuple[float, float]] | None = None,
+    num_speakers: int | None = None,
+) -> list[dict]:
+    """Return speaker turns ({speaker, start, end}) for the given audio."""
+    if spans is None:
+        spans = [(0.0, pcm.size / sample_rate)]
+    embeddings, centers = window_embeddings(pcm, sample_rate, spans)
+    if not centers.size:
+        return [{"speaker": 0, "start": 0.0, "end": pcm.size / sample_rate}]
+    labels = cluster_speakers(embeddings, num_speakers)
+    return _turns(centers, labels, spans)
+
+
+def diarize_audio(audio, num_speakers: int | None = None) -> list[dict]:
+    from backend.transcription import load_audio
+
+    pcm = load_audio(audio)
+    return diarize_pcm(pcm, SAMPLE_RATE, num_speakers=num_speakers)
+
+
+def diarize_chunks(chunks: list[dict], num_speakers: int | None = None) -> list[dict]:
+    """Diarize AudioChunker output, keeping each chunk as its own speech span on the chunk timeline."""
+    from backend.transcription import load_audio
+
+    pieces, spans = [], []
+    for chunk in sorted(chunks, key=lambda c: c["start_time"]):
+        pcm = load_audio(chunk["pcm"])
+        offset = chunk["start_time"] / 1000.0
+        filled = sum(p.size for p in pieces) / SAMPLE_RATE
+        if offset > filled:
+            pieces.append(np.zeros(int((offset - filled) * SAMPLE_RATE), dtype=np.float32))
+        pieces.append(pcm)
+        spans.append((offset, offset + pcm.size / SAMPLE_RATE))
+
+    if not pieces:
+        return []
+    return diarize_pcm(np.concatenate(pieces), SAMPLE_RATE, spans, num_speakers)
+
+
+def assign_speakers(timeline: WordTimeline, turns: list[dict]) -> WordTimeline:
+    """Tag every word with the speaker whose turn contains (or is nearest to) its midpoint."""
+    if not len(timeline) or not turns:
+        return timeline
+
+    starts = np.array([t["start"] for t in turns])
+    ends = np.array([t["end"] for t in turns])
+    speakers = np.array([t["speaker"] for t in turns], dtype=np.float64)
+    mids = (timeline.starts + timeline.ends) / 2
+
+    before = np.clip(np.searchsorted(starts, mids, side="right") - 1, 0, len(turns) - 1)
+    after = np.clip(before + 1, 0, len(turns) - 1)
+    distance_before = np.maximum(mids - ends[before], 0)
+    distance_after = np.maximum(starts[after] - mids, 0)
+    nearest = np.where(distance_after < distance_before, after, before)
+
+    timeline.features["speaker"] = speakers[nearest]
+    return timeline
@@ -0,0 +1,91 @@
+import os
+import hmac
+import uuid
+import hashlib
+import threading
+from starlette.requests import HTTPConnection
+from backend.config import SESSION_SECRET_FILE, USER_COOKIE_NAME, USER_COOKIE_MAX_AGE
+from backend.sessions import USER_ID_PATTERN
+
+_secret: bytes | None = None
+_secret_lock = threading.Lock()
+
+
+def _load_secret() -> bytes:
+    """SPEECHLAB_SESSION_SECRET, or a random key persisted next to the app so cookies survive restarts."""
+    global _secret
+    with _secret_lock:
+        if _secret is None:
+            env = os.getenv("SPEECHLAB_SESSION_SECRET")
+            if env:
+                _secret = env.encode()
+            else:
+                # Workers race to create it: write privately, then link into place so nobody reads a half-written key.
+                tmp_path = f"{SESSION_SECRET_FILE}.{os.getpid()}.tmp"
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, "w") as f:
+                    f.write(os.urandom(32).hex())
+                try:
+                    os.link(tmp_path, SESSION_SECRET_FILE)
+                except FileExistsError:
+                    pass
+                finally:
+                    os.remove(tmp_path)
+                with open(SESSION_SECRET_FILE) as f:
+                    _secret = f.read().strip().encode()
+        return _secret
+
+
+def _signature(user: str) -> str:
+    return hmac.new(_load_secret(), user.encode(), hashlib.sha256).hexdigest()
+
+
+def sign_user(user: str) -> str:
+    return f"{user}.{_signature(user)}"
+
+
+def verify_user(token: str | None) -> str | None:
+    """The user id carried by a cookie we issued, or None if it is missing or was tampered with."""
+    if not token:
+        return None
+    user, _, signature = token.rpartition(".")
+    if not USER_ID_PATTERN.fullmatch(user) or not hmac.compare_digest(signature, _signature(user)):
+        return None
+    return user
+
+
+class UserCookieMiddleware:
+    """Give every browser a server-signed pseudonymous id and expose it as request.state.user.
+
+    Ids are minted here, never taken from the client, so one browser cannot name
+    another's history. This is not a login: whoever holds the cookie is that user.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+
+        user = verify_user(HTTPConnection(scope).cookies.get(USER_COOKIE_NAME))
+        issued = None
+        if user is None:
+            user = uuid.uuid4().hex
+            issued = sign_user(user)
+        scope.setdefault("state", {})["user"] = user
+
+        if issued is None or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        cookie = f"{USER_COOKIE_NAME}={issued}; Path=/; Max-Age={USER_COOKIE_MAX_AGE}; HttpOnly; SameSite=Lax"
+        if scope.get("scheme") == "https":
+            cookie += "; Secure"
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], (b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
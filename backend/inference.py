@@ -0,0 +1,176 @@
+import os
+import signal
+import threading
+import uuid
+import numpy as np
+from multiprocessing.managers import BaseManager
+from backend.shared_audio import SharedPcm, shared_ref, attached_pcm
+from backend.config import DEFAULT_MODEL
+
+
+class InferenceManager(BaseManager):
+    pass
+
+
+InferenceManager.register("backend")
+
+
+class InferenceBackend:
+    """Owns the loaded models for every web worker; served over a multiprocessing manager."""
+
+    def __init__(self):
+        self.draining = False
+        self._jobs: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def transcribe(self, job_id: str, audio, model_size: str, language: str | None = None) -> dict:
+        """`audio` is encoded bytes, a PCM array, or a {"shm", "offset", "length"} SharedPcm reference."""
+        from backend.transcription import TranscriptionService
+
+        cancel = threading.Event()
+        with self._lock:
+            self._jobs[job_id] = cancel
+        try:
+            if isinstance(audio, dict):
+                with attached_pcm(audio) as pcm:
+                    return TranscriptionService().transcribe(pcm, model_size, cancel, language)
+            return TranscriptionService().transcribe(audio, model_size, cancel, language)
+        finally:
+            with self._lock:
+                self._jobs.pop(job_id, None)
+
+    def detect_language(self, audio, model_size: str) -> tuple[str, float]:
+        from backend.transcription import TranscriptionService
+
+        if isinstance(audio, dict):
+            with attached_pcm(audio) as pcm:
+                return TranscriptionService().detect_language(pcm, model_size)
+        return TranscriptionService().detect_language(audio, model_size)
+
+    def cancel(self, job_id: str):
+        with self._lock:
+            cancel = self._jobs.get(job_id)
+        if cancel is not None:
+            cancel.set()
+
+    def calibrate(self, model_size: str) -> dict | None:
+        from backend.models import model_manager
+        from backend.transcription import TranscriptionService
+
+        calibrated = model_manager.calibrate(model_size)
+        if not calibrated:
+            return None
+        TranscriptionService().install_model(model_size, *calibrated)
+        return model_manager.describe()["sizes"][model_size]
+
+    def describe_models(self) -> dict:
+        from backend.models import model_manager
+
+        return model_manager.describe()
+
+    def status(self) -> dict:
+        from backend.batching import batch_scheduler
+        from backend.transcription import TranscriptionService
+        from backend.warmup import warmup_state
+
+        snapshot = warmup_state.snapshot()
+        with self._lock:
+            active = len(self._jobs)
+        return {
+            **snapshot,
+            "ready": snapshot["ready"] and not self.draining,
+            "draining": self.draining,
+            "active_jobs": active,
+            "loaded": TranscriptionService().get_loaded_variants(),
+            "batching": batch_scheduler.stats(),
+        }
+
+    def drain(self):
+        self.draining = True
+
+
+def inference_address() -> tuple[str, int] | None:
+    address = os.getenv("SPEECHLAB_INFERENCE_ADDRESS")
+    if not address:
+        return None
+    host, _, port = address.rpartition(":")
+    return host, int(port)
+
+
+def _authkey() -> bytes:
+    return os.getenv("SPEECHLAB_INFERENCE_AUTHKEY", "").encode()
+
+
+_local = threading.local()
+
+
+def remote_backend():
+    proxy = getattr(_local, "proxy", None)
+    if proxy is None:
+        manager = InferenceManager(address=inference_address(), authkey=_authkey())
+        manager.connect()
+        proxy = manager.backend()
+        _local.proxy = proxy
+    return proxy
+
+
+def _with_shared_pcm(audio, call):
+    """PCM arrays travel through shared memory: by reference when already shared, else via a one-off segment."""
+    if isinstance(audio, np.ndarray):
+        ref = shared_ref(audio)
+        if ref is None:
+            with SharedPcm(audio) as shared:
+                return call(shared.ref(shared.array))
+        audio = ref
+    return call(audio)
+
+
+def remote_transcribe(
+    audio, model_size: str, cancel: threading.Event | None = None, language: str | None = None
+) -> dict:
+    return _with_shared_pcm(audio, lambda ref: _remote_transcribe(ref, model_size, cancel, language))
+
+
+def remote_detect_language(audio, model_size: str) -> tuple[str, float]:
+    return tuple(_with_shared_pcm(audio, lambda ref: remote_backend().detect_language(ref, model_size)))
+
+
+def _remote_transcribe(
+    audio, model_size: str, cancel: threading.Event | None = None, language: str | None = None
+) -> dict:
+    job_id = uuid.uuid4().hex
+    done = threading.Event()
+
+    if cancel is not None:
+        def forward_cancel():
+            while not done.is_set():
+                if cancel.wait(0.2):
+                    if not done.is_set():
+                        remote_backend().cancel(job_id)
+                    return
+
+        threading.Thread(target=forward_cancel, name=f"cancel-{job_id[:8]}", daemon=True).start()
+
+    try:
+        return remote_backend().transcribe(job_id, audio, model_size, language)
+    finally:
+        done.set()
+
+
+def serve_inference(address: tuple[str, int], authkey: bytes, model_size: str = DEFAULT_MODEL, batching: bool = False):
+    """Run the shared inference backend until killed; shutdown is driven by the parent."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    from backend.transcription import TranscriptionService
+    from backend.warmup import start_warmup
+
+    TranscriptionService.batching = batching
+
+    backend = InferenceBackend()
+    InferenceManager.register("backend", callable=lambda: backend)
+    start_warmup(model_size)
+
+    server = InferenceManager(address=address, authkey=authkey).get_server()
+    print(f"[Inference] Serving models on {address[0]}:{address[1]}")
+    server.serve_forever()
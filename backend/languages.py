@@ -0,0 +1,44 @@
+import re
+from functools import lru_cache
+from backend.config import FILLER_LEXICONS, NO_SPACE_LANGUAGES
+
+DEFAULT_LANGUAGE = "en"
+ENGLISH_INITIAL_PROMPT = "Um, uh, like, you know, basically, actually, so,"
+
+_ENGLISH_TOKEN = re.compile(r"[a-zA-Z']+")
+_WORD_TOKEN = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+_CHARACTER_TOKEN = re.compile(r"[^\W\d_]")
+_SENTENCE_BREAK = re.compile(r"[.!?。！？]+")
+
+
+def normalize_language(language: str | None) -> str:
+    return (language or DEFAULT_LANGUAGE).lower().split("-")[0]
+
+
+def tokenize(text: str, language: str | None = None) -> list[str]:
+    language = normalize_language(language)
+    if language == "en":
+        return _ENGLISH_TOKEN.findall(text.lower())
+    if language in NO_SPACE_LANGUAGES:
+        return _CHARACTER_TOKEN.findall(text.lower())
+    return _WORD_TOKEN.findall(text.lower())
+
+
+def split_sentences(text: str) -> list[str]:
+    return [s.strip() for s in _SENTENCE_BREAK.split(text) if s.strip()]
+
+
+def filler_lexicon(language: str | None = None) -> dict:
+    """Filler words for `language`; languages without a lexicon get empty lists, not English ones."""
+    return FILLER_LEXICONS.get(normalize_language(language), {"single": [], "multi": [], "sentence_start": []})
+
+
+@lru_cache(maxsize=None)
+def initial_prompt(language: str | None = None) -> str | None:
+    """Decoder prompt that keeps Whisper from dropping disfluencies, in the recording's language."""
+    language = normalize_language(language)
+    if language == "en":
+        return ENGLISH_INITIAL_PROMPT
+    lexicon = filler_lexicon(language)
+    words = lexicon["single"] + lexicon["multi"]
+    return ", ".join(words).capitalize() + "," if words else None
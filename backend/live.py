@@ -0,0 +1,145 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from backend.audio_chunks import frame_energy_db, calibrate_threshold, _runs
+from backend.config import (
+    PAUSE_THRESHOLD_SECONDS,
+    LIVE_FRAME_MS,
+    LIVE_HISTORY_SECONDS,
+    LIVE_WINDOW_SECONDS,
+    LIVE_LOUDNESS_SECONDS,
+    LIVE_MIN_SPEECH_DB,
+    LIVE_SMOOTHING_FRAMES,
+    LIVE_SYLLABLE_GAP_SECONDS,
+    LIVE_SYLLABLE_PROMINENCE_DB,
+    LIVE_ARTICULATION_GAP_SECONDS,
+)
+
+
+class LiveAnalyzer:
+    """Running speech/pause/loudness/syllable-rate metrics from PCM16 blocks, no transcription.
+
+    Only the last LIVE_HISTORY_SECONDS of 10 ms frame energies are kept, so memory and
+    per-block cost stay constant however long the recording runs.
+    """
+
+    def __init__(self, sample_rate: int = 16000):
+        self.sample_rate = sample_rate
+        self.frame_samples = max(1, sample_rate * LIVE_FRAME_MS // 1000)
+        self.hop = self.frame_samples / sample_rate
+        self.history_frames = int(LIVE_HISTORY_SECONDS / self.hop)
+        self.window_frames = int(LIVE_WINDOW_SECONDS / self.hop)
+        self.gap_frames = max(1, int(LIVE_SYLLABLE_GAP_SECONDS / self.hop))
+        self.pause_frames = int(PAUSE_THRESHOLD_SECONDS / self.hop)
+        self.articulation_gap_frames = int(LIVE_ARTICULATION_GAP_SECONDS / self.hop)
+
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._energy = np.zeros(0, dtype=np.float32)
+        self._first = 0  # absolute index of _energy[0]
+        self._checked = 0  # frames before this were already searched for syllable peaks
+        self._peaks = np.zeros(0, dtype=np.int64)
+        self._frames = 0
+        self._voiced = 0
+        self._syllables = 0
+        self._silent_run = 0
+        self._pauses = 0
+        self._longest_pause = 0
+
+    def feed(self, data: bytes) -> dict:
+        pcm = np.frombuffer(data[:len(data) // 2 * 2], dtype="<i2").astype(np.float32) / 32768.0
+        samples = np.concatenate([self._remainder, pcm])
+        usable = samples.size // self.frame_samples * self.frame_samples
+        self._remainder = samples[usable:]
+        energy = frame_energy_db(samples[:usable], self.frame_samples).astype(np.float32)
+
+        history = np.concatenate([self._energy, energy])
+        if history.size > self.history_frames:
+            self._first += history.size - self.history_frames
+            history = history[-self.history_frames:]
+        self._energy = history
+        if not history.size:
+            return self.snapshot(None)
+
+        noise_floor, _, threshold = calibrate_threshold(history)
+        threshold = max(threshold, LIVE_MIN_SPEECH_DB)
+        self._count_frames(energy >= threshold)
+        self._find_syllables(threshold)
+        return self.snapshot(threshold, noise_floor)
+
+    def _count_frames(self, active: np.ndarray):
+        if not active.size:
+            return
+        silent_starts, silent_ends = _runs(~active)
+        lengths = silent_ends - silent_starts
+        if lengths.size and silent_starts[0] == 0:
+            lengths[0] += self._silent_run
+        elif self._silent_run:
+            lengths = np.concatenate([[self._silent_run], lengths])
+
+        trailing = not active[-1]
+        self._silent_run = int(lengths[-1]) if trailing else 0
+        # Silence before the first word is not a pause.
+        skip = int(self._voiced == 0 and lengths.size > 0 and (self._frames > 0 or silent_starts[0] == 0))
+        pauses = lengths[skip:]
+        finished = (lengths[:-1] if trailing else lengths)[skip:]
+
+        self._frames += active.size
+        self._voiced += int(np.count_nonzero(active))
+        self._pauses += int(np.count_nonzero(finished >= self.pause_frames))
+        if pauses.size:
+            self._longest_pause = max(self._longest_pause, int(pauses.max()))
+
+    def _find_syllables(self, threshold: float):
+        """Syllable nuclei: peaks of the smoothed envelope that top their ±gap neighbourhood by a margin."""
+        kernel = np.full(LIVE_SMOOTHING_FRAMES, 1.0 / LIVE_SMOOTHING_FRAMES, dtype=np.float32)
+        smoothed = np.convolve(self._energy, kernel, mode="same")
+        gap = self.gap_frames
+        start = max(self._checked - self._first, gap)
+        end = smoothed.size - gap
+        if end <= start:
+            return
+
+        neighbourhood = sliding_window_view(smoothed, 2 * gap + 1)[start - gap:end - gap]
+        centre = smoothed[start:end]
+        is_peak = (
+            (centre >= neighbourhood.max(axis=1))
+            & (centre - neighbourhood.min(axis=1) >= LIVE_SYLLABLE_PROMINENCE_DB)
+            & (centre >= threshold)
+        )
+        peaks = np.flatnonzero(is_peak) + start + self._first
+        if peaks.size > 1:
+            peaks = peaks[np.concatenate([[True], np.diff(peaks) > gap])]
+        if peaks.size and self._peaks.size and peaks[0] - self._peaks[-1] <= gap:
+            peaks = peaks[1:]
+
+        self._syllables += int(peaks.size)
+        self._peaks = np.concatenate([self._peaks, peaks])
+        self._peaks = self._peaks[self._peaks >= self._first + self._energy.size - self.window_frames]
+        self._checked = end + self._first
+
+    def _articulation_frames(self, window: np.ndarray, threshold: float) -> int:
+        """Frames of the window minus silences long enough to be pauses rather than gaps between syllables."""
+        starts, ends = _runs(window < threshold)
+        lengths = ends - starts
+        return int(window.size - lengths[lengths >= self.articulation_gap_frames].sum())
+
+    def snapshot(self, threshold: float | None, noise_floor: float | None = None) -> dict:
+        window = self._energy[-self.window_frames:]
+        recent = self._energy[-int(LIVE_LOUDNESS_SECONDS / self.hop):]
+        if threshold is None:
+            speaking_window, recent_voiced = 0, recent[:0]
+        else:
+            speaking_window = self._articulation_frames(window, threshold)
+            recent_voiced = recent[recent >= threshold]
+
+        return {
+            "elapsed_seconds": round(self._frames * self.hop, 2),
+            "speaking": bool(threshold is not None and recent.size and recent[-1] >= threshold),
+            "speaking_ratio": round(self._voiced / self._frames, 3) if self._frames else 0.0,
+            "current_pause_seconds": round(self._silent_run * self.hop, 2),
+            "longest_pause_seconds": round(self._longest_pause * self.hop, 2),
+            "pause_count": self._pauses,
+            "loudness_db": round(float(recent_voiced.mean()), 1) if recent_voiced.size else None,
+            "syllable_rate": round(self._peaks.size / (speaking_window * self.hop), 2) if speaking_window else 0.0,
+            "syllables": self._syllables,
+            "noise_floor_db": None if noise_floor is None else round(noise_floor, 1),
+        }
@@ -1,23 +1,61 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Request, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Request, Form, Depends, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from concurrent.futures import ThreadPoolExecutor
-from pydub import AudioSegment
+from contextlib import asynccontextmanager
 from io import BytesIO
-from backend.transcription import transcribe_audio, transcribe_audio_chunk
-from backend.metrics import compute_all_metrics
-from backend.topics import get_random_topic, get_topic_by_category, get_all_categories
-from backend.config import FRONTEND_DIR, AVAILABLE_MODELS, DEFAULT_MODEL, PROJECT_ROOT
+from backend.transcription import (
+    TranscriptionService,
+    TranscriptionCancelled,
+    SAMPLE_RATE,
+    decode_pcm16,
+    load_audio,
+    transcribe_audio,
+    transcribe_audio_chunk,
+    detect_audio_language,
+)
+from backend.models import model_manager
+from backend.metrics import compute_metrics_report, metric_versions, METRIC_GROUPS
+from backend.topics import get_random_topic, get_topic_by_category, get_topic_by_id, get_all_categories
+from backend.config import FRONTEND_DIR, AVAILABLE_MODELS, TRANSCRIPTION_MODES, DEFAULT_MODEL, WARMUP_ON_STARTUP, DIARIZATION_MAX_SPEAKERS, DISCONNECT_POLL_SECONDS, LIVE_MAX_MESSAGE_BYTES, ADMISSION_FALLBACK_BYTES_PER_SECOND, PCM_MIN_SAMPLE_RATE, PCM_MAX_SAMPLE_RATE
 from backend.audio_chunks import AudioChunker
+from backend.diarization import diarize_audio, diarize_chunks, assign_speakers
+from backend.live import LiveAnalyzer
+from backend.checkpoints import checkpoints
+from backend.inference import inference_address, remote_backend
+from backend.shared_audio import SharedPcm
+from backend.sessions import session_store, InvalidUserError
+from backend.identity import UserCookieMiddleware
+from backend.rescoring import rescore_session, rescore_sessions
+from backend.session_export import EXPORT_FORMATS, SessionImport, iter_ndjson, iter_parquet, iter_arrow, pa
+from backend.timeline import WordTimeline
+from backend.responses import ORJSONResponse, negotiated_response, dumps
+from backend.admission import admission, AdmissionRejected
+from backend.batching import batch_scheduler
+from backend.warmup import warmup_state, start_warmup
 import os
-import json
+import math
+import threading
+import numpy as np
+import orjson
 import asyncio
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if WARMUP_ON_STARTUP and not inference_address():
+        start_warmup(DEFAULT_MODEL)
+    checkpoints.prune()
+    yield
+
+
 app = FastAPI(
     title="SpeechLab",
     description="Offline speech analysis and fluency feedback tool.",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -27,14 +65,37 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(UserCookieMiddleware)
+
+
+def session_user(request: Request) -> str | None:
+    return getattr(request.state, "user", None)
+
+
+@app.get("/api/health")
+def api_health():
+    # In server mode warmup happens in the inference process, not in this worker.
+    snapshot = remote_backend().status() if inference_address() else warmup_state.snapshot()
+    return {"status": "ok", **snapshot}
+
+
+@app.get("/api/ready")
+def api_ready():
+    snapshot = remote_backend().status() if inference_address() else warmup_state.snapshot()
+    return ORJSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
 
 
 @app.get("/api/topic")
-def api_get_topic(category: str = None):
+def api_get_topic(
+    category: str = None,
+    difficulty: str = None,
+    length: str = None,
+    user: str | None = Depends(session_user),
+):
     try:
         if category:
-            return get_topic_by_category(category)
-        return get_random_topic()
+            return get_topic_by_category(category, user=user, difficulty=difficulty, length=length)
+        return get_random_topic(user=user, difficulty=difficulty, length=length)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -48,95 +109,349 @@ def api_get_categories():
 def api_get_models():
     return {
         "models": AVAILABLE_MODELS,
+        "modes": TRANSCRIPTION_MODES,
         "default": DEFAULT_MODEL,
+        "loaded": remote_backend().status()["loaded"] if inference_address() else TranscriptionService().get_loaded_variants(),
+        # The inference process calibrates and persists the choice; this worker's copy is from import time.
+        "variants": remote_backend().describe_models() if inference_address() else model_manager.describe(),
     }
 
 
-def _compute_audio_duration(audio_bytes: bytes) -> float:
-    audio_seg = AudioSegment.from_file(BytesIO(audio_bytes))
-    return len(audio_seg) / 1000.0
+@app.post("/api/models/calibrate")
+async def api_calibrate_model(model: str = Query(default=DEFAULT_MODEL, description="Whisper model size")):
+    if model not in AVAILABLE_MODELS:
+        raise HTTPException(status_code=400, detail=f"Invalid model: {model}. Available: {AVAILABLE_MODELS}")
+
+    loop = asyncio.get_running_loop()
+    if inference_address():
+        calibrated = await loop.run_in_executor(None, lambda: remote_backend().calibrate(model))
+        if not calibrated:
+            raise HTTPException(status_code=503, detail=f"No loadable variants for model '{model}'.")
+        return calibrated
+
+    calibrated = await loop.run_in_executor(None, model_manager.calibrate, model)
+    if not calibrated:
+        raise HTTPException(status_code=503, detail=f"No loadable variants for model '{model}'.")
+
+    TranscriptionService().install_model(model, *calibrated)
+    return model_manager.describe()["sizes"][model]
+
+
+def _probe_duration(audio_bytes: bytes, reported: float = 0) -> float:
+    """Admission estimate without decoding: the container header, else the larger of the client's figure and a size-based guess."""
+    import av
+
+    try:
+        with av.open(BytesIO(audio_bytes)) as container:
+            if container.duration:
+                return container.duration / av.time_base
+    except av.error.FFmpegError:
+        pass
+    return max(reported, len(audio_bytes) / ADMISSION_FALLBACK_BYTES_PER_SECOND)
+
+
+def _transcribe_chunk_checkpointed(
+    job_id: str, chunk: dict, model: str, cancel: threading.Event | None = None, language: str | None = None
+) -> dict:
+    chunk_result = transcribe_audio_chunk(chunk, model, cancel, language)
+    try:
+        checkpoints.save(job_id, chunk_result)
+    except OSError as e:
+        print(f"[Checkpoints] Could not save chunk {chunk['start_time']} of job {job_id}: {e}")
+    return chunk_result
 
 
 def _merge_chunk_results(chunk_results: list) -> dict:
     chunk_results.sort(key=lambda x: x["start_time"])
 
-    merged_transcript_parts = []
-    merged_word_timestamps = []
     model_used = None
-
     for chunk in chunk_results:
-        result = chunk["result"]
-        offset_seconds = chunk["start_time"] / 1000.0
-        model_used = result.get("model_used", model_used)
+        model_used = chunk["result"].get("model_used", model_used)
 
-        merged_transcript_parts.append(result["transcript"])
+    return {
+        "transcript": " ".join(chunk["result"]["transcript"] for chunk in chunk_results),
+        "word_timestamps": WordTimeline.concat(
+            [chunk["result"]["word_timestamps"] for chunk in chunk_results],
+            [chunk["start_time"] / 1000.0 for chunk in chunk_results],
+        ),
+        "model_used": model_used or DEFAULT_MODEL,
+        "language": chunk_results[0]["result"].get("language") if chunk_results else None,
+        "alignment": _merge_alignment([chunk["result"] for chunk in chunk_results]),
+        "hybrid": _merge_hybrid([chunk["result"] for chunk in chunk_results]),
+    }
 
-        for wt in result.get("word_timestamps", []):
-            merged_word_timestamps.append({
-                "word": wt["word"],
-                "start": round(wt["start"] + offset_seconds, 3),
-                "end": round(wt["end"] + offset_seconds, 3),
-            })
 
+def _merge_hybrid(results: list[dict]) -> dict | None:
+    stats = [r["hybrid"] for r in results if r.get("hybrid")]
+    if not stats:
+        return None
     return {
-        "transcript": " ".join(merged_transcript_parts),
-        "word_timestamps": merged_word_timestamps,
-        "model_used": model_used or DEFAULT_MODEL,
+        **stats[0],
+        **{key: round(sum(s[key] for s in stats), 2) for key in ("refined_spans", "refined_seconds", "draft_seconds")},
     }
 
 
+def _merge_alignment(results: list[dict]) -> dict | None:
+    stats = [(r["alignment"], len(r["word_timestamps"])) for r in results if r.get("alignment")]
+    if not stats:
+        return None
+    words = sum(count for _, count in stats)
+    return {
+        "words_adjusted": sum(a["words_adjusted"] for a, _ in stats),
+        "mean_shift_ms": round(sum(a["mean_shift_ms"] * count for a, count in stats) / words, 1) if words else 0.0,
+        "elapsed_ms": round(sum(a["elapsed_ms"] for a, _ in stats), 2),
+    }
+
+
+async def _transcribe_chunks(
+    audio_data: bytes | np.ndarray,
+    chunks: list[dict],
+    model: str,
+    diarize: bool = False,
+    num_speakers: int | None = None,
+    cancel: threading.Event | None = None,
+) -> tuple[dict, list | None]:
+    loop = asyncio.get_running_loop()
+    job_id = checkpoints.job_id(audio_data, model)
+    completed = await loop.run_in_executor(None, checkpoints.load, job_id)
+    pending = [chunk for chunk in chunks if chunk["start_time"] not in completed]
+    if completed:
+        print(f"[Checkpoints] Resuming job {job_id}: {len(chunks) - len(pending)}/{len(chunks)} chunks done")
+
+    # Detect once, on the first speech chunk, and pin the result for every chunk.
+    language = next((c["result"].get("language") for c in completed.values() if c["result"].get("language")), None)
+    if language is None and pending:
+        language, _ = await loop.run_in_executor(None, detect_audio_language, chunks[0]["pcm"], model, cancel)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(len(pending), 4)))
+    try:
+        transcription = asyncio.gather(
+            *[loop.run_in_executor(executor, _transcribe_chunk_checkpointed, job_id, chunk, model, cancel, language)
+              for chunk in pending]
+        )
+        if diarize:
+            chunk_results, turns = await asyncio.gather(
+                transcription, loop.run_in_executor(None, diarize_chunks, chunks, num_speakers)
+            )
+        else:
+            chunk_results, turns = await transcription, None
+    except BaseException:
+        if cancel is not None:
+            cancel.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown(wait=False)
+
+    for chunk_result in chunk_results:
+        completed[chunk_result["start_time"]] = chunk_result
+    merged = _merge_chunk_results([completed[chunk["start_time"]] for chunk in chunks])
+    checkpoints.discard(job_id)
+    return merged, turns
+
+
+async def _transcribe(
+    audio_data: bytes | np.ndarray,
+    duration_seconds: float,
+    model: str,
+    diarize: bool = False,
+    num_speakers: int | None = None,
+    cancel: threading.Event | None = None,
+) -> tuple[str, WordTimeline, str, str | None, dict | None, dict]:
+    loop = asyncio.get_running_loop()
+    chunking = None
+
+    if duration_seconds > 30:
+        chunker = AudioChunker()
+        pcm = audio_data if isinstance(audio_data, np.ndarray) else await loop.run_in_executor(None, chunker.decode, audio_data)
+        shared = SharedPcm(pcm) if inference_address() else None
+        try:
+            chunks, chunking = await loop.run_in_executor(None, chunker.split_pcm, shared.array if shared else pcm)
+            merged, turns = await _transcribe_chunks(audio_data, chunks, model, diarize, num_speakers, cancel)
+        finally:
+            if shared is not None:
+                shared.close()
+        result = merged
+    else:
+        transcription = loop.run_in_executor(None, transcribe_audio, audio_data, model, cancel)
+        if diarize:
+            result, turns = await asyncio.gather(
+                transcription, loop.run_in_executor(None, diarize_audio, audio_data, num_speakers)
+            )
+        else:
+            result, turns = await transcription, None
+
+    transcript, word_timestamps, model_used = result["transcript"], result["word_timestamps"], result["model_used"]
+    if turns:
+        assign_speakers(word_timestamps, turns)
+    passes = {"alignment": result.get("alignment"), "hybrid": result.get("hybrid")}
+    return transcript, word_timestamps, model_used, result.get("language"), chunking, passes
+
+
+async def _cancel_on_disconnect(request: Request, coro, cancel: threading.Event):
+    task = asyncio.ensure_future(coro)
+    disconnected = False
+
+    async def watch():
+        nonlocal disconnected
+        while not task.done():
+            if await request.is_disconnected():
+                disconnected = True
+                cancel.set()
+                task.cancel()
+                print("[Analyze] Client disconnected, cancelling in-flight work.")
+                return
+            await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+    watcher = asyncio.create_task(watch())
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if disconnected:
+            raise TranscriptionCancelled("Client disconnected")
+        raise
+    finally:
+        cancel.set()
+        watcher.cancel()
+
+
+@app.get("/api/admission")
+def api_admission(
+    duration: float = Query(default=60, description="Audio duration in seconds"),
+    model: str = Query(default=DEFAULT_MODEL, description="Whisper model size"),
+):
+    cost = admission.estimate_cost(duration, model)
+    return {
+        "cost": round(cost, 1),
+        "estimated_wait_seconds": round(admission.estimate_wait(cost), 2),
+        **admission.stats(),
+    }
+
+
+@app.get("/api/batching")
+def api_batching():
+    return remote_backend().status()["batching"] if inference_address() else batch_scheduler.stats()
+
+
+@app.websocket("/api/live")
+async def api_live(websocket: WebSocket, sample_rate: int = Query(default=SAMPLE_RATE, ge=PCM_MIN_SAMPLE_RATE, le=PCM_MAX_SAMPLE_RATE)):
+    """Binary PCM16 blocks in, one JSON metrics snapshot out per block. Cheap enough to run on the event loop."""
+    await websocket.accept()
+    analyzer = LiveAnalyzer(sample_rate)
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            data = message.get("bytes")
+            if not data:
+                continue
+            if len(data) > LIVE_MAX_MESSAGE_BYTES:
+                await websocket.close(code=1009, reason="Block too large")
+                return
+            await websocket.send_text(dumps(analyzer.feed(data)).decode())
+    except WebSocketDisconnect:
+        pass
+
+
 @app.post("/api/analyze")
 async def api_analyze(
+    request: Request,
     audio: UploadFile = File(...),
     model: str = Query(default=DEFAULT_MODEL, description="Whisper model size"),
     duration: float = Form(default=0),
+    topic_id: str = Form(default=""),
+    topic: str = Form(default=""),
+    sample_rate: int = Form(default=0, ge=0, le=PCM_MAX_SAMPLE_RATE, description="Set when the upload is raw mono PCM16 at this rate"),
+    word_format: str = Query(default="records", description="word_timestamps layout: records or columnar"),
+    groups: str = Query(default="", description="Comma-separated metric groups to compute (default: all)"),
+    window_seconds: float = Query(default=0, ge=0, description="Time-series window length (0 = default)"),
+    hop_seconds: float = Query(default=0, ge=0, description="Time-series window hop (0 = default)"),
+    diarize: bool = Query(default=False, description="Split the recording by speaker"),
+    speakers: int = Query(default=0, ge=0, le=DIARIZATION_MAX_SPEAKERS, description="Expected speaker count (0 = detect)"),
 ):
-    if model not in AVAILABLE_MODELS:
+    if model not in TRANSCRIPTION_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid model: {model}. Available: {TRANSCRIPTION_MODES}",
+        )
+    if sample_rate and sample_rate < PCM_MIN_SAMPLE_RATE:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid model: {model}. Available: {AVAILABLE_MODELS}",
+            detail=f"Invalid sample_rate: {sample_rate}. Use 0 for encoded audio or {PCM_MIN_SAMPLE_RATE}-{PCM_MAX_SAMPLE_RATE} for raw PCM16.",
         )
 
+    selected_groups = [g.strip() for g in groups.split(",") if g.strip()] or None
+    if selected_groups:
+        unknown = [g for g in selected_groups if g not in METRIC_GROUPS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid metric groups: {unknown}. Available: {list(METRIC_GROUPS)}",
+            )
+
     try:
         audio_bytes = await audio.read()
         if not audio_bytes:
             raise HTTPException(status_code=400, detail="Empty audio file.")
 
-        actual_duration = _compute_audio_duration(audio_bytes)
-
-        if actual_duration > 30:
-            chunker = AudioChunker()
-            chunks, _ = chunker.split_audio_bytes(audio_bytes)
-
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor(max_workers=min(len(chunks), 4)) as executor:
-                chunk_results = list(await asyncio.gather(
-                    *[loop.run_in_executor(executor, transcribe_audio_chunk, chunk)
-                      for chunk in chunks]
-                ))
-
-            merged = _merge_chunk_results(chunk_results)
-            transcript = merged["transcript"]
-            word_timestamps = merged["word_timestamps"]
-            model_used = merged["model_used"]
+        if sample_rate:
+            estimated_duration = len(audio_bytes) / 2 / sample_rate
         else:
-            result = transcribe_audio(audio_bytes, model_size=model)
-            transcript = result["transcript"]
-            word_timestamps = result["word_timestamps"]
-            model_used = result["model_used"]
-
-        if not transcript.strip():
-            raise HTTPException(status_code=422, detail="No speech detected in the audio.")
-
-        metrics = compute_all_metrics(transcript, actual_duration, word_timestamps)
-
-        return {
+            estimated_duration = _probe_duration(audio_bytes, duration)
+        topic_info = get_topic_by_id(topic_id) or ({"topic": topic} if topic else None)
+        cost = admission.estimate_cost(estimated_duration, model)
+
+        cancel = threading.Event()
+
+        async def run():
+            async with admission.slot(cost) as ticket:
+                # Uploads are decoded and resampled once, here, so queued requests hold no PCM.
+                if sample_rate:
+                    audio_data = await asyncio.get_running_loop().run_in_executor(None, decode_pcm16, audio_bytes, sample_rate)
+                else:
+                    audio_data = await asyncio.get_running_loop().run_in_executor(None, load_audio, audio_bytes)
+                actual_duration = round(audio_data.size / SAMPLE_RATE, 2)
+                ticket.recharge(admission.estimate_cost(actual_duration, model))
+                transcript, word_timestamps, model_used, language, chunking, passes = await _transcribe(
+                    audio_data, actual_duration, model, diarize, speakers or None, cancel
+                )
+
+                if not transcript.strip():
+                    raise HTTPException(status_code=422, detail="No speech detected in the audio.")
+
+                metrics, metric_timings = await asyncio.get_running_loop().run_in_executor(
+                    None, compute_metrics_report,
+                    transcript, actual_duration, word_timestamps, topic_info, selected_groups,
+                    audio_data, {"window_seconds": window_seconds, "hop_seconds": hop_seconds}, False, language,
+                )
+            return ticket, actual_duration, transcript, word_timestamps, model_used, language, chunking, passes, metrics, metric_timings
+
+        try:
+            ticket, actual_duration, transcript, word_timestamps, model_used, language, chunking, passes, metrics, metric_timings = (
+                await _cancel_on_disconnect(request, run(), cancel)
+            )
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=429,
+                detail=f"Server busy. Estimated wait: {e.retry_after:.0f}s",
+                headers={"Retry-After": str(math.ceil(e.retry_after))},
+            )
+        except TranscriptionCancelled:
+            raise HTTPException(status_code=499, detail="Client closed request.")
+
+        return negotiated_response(request, {
             "transcript": transcript,
             "duration_seconds": actual_duration,
-            "word_timestamps": word_timestamps,
+            "word_timestamps": word_timestamps.to_columns() if word_format == "columnar" else word_timestamps.to_records(),
             "metrics": metrics,
+            "metric_timings": metric_timings,
+            "metric_versions": {g: v for g, v in metric_versions().items() if g in metric_timings},
             "model_used": model_used,
-        }
+            "language": language,
+            "chunking": chunking,
+            **passes,
+            "admission": ticket.to_dict(),
+        }, headers={"X-Queue-Wait": str(round(ticket.queued_seconds, 2))})
 
     except HTTPException:
         raise
@@ -144,41 +459,154 @@ async def api_analyze(
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
-SESSION_FILE = os.path.join(PROJECT_ROOT, "sessions.json")
-
-
 @app.get("/api/sessions")
-def api_get_sessions():
+def api_get_sessions(request: Request, user: str | None = Depends(session_user)):
     try:
-        if os.path.exists(SESSION_FILE):
-            with open(SESSION_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return []
-    except (json.JSONDecodeError, IOError):
+        return negotiated_response(request, session_store.load(user))
+    except InvalidUserError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (orjson.JSONDecodeError, IOError):
         return []
 
 
 @app.post("/api/sessions")
-async def api_save_sessions(request: Request):
+async def api_save_sessions(request: Request, user: str | None = Depends(session_user)):
     try:
-        sessions = await request.json()
-        with open(SESSION_FILE, "w", encoding="utf-8") as f:
-            json.dump(sessions, f, indent=2, ensure_ascii=False)
+        sessions = orjson.loads(await request.body())
+        session_store.write(user, dumps(sessions))
         return {"status": "ok", "count": len(sessions)}
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid sessions payload: {str(e)}")
+    except InvalidUserError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except IOError as e:
         raise HTTPException(status_code=500, detail=f"Failed to save sessions: {str(e)}")
 
 
 @app.delete("/api/sessions")
-def api_clear_sessions():
+def api_clear_sessions(user: str | None = Depends(session_user)):
     try:
-        if os.path.exists(SESSION_FILE):
-            os.remove(SESSION_FILE)
+        session_store.clear(user)
         return {"status": "ok"}
+    except InvalidUserError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except IOError as e:
         raise HTTPException(status_code=500, detail=f"Failed to clear sessions: {str(e)}")
 
 
+@app.get("/api/sessions/export")
+def api_export_sessions(
+    format: str = Query(default="ndjson", description="ndjson, parquet or arrow"),
+    user: str | None = Depends(session_user),
+):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format: {format}. Available: {list(EXPORT_FORMATS)}")
+    if format != "ndjson" and pa is None:
+        raise HTTPException(status_code=501, detail=f"{format} export requires pyarrow.")
+    try:
+        sessions = session_store.load(user)
+    except InvalidUserError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (orjson.JSONDecodeError, IOError):
+        sessions = []
+
+    chunks = {"ndjson": iter_ndjson, "parquet": iter_parquet, "arrow": iter_arrow}[format](sessions)
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="sessions.{format}"'},
+    )
+
+
+@app.post("/api/sessions/import")
+async def api_import_sessions(
+    request: Request,
+    replace: bool = Query(default=False, description="Replace the whole history instead of merging by id"),
+    user: str | None = Depends(session_user),
+):
+    importer = SessionImport()
+    async for chunk in request.stream():
+        importer.feed(chunk)
+    imported = importer.finish()
+    # A bad file must not wipe the history it was meant to replace.
+    if replace and (not imported or importer.rejected):
+        raise HTTPException(
+            status_code=422,
+            detail=f"History not replaced: {len(imported)} valid, {importer.rejected} rejected. {'; '.join(importer.errors)}".strip(),
+        )
+
+    def merge(sessions: list) -> tuple[dict, bool]:
+        existing = {} if replace else {str(s.get("id")): s for s in sessions}
+        replaced = sum(1 for s in imported if str(s["id"]) in existing)
+        existing.update((str(s["id"]), s) for s in imported)
+        sessions[:] = sorted(existing.values(), key=lambda s: s.get("date") or "", reverse=True)
+        summary = {
+            "imported": len(imported),
+            "replaced": replaced,
+            "rejected": importer.rejected,
+            "errors": importer.errors,
+            "count": len(sessions),
+        }
+        return summary, bool(imported)
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(None, session_store.update, user, merge)
+    except InvalidUserError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (orjson.JSONDecodeError, IOError) as e:
+        raise HTTPException(status_code=500, detail=f"Failed to import sessions: {str(e)}")
+
+
+@app.post("/api/sessions/rescore")
+async def api_rescore_sessions(
+    force: bool = Query(default=False, description="Recompute every group, not only stale ones"),
+    user: str | None = Depends(session_user),
+):
+    def rescore_all(sessions: list) -> tuple[dict, bool]:
+        summary = rescore_sessions(sessions, force)
+        return summary, summary["rescored"] > 0
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, session_store.update, user, rescore_all
+        )
+    except InvalidUserError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (orjson.JSONDecodeError, IOError) as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rescore sessions: {str(e)}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/api/sessions/{session_id}/rescore")
+async def api_rescore_session(
+    request: Request,
+    session_id: str,
+    force: bool = Query(default=False, description="Recompute every group, not only stale ones"),
+    user: str | None = Depends(session_user),
+):
+    def rescore_one(sessions: list) -> tuple[dict | None, bool]:
+        session = next((s for s in sessions if str(s.get("id")) == session_id), None)
+        if session is None:
+            return None, False
+        groups = rescore_session(session, force=force)
+        return {"session": session, "rescored_groups": groups}, bool(groups)
+
+    try:
+        result = await asyncio.get_running_loop().run_in_executor(
+            None, session_store.update, user, rescore_one
+        )
+    except InvalidUserError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (orjson.JSONDecodeError, IOError) as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rescore session: {str(e)}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+    return negotiated_response(request, result)
+
+
 app.mount("/css", StaticFiles(directory=os.path.join(FRONTEND_DIR, "css")), name="css")
 app.mount("/js", StaticFiles(directory=os.path.join(FRONTEND_DIR, "js")), name="js")
 
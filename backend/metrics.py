@@ -1,33 +1,55 @@
-import re
-from collections import Counter
+import hashlib
+import threading
+import time
+import numpy as np
+import orjson
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from typing import Optional
+from backend.timeline import WordTimeline
+from backend.acoustics import annotate_timeline
+from backend.audio_chunks import SAMPLE_RATE
+from backend.relevance import get_relevance_index
+from backend.languages import tokenize, split_sentences, filler_lexicon
+from backend import config as settings
 from backend.config import (
-    SINGLE_FILLERS,
-    MULTI_FILLERS,
-    SENTENCE_START_FILLERS,
     PAUSE_THRESHOLD_SECONDS,
     MIN_PHRASE_LENGTH,
     MAX_PHRASE_LENGTH,
+    LOW_CONFIDENCE_WORD_PROBABILITY,
+    MONOTONY_FULL_RANGE_SEMITONES,
+    VOLUME_FULL_RANGE_DB,
+    METRIC_WORKERS,
+    TIMESERIES_WINDOW_SECONDS,
+    TIMESERIES_HOP_SECONDS,
+    TIMESERIES_MAX_POINTS,
+    METRIC_INTERMEDIATE_CACHE_SIZE,
 )
 
 
-def _tokenize(text: str) -> list[str]:
-    return re.findall(r"[a-zA-Z']+", text.lower())
+def _tokenize(text: str, language: str | None = None) -> list[str]:
+    return tokenize(text, language)
 
 
 def _split_sentences(text: str) -> list[str]:
-    sentences = re.split(r'[.!?]+', text)
-    return [s.strip() for s in sentences if s.strip()]
+    return split_sentences(text)
 
 
-def compute_core_metrics(transcript: str, duration_seconds: float) -> dict:
-    words = _tokenize(transcript)
+def compute_core_metrics(
+    transcript: str,
+    duration_seconds: float,
+    words: list[str] | None = None,
+    sentence_words: list[list[str]] | None = None,
+    language: str | None = None,
+) -> dict:
+    words = _tokenize(transcript, language) if words is None else words
     word_count = len(words)
 
     wpm = round((word_count / duration_seconds) * 60, 1) if duration_seconds > 0 else 0
 
-    sentences = _split_sentences(transcript)
-    sentence_lengths = [len(_tokenize(s)) for s in sentences] if sentences else [0]
+    if sentence_words is None:
+        sentence_words = [_tokenize(s, language) for s in _split_sentences(transcript)]
+    sentence_lengths = [len(s) for s in sentence_words] if sentence_words else [0]
 
     avg_sentence_length = round(sum(sentence_lengths) / len(sentence_lengths), 1) if sentence_lengths else 0
     longest_sentence_length = max(sentence_lengths) if sentence_lengths else 0
@@ -42,23 +64,30 @@ def compute_core_metrics(transcript: str, duration_seconds: float) -> dict:
     }
 
 
-def compute_filler_metrics(transcript: str, word_timestamps: Optional[list] = None) -> dict:
+def compute_filler_metrics(
+    transcript: str,
+    word_timestamps: Optional[WordTimeline] = None,
+    words: list[str] | None = None,
+    sentence_words: list[list[str]] | None = None,
+    language: str | None = None,
+) -> dict:
+    lexicon = filler_lexicon(language)
     text_lower = transcript.lower()
-    words = _tokenize(transcript)
+    words = _tokenize(transcript, language) if words is None else words
     word_count = len(words)
     filler_counts = Counter()
     filler_positions = []
 
     for i, word in enumerate(words):
-        if word in SINGLE_FILLERS:
+        if word in lexicon["single"]:
             filler_counts[word] += 1
-            if word_timestamps and i < len(word_timestamps):
+            if word_timestamps is not None and i < len(word_timestamps):
                 filler_positions.append({
                     "filler": word,
-                    "position": word_timestamps[i].get("start", 0) if isinstance(word_timestamps[i], dict) else 0,
+                    "position": round(float(word_timestamps.starts[i]), 3),
                 })
 
-    for phrase in MULTI_FILLERS:
+    for phrase in lexicon["multi"]:
         phrase_lower = phrase.lower()
         start = 0
         while True:
@@ -68,12 +97,12 @@ def compute_filler_metrics(transcript: str, word_timestamps: Optional[list] = No
             filler_counts[phrase] += 1
             start = idx + len(phrase_lower)
 
-    sentences = _split_sentences(transcript)
-    for sentence in sentences:
-        sentence_words = _tokenize(sentence)
-        if sentence_words:
-            first_word = sentence_words[0]
-            if first_word in SENTENCE_START_FILLERS:
+    if sentence_words is None:
+        sentence_words = [_tokenize(s, language) for s in _split_sentences(transcript)]
+    for tokens in sentence_words:
+        if tokens:
+            first_word = tokens[0]
+            if first_word in lexicon["sentence_start"]:
                 filler_counts[first_word + " (start)"] += 1
 
     total_fillers = sum(filler_counts.values())
@@ -89,8 +118,22 @@ def compute_filler_metrics(transcript: str, word_timestamps: Optional[list] = No
     }
 
 
-def compute_repetition_metrics(transcript: str) -> dict:
-    words = _tokenize(transcript)
+def _count_phrases(words: list[str]) -> Counter:
+    phrase_counter = Counter()
+    for length in range(MIN_PHRASE_LENGTH, MAX_PHRASE_LENGTH + 1):
+        for i in range(len(words) - length + 1):
+            phrase = " ".join(words[i:i + length])
+            phrase_counter[phrase] += 1
+    return phrase_counter
+
+
+def compute_repetition_metrics(
+    transcript: str,
+    words: list[str] | None = None,
+    phrase_counter: Counter | None = None,
+    language: str | None = None,
+) -> dict:
+    words = _tokenize(transcript, language) if words is None else words
     repeated_words = []
     repeated_phrases = []
 
@@ -105,11 +148,7 @@ def compute_repetition_metrics(transcript: str) -> dict:
             repeated_words.append({"word": repeated_word, "count": count})
         i += 1
 
-    phrase_counter = Counter()
-    for length in range(MIN_PHRASE_LENGTH, MAX_PHRASE_LENGTH + 1):
-        for i in range(len(words) - length + 1):
-            phrase = " ".join(words[i:i + length])
-            phrase_counter[phrase] += 1
+    phrase_counter = _count_phrases(words) if phrase_counter is None else phrase_counter
 
     common_phrases = {"i think", "it is", "in the", "of the", "to the", "and the", "on the", "is a", "for the"}
     for phrase, count in phrase_counter.items():
@@ -128,8 +167,8 @@ def compute_repetition_metrics(transcript: str) -> dict:
     }
 
 
-def compute_pause_metrics(word_timestamps: Optional[list] = None) -> dict:
-    if not word_timestamps or len(word_timestamps) < 2:
+def compute_pause_metrics(word_timestamps: Optional[WordTimeline] = None) -> dict:
+    if word_timestamps is None or len(word_timestamps) < 2:
         return {
             "longest_pause_seconds": 0,
             "avg_pause_duration": 0,
@@ -137,24 +176,22 @@ def compute_pause_metrics(word_timestamps: Optional[list] = None) -> dict:
             "pauses": [],
         }
 
-    pauses = []
-    for i in range(1, len(word_timestamps)):
-        prev_end = word_timestamps[i - 1].get("end", 0)
-        curr_start = word_timestamps[i].get("start", 0)
-        gap = round(curr_start - prev_end, 3)
-        if gap > 0.1:
-            pauses.append({
-                "duration": gap,
-                "after_word": word_timestamps[i - 1].get("word", ""),
-                "before_word": word_timestamps[i].get("word", ""),
-                "position": round(prev_end, 3),
-            })
-
-    significant_pauses = [p for p in pauses if p["duration"] >= PAUSE_THRESHOLD_SECONDS]
-    all_durations = [p["duration"] for p in pauses]
-
-    longest = round(max(all_durations), 2) if all_durations else 0
-    avg_duration = round(sum(all_durations) / len(all_durations), 2) if all_durations else 0
+    gaps = np.round(word_timestamps.gaps(), 3)
+    all_durations = gaps[gaps > 0.1]
+    significant = np.flatnonzero((gaps > 0.1) & (gaps >= PAUSE_THRESHOLD_SECONDS))
+
+    significant_pauses = [
+        {
+            "duration": float(gaps[i]),
+            "after_word": word_timestamps.word(i),
+            "before_word": word_timestamps.word(i + 1),
+            "position": round(float(word_timestamps.ends[i]), 3),
+        }
+        for i in significant.tolist()
+    ]
+
+    longest = round(float(all_durations.max()), 2) if all_durations.size else 0
+    avg_duration = round(float(all_durations.mean()), 2) if all_durations.size else 0
 
     return {
         "longest_pause_seconds": longest,
@@ -164,8 +201,13 @@ def compute_pause_metrics(word_timestamps: Optional[list] = None) -> dict:
     }
 
 
-def compute_vocabulary_metrics(transcript: str) -> dict:
-    words = _tokenize(transcript)
+def compute_vocabulary_metrics(
+    transcript: str,
+    words: list[str] | None = None,
+    sentences: list[str] | None = None,
+    language: str | None = None,
+) -> dict:
+    words = _tokenize(transcript, language) if words is None else words
     word_count = len(words)
 
     if word_count == 0:
@@ -182,7 +224,7 @@ def compute_vocabulary_metrics(transcript: str) -> dict:
 
     avg_length = round(sum(len(w) for w in words) / word_count, 1)
 
-    sentences = _split_sentences(transcript)
+    sentences = _split_sentences(transcript) if sentences is None else sentences
     sentence_count = len(sentences)
 
     return {
@@ -196,21 +238,16 @@ def compute_vocabulary_metrics(transcript: str) -> dict:
 def compute_pacing_metrics(
     duration_seconds: float,
     word_count: int,
-    word_timestamps: list | None = None,
+    word_timestamps: WordTimeline | None = None,
 ) -> dict:
-    if not word_timestamps or len(word_timestamps) < 2 or duration_seconds <= 0:
+    if word_timestamps is None or len(word_timestamps) < 2 or duration_seconds <= 0:
         return {
             "articulation_rate": 0,
             "speaking_time_ratio": 0,
         }
 
-    total_pause_time = 0.0
-    for i in range(1, len(word_timestamps)):
-        prev_end = word_timestamps[i - 1].get("end", 0)
-        curr_start = word_timestamps[i].get("start", 0)
-        gap = curr_start - prev_end
-        if gap > 0.25:
-            total_pause_time += gap
+    gaps = word_timestamps.gaps()
+    total_pause_time = float(gaps[gaps > 0.25].sum())
 
     speaking_time = max(0.01, duration_seconds - total_pause_time)
     speaking_ratio = round((speaking_time / duration_seconds) * 100, 1)
@@ -222,19 +259,517 @@ def compute_pacing_metrics(
     }
 
 
-def compute_all_metrics(transcript: str, duration_seconds: float, word_timestamps: list | None = None) -> dict:
-    core = compute_core_metrics(transcript, duration_seconds)
-    fillers = compute_filler_metrics(transcript, word_timestamps)
-    repetitions = compute_repetition_metrics(transcript)
-    pauses = compute_pause_metrics(word_timestamps)
-    vocabulary = compute_vocabulary_metrics(transcript)
-    pacing = compute_pacing_metrics(duration_seconds, core["word_count"], word_timestamps)
+def compute_acoustic_metrics(word_timestamps: WordTimeline | None = None) -> dict:
+    empty = {
+        "avg_word_confidence": 0,
+        "low_confidence_word_count": 0,
+        "pitch_variability_semitones": 0,
+        "monotony_score": 0,
+        "volume_variability_db": 0,
+        "volume_consistency": 0,
+        "avg_syllable_rate": 0,
+    }
+    if word_timestamps is None or not len(word_timestamps):
+        return empty
+
+    # Words from chunks that were never annotated carry NaN features; score the rest.
+    features = word_timestamps.features
+    probability = features.get("probability", np.ones(len(word_timestamps)))
+    probability = probability[np.isfinite(probability)]
+    result = dict(empty)
+    if probability.size:
+        result["avg_word_confidence"] = round(float(np.mean(probability)), 2)
+        result["low_confidence_word_count"] = int(np.sum(probability < LOW_CONFIDENCE_WORD_PROBABILITY))
+
+    measured = np.isfinite(features["rms_db"]) if "rms_db" in features else np.zeros(0, dtype=bool)
+    if not measured.any():
+        return result
+    rms_db = features["rms_db"][measured]
+    f0 = features["f0_hz"][measured]
+    syllable_rate = features["syllable_rate"][measured]
+
+    voiced = f0[f0 > 0]
+    if voiced.size >= 2:
+        semitones = 12 * np.log2(voiced / np.median(voiced))
+        pitch_std = float(np.std(semitones))
+    else:
+        pitch_std = 0.0
+
+    volume_std = float(np.std(rms_db))
 
     return {
-        **core,
-        **fillers,
-        **repetitions,
-        **pauses,
-        **vocabulary,
-        **pacing,
+        **result,
+        "pitch_variability_semitones": round(pitch_std, 2),
+        "monotony_score": round(100 * max(0.0, 1 - pitch_std / MONOTONY_FULL_RANGE_SEMITONES), 1) if voiced.size >= 2 else 0,
+        "volume_variability_db": round(volume_std, 2),
+        "volume_consistency": round(100 * max(0.0, 1 - volume_std / VOLUME_FULL_RANGE_DB), 1),
+        "avg_syllable_rate": round(float(np.mean(syllable_rate)), 2),
     }
+
+
+def compute_relevance_metrics(transcript: str, topic: dict | None = None) -> dict:
+    return get_relevance_index().score(transcript, topic)
+
+
+def compute_timeseries_metrics(
+    duration_seconds: float,
+    word_timestamps: WordTimeline | None = None,
+    window_seconds: float = TIMESERIES_WINDOW_SECONDS,
+    hop_seconds: float = TIMESERIES_HOP_SECONDS,
+    max_points: int = TIMESERIES_MAX_POINTS,
+    language: str | None = None,
+) -> dict:
+    empty = {"timeseries": None}
+    if word_timestamps is None or len(word_timestamps) < 2 or duration_seconds <= 0:
+        return empty
+
+    window_seconds = min(window_seconds, duration_seconds)
+    span = duration_seconds - window_seconds
+    hop_seconds = max(hop_seconds, span / max(1, max_points - 1), 1e-3)
+    window_starts = np.arange(0.0, span + 1e-9, hop_seconds)
+    window_ends = window_starts + window_seconds
+
+    starts = word_timestamps.starts
+    first = np.searchsorted(starts, window_starts, side="left")
+    last = np.searchsorted(starts, window_ends, side="left")
+    word_counts = last - first
+
+    lexicon = filler_lexicon(language)
+    vocabulary = ["".join(_tokenize(w, language)) for w in word_timestamps.vocabulary]
+    ids = word_timestamps.word_ids
+    fillers = np.array([w in lexicon["single"] for w in vocabulary], dtype=bool)[ids]
+    for phrase in lexicon["multi"]:
+        parts = phrase.lower().split()
+        if len(parts) == 2:
+            head = np.array([w == parts[0] for w in vocabulary])[ids]
+            tail = np.array([w == parts[1] for w in vocabulary])[ids]
+            fillers[:-1] |= head[:-1] & tail[1:]
+    filler_prefix = np.concatenate([[0], np.cumsum(fillers)])
+    filler_counts = filler_prefix[last] - filler_prefix[first]
+
+    gaps = word_timestamps.gaps()
+    gap_positions = word_timestamps.ends[:-1]
+    silent = gaps > 0.25
+    pause_positions = gap_positions[silent]
+    pause_prefix = np.concatenate([[0.0], np.cumsum(gaps[silent])])
+    long_prefix = np.concatenate([[0], np.cumsum(gaps[silent] >= PAUSE_THRESHOLD_SECONDS)])
+    pause_first = np.searchsorted(pause_positions, window_starts, side="left")
+    pause_last = np.searchsorted(pause_positions, window_ends, side="left")
+    pause_time = np.minimum(pause_prefix[pause_last] - pause_prefix[pause_first], window_seconds)
+    long_pauses = long_prefix[pause_last] - long_prefix[pause_first]
+
+    minutes = window_seconds / 60
+    speaking_minutes = np.maximum(window_seconds - pause_time, 0.01) / 60
+    filler_density = filler_counts / np.maximum(word_counts, 1) * 100
+
+    return {
+        "timeseries": {
+            "window_seconds": round(window_seconds, 2),
+            "hop_seconds": round(hop_seconds, 2),
+            "time": np.round(window_starts + window_seconds / 2, 2).tolist(),
+            "words_per_minute": np.round(word_counts / minutes, 1).tolist(),
+            "articulation_rate": np.round(word_counts / speaking_minutes, 1).tolist(),
+            "filler_density": np.round(filler_density, 1).tolist(),
+            "pause_rate": np.round(long_pauses / minutes, 2).tolist(),
+        }
+    }
+
+
+def compute_speaker_metrics(word_timestamps: WordTimeline | None = None, language: str | None = None) -> dict:
+    if word_timestamps is None or "speaker" not in word_timestamps.features or not len(word_timestamps):
+        return {"speaker_count": None, "speaker_metrics": {}}
+
+    speakers = word_timestamps.features["speaker"].astype(np.int64)
+    gaps = word_timestamps.gaps()
+    same_speaker = speakers[1:] == speakers[:-1]
+    turn_breaks = np.flatnonzero(~same_speaker) + 1
+    turn_starts = np.concatenate([[0], turn_breaks])
+    turn_ends = np.concatenate([turn_breaks, [len(speakers)]]) - 1
+    turn_durations = word_timestamps.ends[turn_ends] - word_timestamps.starts[turn_starts]
+    turn_speakers = speakers[turn_starts]
+    total_time = float(turn_durations.sum())
+
+    per_speaker = {}
+    for speaker in np.unique(speakers).tolist():
+        mask = speakers == speaker
+        own = word_timestamps.select(mask)
+        transcript = " ".join(own.words)
+        speaking_time = float(turn_durations[turn_speakers == speaker].sum())
+
+        pauses = gaps[same_speaker & (speakers[:-1] == speaker)]
+        pauses = pauses[pauses > 0.1]
+        core = compute_core_metrics(transcript, speaking_time, language=language)
+        fillers = compute_filler_metrics(transcript, language=language)
+
+        per_speaker[f"speaker_{speaker + 1}"] = {
+            "word_count": core["word_count"],
+            "words_per_minute": core["words_per_minute"],
+            "speaking_time_seconds": round(speaking_time, 2),
+            "talk_share": round(speaking_time / total_time, 3) if total_time > 0 else 0,
+            "turn_count": int(np.count_nonzero(turn_speakers == speaker)),
+            "filler_count": fillers["filler_count"],
+            "filler_density": fillers["filler_density"],
+            "avg_pause_duration": round(float(pauses.mean()), 2) if pauses.size else 0,
+            "pause_count_over_1s": int(np.count_nonzero(pauses >= PAUSE_THRESHOLD_SECONDS)),
+        }
+
+    return {"speaker_count": len(per_speaker), "speaker_metrics": per_speaker}
+
+
+class MetricContext:
+    def __init__(
+        self,
+        transcript: str,
+        duration_seconds: float,
+        word_timestamps: WordTimeline | None = None,
+        topic: dict | None = None,
+        pcm: np.ndarray | None = None,
+        options: dict | None = None,
+        intermediates: dict | None = None,
+        language: str | None = None,
+    ):
+        self.transcript = transcript
+        self.language = language
+        self.duration = duration_seconds
+        self.timeline = word_timestamps
+        self.topic = topic
+        self.pcm = pcm
+        self.options = options or {}
+        self._lock = threading.RLock()
+        self._cache: dict = {} if intermediates is None else intermediates
+
+    def _cached(self, key: str, build):
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = build()
+            return self._cache[key]
+
+    @property
+    def tokens(self) -> list[str]:
+        return self._cached("tokens", lambda: _tokenize(self.transcript, self.language))
+
+    @property
+    def sentences(self) -> list[str]:
+        return self._cached("sentences", lambda: _split_sentences(self.transcript))
+
+    @property
+    def sentence_tokens(self) -> list[list[str]]:
+        return self._cached("sentence_tokens", lambda: [_tokenize(s, self.language) for s in self.sentences])
+
+    @property
+    def phrase_counts(self) -> Counter:
+        return self._cached(
+            f"phrase_counts:{MIN_PHRASE_LENGTH}-{MAX_PHRASE_LENGTH}",
+            lambda: _count_phrases(self.tokens),
+        )
+
+
+# Context attributes and the declared input each one needs; language and options are always readable.
+_INPUT_OF = {
+    "transcript": "transcript",
+    "duration": "duration",
+    "tokens": "tokens",
+    "phrase_counts": "tokens",
+    "sentences": "sentences",
+    "sentence_tokens": "sentences",
+    "timeline": "timestamps",
+    "topic": "topic",
+    "pcm": "pcm",
+}
+METRIC_INPUTS = frozenset(_INPUT_OF.values())
+
+
+class _GroupView:
+    """What a group sees of the context: reading an input it did not declare is an error."""
+
+    __slots__ = ("_ctx", "_group")
+
+    def __init__(self, ctx: MetricContext, group: "MetricGroup"):
+        self._ctx = ctx
+        self._group = group
+
+    def __getattr__(self, name: str):
+        needed = _INPUT_OF.get(name)
+        if needed is not None and needed not in self._group.inputs:
+            raise AttributeError(f"Metric group '{self._group.name}' reads '{name}' without declaring input '{needed}'.")
+        return getattr(self._ctx, name)
+
+
+_intermediates: OrderedDict[str, dict] = OrderedDict()
+_intermediates_lock = threading.Lock()
+
+
+def _shared_intermediates(transcript: str, language: str | None = None) -> dict:
+    """Token / sentence / n-gram intermediates shared by every report on the same transcript."""
+    key = hashlib.sha1(f"{language or ''}\0{transcript}".encode()).hexdigest()
+    with _intermediates_lock:
+        entry = _intermediates.get(key)
+        if entry is None:
+            entry = _intermediates[key] = {}
+            while len(_intermediates) > METRIC_INTERMEDIATE_CACHE_SIZE:
+                _intermediates.popitem(last=False)
+        else:
+            _intermediates.move_to_end(key)
+        return entry
+
+
+class MetricGroup:
+    def __init__(
+        self,
+        name: str,
+        func,
+        inputs: tuple,
+        depends: tuple = (),
+        heavy: bool = False,
+        config: tuple = (),
+        version: int = 1,
+    ):
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+        self.depends = depends
+        self.heavy = heavy
+        self.config = config
+        self.version = version
+
+
+METRIC_GROUPS: dict[str, MetricGroup] = {}
+
+
+def register_metric_group(
+    name: str,
+    inputs: tuple,
+    depends: tuple = (),
+    heavy: bool = False,
+    config: tuple = (),
+    version: int = 1,
+):
+    """`config` names the backend.config settings the group reads; `version` is bumped on logic changes."""
+    def register(func):
+        if name in METRIC_GROUPS:
+            raise ValueError(f"Metric group '{name}' is already registered.")
+        unknown = [d for d in depends if d not in METRIC_GROUPS]
+        if unknown:
+            raise ValueError(f"Metric group '{name}' depends on unregistered groups: {unknown}")
+        unknown = [i for i in inputs if i not in METRIC_INPUTS]
+        if unknown:
+            raise ValueError(f"Metric group '{name}' declares unknown inputs: {unknown}. Available: {sorted(METRIC_INPUTS)}")
+        METRIC_GROUPS[name] = MetricGroup(name, func, tuple(inputs), tuple(depends), heavy, tuple(config), version)
+        return func
+    return register
+
+
+@register_metric_group("core", inputs=("transcript", "duration", "tokens", "sentences"))
+def _core_group(ctx: MetricContext, results: dict) -> dict:
+    return compute_core_metrics(ctx.transcript, ctx.duration, ctx.tokens, ctx.sentence_tokens, ctx.language)
+
+
+@register_metric_group(
+    "fillers",
+    inputs=("transcript", "tokens", "sentences", "timestamps"),
+    config=("SINGLE_FILLERS", "MULTI_FILLERS", "SENTENCE_START_FILLERS", "FILLER_LEXICONS"),
+)
+def _filler_group(ctx: MetricContext, results: dict) -> dict:
+    return compute_filler_metrics(ctx.transcript, ctx.timeline, ctx.tokens, ctx.sentence_tokens, ctx.language)
+
+
+@register_metric_group("repetitions", inputs=("transcript", "tokens"), config=("MIN_PHRASE_LENGTH", "MAX_PHRASE_LENGTH"))
+def _repetition_group(ctx: MetricContext, results: dict) -> dict:
+    return compute_repetition_metrics(ctx.transcript, ctx.tokens, ctx.phrase_counts, ctx.language)
+
+
+@register_metric_group("pauses", inputs=("timestamps",), config=("PAUSE_THRESHOLD_SECONDS",))
+def _pause_group(ctx: MetricContext, results: dict) -> dict:
+    return compute_pause_metrics(ctx.timeline)
+
+
+@register_metric_group("vocabulary", inputs=("transcript", "tokens", "sentences"))
+def _vocabulary_group(ctx: MetricContext, results: dict) -> dict:
+    return compute_vocabulary_metrics(ctx.transcript, ctx.tokens, ctx.sentences, ctx.language)
+
+
+@register_metric_group("pacing", inputs=("duration", "timestamps"), depends=("core",))
+def _pacing_group(ctx: MetricContext, results: dict) -> dict:
+    return compute_pacing_metrics(ctx.duration, results["core"]["word_count"], ctx.timeline)
+
+
+@register_metric_group(
+    "acoustics",
+    inputs=("timestamps", "pcm"),
+    heavy=True,
+    config=(
+        "LOW_CONFIDENCE_WORD_PROBABILITY",
+        "MONOTONY_FULL_RANGE_SEMITONES",
+        "VOLUME_FULL_RANGE_DB",
+        "ACOUSTIC_FRAME_SECONDS",
+        "ACOUSTIC_HOP_SECONDS",
+        "ACOUSTIC_BLOCK_SECONDS",
+        "PITCH_MIN_HZ",
+        "PITCH_MAX_HZ",
+        "VOICING_THRESHOLD",
+    ),
+)
+def _acoustic_group(ctx: MetricContext, results: dict) -> dict:
+    """Per-word pitch/energy from the audio when there is any; rescoring reuses the stored feature columns."""
+    if ctx.pcm is not None and ctx.timeline is not None:
+        annotate_timeline(ctx.pcm, SAMPLE_RATE, ctx.timeline)
+    return compute_acoustic_metrics(ctx.timeline)
+
+
+@register_metric_group(
+    "relevance",
+    inputs=("transcript", "topic"),
+    heavy=True,
+    config=("RELEVANCE_DIMENSIONS", "RELEVANCE_NEIGHBOURS"),
+)
+def _relevance_group(ctx: MetricContext, results: dict) -> dict:
+    return compute_relevance_metrics(ctx.transcript, ctx.topic)
+
+
+@register_metric_group(
+    "timeseries",
+    inputs=("duration", "timestamps"),
+    config=(
+        "TIMESERIES_WINDOW_SECONDS",
+        "TIMESERIES_HOP_SECONDS",
+        "TIMESERIES_MAX_POINTS",
+        "SINGLE_FILLERS",
+        "MULTI_FILLERS",
+        "FILLER_LEXICONS",
+        "PAUSE_THRESHOLD_SECONDS",
+    ),
+)
+def _timeseries_group(ctx: MetricContext, results: dict) -> dict:
+    return compute_timeseries_metrics(
+        ctx.duration,
+        ctx.timeline,
+        ctx.options.get("window_seconds") or TIMESERIES_WINDOW_SECONDS,
+        ctx.options.get("hop_seconds") or TIMESERIES_HOP_SECONDS,
+        language=ctx.language,
+    )
+
+
+@register_metric_group(
+    "speakers",
+    inputs=("timestamps",),
+    config=("SINGLE_FILLERS", "MULTI_FILLERS", "SENTENCE_START_FILLERS", "FILLER_LEXICONS", "PAUSE_THRESHOLD_SECONDS"),
+)
+def _speaker_group(ctx: MetricContext, results: dict) -> dict:
+    return compute_speaker_metrics(ctx.timeline, ctx.language)
+
+
+def metric_versions() -> dict[str, str]:
+    """Per-group hash of version, config values and dependency hashes; a change marks stored results stale."""
+    versions: dict[str, str] = {}
+    for name, group in METRIC_GROUPS.items():
+        payload = orjson.dumps({
+            "group": name,
+            "version": group.version,
+            "config": {key: getattr(settings, key) for key in group.config},
+            "depends": [versions[d] for d in group.depends],
+        }, option=orjson.OPT_SORT_KEYS)
+        versions[name] = hashlib.sha1(payload).hexdigest()[:12]
+    return versions
+
+
+def stale_metric_groups(stored: dict | None, current: dict[str, str] | None = None) -> list[str]:
+    current = current or metric_versions()
+    stored = stored or {}
+    return [name for name, version in current.items() if stored.get(name) != version]
+
+
+_metric_pool: ThreadPoolExecutor | None = None
+
+
+def _get_metric_pool() -> ThreadPoolExecutor:
+    global _metric_pool
+    if _metric_pool is None:
+        _metric_pool = ThreadPoolExecutor(max_workers=METRIC_WORKERS, thread_name_prefix="metrics")
+    return _metric_pool
+
+
+def _resolve_groups(groups: list[str] | None) -> list[str]:
+    if groups is None:
+        return list(METRIC_GROUPS)
+
+    unknown = [g for g in groups if g not in METRIC_GROUPS]
+    if unknown:
+        raise ValueError(f"Unknown metric groups: {unknown}. Available: {list(METRIC_GROUPS)}")
+
+    selected = set()
+    stack = list(groups)
+    while stack:
+        name = stack.pop()
+        if name not in selected:
+            selected.add(name)
+            stack.extend(METRIC_GROUPS[name].depends)
+    return [name for name in METRIC_GROUPS if name in selected]
+
+
+def _run_group(group: MetricGroup, ctx: MetricContext, results: dict) -> tuple[dict, float]:
+    started = time.perf_counter()
+    output = group.func(_GroupView(ctx, group), results)
+    return output, round((time.perf_counter() - started) * 1000, 2)
+
+
+def compute_metrics_report(
+    transcript: str,
+    duration_seconds: float,
+    word_timestamps=None,
+    topic: dict | None = None,
+    groups: list[str] | None = None,
+    pcm: np.ndarray | None = None,
+    options: dict | None = None,
+    share_intermediates: bool = False,
+    language: str | None = None,
+) -> tuple[dict, dict]:
+    word_timestamps = WordTimeline.coerce(word_timestamps) if word_timestamps is not None else None
+    intermediates = _shared_intermediates(transcript, language) if share_intermediates else None
+    ctx = MetricContext(transcript, duration_seconds, word_timestamps, topic, pcm, options, intermediates, language)
+
+    order = _resolve_groups(groups)
+    pending = list(order)
+    results: dict[str, dict] = {}
+    timings: dict[str, float] = {}
+    running: dict = {}
+
+    while pending or running:
+        ready = [n for n in pending if all(d in results for d in METRIC_GROUPS[n].depends)]
+        for name in ready:
+            pending.remove(name)
+            group = METRIC_GROUPS[name]
+            if group.heavy:
+                running[_get_metric_pool().submit(_run_group, group, ctx, results)] = name
+            else:
+                results[name], timings[name] = _run_group(group, ctx, results)
+
+        if running:
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name], timings[name] = future.result()
+        elif pending and not ready:
+            raise ValueError(f"Unresolvable metric group dependencies: {pending}")
+
+    merged: dict = {}
+    owners: dict[str, str] = {}
+    for name in order:
+        for key, value in results[name].items():
+            if key in owners:
+                raise ValueError(f"Metric key '{key}' produced by both '{owners[key]}' and '{name}'.")
+            owners[key] = name
+            merged[key] = value
+
+    return merged, timings
+
+
+def compute_all_metrics(
+    transcript: str,
+    duration_seconds: float,
+    word_timestamps=None,
+    topic: dict | None = None,
+    groups: list[str] | None = None,
+    language: str | None = None,
+) -> dict:
+    metrics, _ = compute_metrics_report(transcript, duration_seconds, word_timestamps, topic, groups, language=language)
+    return metrics
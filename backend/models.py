@@ -0,0 +1,179 @@
+import os
+import platform
+import threading
+import time
+import numpy as np
+import orjson
+from dotenv import load_dotenv
+from backend.config import (
+    MODEL_VARIANTS,
+    DEFAULT_VARIANT,
+    REFERENCE_VARIANT,
+    MODEL_CALIBRATION_SECONDS,
+    MODEL_ACCURACY_TOLERANCE,
+    MODEL_SELECTION_FILE,
+    WHISPER_DEVICE,
+)
+
+load_dotenv()
+
+SAMPLE_RATE = 16000
+
+
+def host_key() -> str:
+    return "-".join([
+        platform.system(),
+        platform.machine(),
+        str(os.cpu_count()),
+        platform.processor() or "unknown",
+    ])
+
+
+def _word_error_rate(reference: list[str], hypothesis: list[str]) -> float:
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, start=1):
+        current = [i] + [0] * len(hypothesis)
+        for j, hyp_word in enumerate(hypothesis, start=1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            )
+        previous = current
+    return previous[-1] / len(reference)
+
+
+def _calibration_audio() -> tuple[np.ndarray, bool]:
+    path = os.getenv("CALIBRATION_AUDIO")
+    if path and os.path.exists(path):
+        from faster_whisper import decode_audio
+
+        audio = decode_audio(path, sampling_rate=SAMPLE_RATE)
+        return audio[:int(MODEL_CALIBRATION_SECONDS * SAMPLE_RATE)], True
+
+    t = np.arange(int(MODEL_CALIBRATION_SECONDS * SAMPLE_RATE)) / SAMPLE_RATE
+    tone = 0.1 * np.sin(2 * np.pi * 180 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    return tone.astype(np.float32), False
+
+
+class ModelManager:
+    def __init__(self, selection_file: str = MODEL_SELECTION_FILE):
+        self.selection_file = selection_file
+        self.host = host_key()
+        self._lock = threading.Lock()
+        self._selection = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.selection_file, "rb") as f:
+                return orjson.loads(f.read()).get(self.host, {})
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+
+    def _persist(self):
+        try:
+            with open(self.selection_file, "rb") as f:
+                stored = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            stored = {}
+        stored[self.host] = self._selection
+        with open(self.selection_file, "wb") as f:
+            f.write(orjson.dumps(stored, option=orjson.OPT_INDENT_2))
+
+    def variants(self, model_size: str) -> list[dict]:
+        available = []
+        for variant in MODEL_VARIANTS.get(model_size, []):
+            path = os.getenv(variant.get("path_env", model_size.upper()))
+            if path:
+                available.append({**variant, "path": path})
+        return available
+
+    def resolve(self, model_size: str) -> dict:
+        variants = {v["name"]: v for v in self.variants(model_size)}
+        selected = self._selection.get(model_size, {}).get("variant", DEFAULT_VARIANT)
+        if selected in variants:
+            return variants[selected]
+        if DEFAULT_VARIANT in variants:
+            return variants[DEFAULT_VARIANT]
+        raise ValueError(f"No model path configured for '{model_size}'. Set the {model_size.upper()} environment variable.")
+
+    def needs_calibration(self, model_size: str) -> bool:
+        return model_size not in self._selection and len(self.variants(model_size)) > 1
+
+    def calibrate(self, model_size: str) -> tuple[str, object] | None:
+        from faster_whisper import WhisperModel
+
+        with self._lock:
+            audio, has_speech = _calibration_audio()
+            audio_seconds = audio.size / SAMPLE_RATE
+            if not has_speech:
+                print(
+                    f"[ModelManager] CALIBRATION_AUDIO not set: choosing '{model_size}' by speed only, "
+                    f"word error rate is not checked and other checkpoints (e.g. distilled) are skipped"
+                )
+
+            # The reference goes first so each variant is scored as it finishes and only the best stays loaded.
+            order = {REFERENCE_VARIANT: 0, DEFAULT_VARIANT: 1}
+            variants = sorted(self.variants(model_size), key=lambda v: order.get(v["name"], 2))
+            results = {}
+            reference_words = None
+            best, best_model = None, None
+
+            for variant in variants:
+                if not has_speech and variant["path"] != variants[0]["path"]:
+                    continue
+                try:
+                    model = WhisperModel(variant["path"], device=WHISPER_DEVICE, compute_type=variant["compute_type"])
+                    list(model.transcribe(audio, beam_size=1)[0])
+
+                    started = time.perf_counter()
+                    segments, _ = model.transcribe(audio, beam_size=5, word_timestamps=True)
+                    words = [w.word.strip().lower() for s in segments for w in (s.words or ())]
+                    elapsed = time.perf_counter() - started
+                except Exception as e:
+                    print(f"[ModelManager] Variant '{model_size}/{variant['name']}' unavailable: {e}")
+                    continue
+
+                if reference_words is None:
+                    reference_words = words
+                word_error_rate = round(_word_error_rate(reference_words, words), 3) if has_speech else None
+                result = {"real_time_factor": round(elapsed / audio_seconds, 4), "word_error_rate": word_error_rate}
+                results[variant["name"]] = result
+
+                accurate = word_error_rate is None or word_error_rate <= MODEL_ACCURACY_TOLERANCE
+                if accurate and (best is None or result["real_time_factor"] < results[best]["real_time_factor"]):
+                    best, best_model = variant["name"], model
+                del model
+
+            if best is None:
+                return None
+
+            self._selection[model_size] = {
+                "variant": best,
+                "calibrated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "speech_reference": has_speech,
+                "results": results,
+            }
+            self._persist()
+            print(f"[ModelManager] Selected '{model_size}/{best}' for host {self.host}")
+
+            return best, best_model
+
+    def describe(self) -> dict:
+        return {
+            "host": self.host,
+            "sizes": {
+                size: {
+                    "available": [v["name"] for v in self.variants(size)],
+                    "selected": self._selection.get(size, {}).get("variant", DEFAULT_VARIANT),
+                    "calibration": self._selection.get(size),
+                }
+                for size in MODEL_VARIANTS
+            },
+        }
+
+
+model_manager = ModelManager()
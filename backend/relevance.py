@@ -0,0 +1,100 @@
+import re
+import threading
+import zlib
+import numpy as np
+from backend.config import RELEVANCE_DIMENSIONS, RELEVANCE_NEIGHBOURS
+from backend.topics import get_topic_index
+
+STOPWORDS = frozenset(
+    "a an the and or but if then so of to in on at for with by from as is are was were be been being "
+    "it its this that these those i you he she we they me my your our their what which who whom how "
+    "why when where do does did have has had can could would should will may might must not no yes "
+    "about into over than too very just also there here some any all each more most other such only "
+    "um uh like basically actually know".split()
+)
+
+
+def _features(text: str) -> np.ndarray:
+    tokens = [t for t in re.findall(r"[a-z']+", text.lower()) if t not in STOPWORDS and len(t) > 1]
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return np.fromiter(
+        (zlib.crc32(g.encode()) % RELEVANCE_DIMENSIONS for g in grams),
+        dtype=np.int64,
+        count=len(grams),
+    )
+
+
+def _counts(text: str) -> np.ndarray:
+    return np.bincount(_features(text), minlength=RELEVANCE_DIMENSIONS).astype(np.float32)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-9)
+
+
+class RelevanceIndex:
+    def __init__(self, topics: list[dict]):
+        self.topics = topics
+        self.row_of = {t["id"]: i for i, t in enumerate(topics)}
+
+        counts = np.vstack([_counts(t["topic"]) for t in topics]) if topics else np.zeros((0, RELEVANCE_DIMENSIONS), np.float32)
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(topics)) / (1 + document_frequency)) + 1).astype(np.float32)
+        self.matrix = _normalize(np.log1p(counts) * self.idf)
+
+    def vectorize(self, text: str) -> np.ndarray:
+        return _normalize(np.log1p(_counts(text)) * self.idf)
+
+    def score(self, transcript: str, topic: dict | None = None, neighbours: int = RELEVANCE_NEIGHBOURS) -> dict:
+        vector = self.vectorize(transcript)
+        similarities = self.matrix @ vector
+
+        k = min(neighbours, similarities.shape[0])
+        nearest = np.argpartition(-similarities, k - 1)[:k] if k else np.array([], dtype=np.int64)
+        nearest = nearest[np.argsort(-similarities[nearest])]
+
+        result = {
+            "topic_relevance": None,
+            "topic_relevance_rank": None,
+            "topic_relevance_percentile": None,
+            "nearest_topics": [
+                {
+                    "id": self.topics[i]["id"],
+                    "topic": self.topics[i]["topic"],
+                    "score": round(float(similarities[i]), 3),
+                }
+                for i in nearest.tolist()
+            ],
+        }
+
+        if not topic:
+            return result
+
+        row = self.row_of.get(topic.get("id"))
+        if row is not None:
+            own = float(similarities[row])
+        elif topic.get("topic"):
+            own = float(self.vectorize(topic["topic"]) @ vector)
+        else:
+            return result
+
+        others = similarities.shape[0] - (row is not None)
+        below = int(np.count_nonzero(similarities < own))
+        result["topic_relevance"] = round(own, 3)
+        result["topic_relevance_rank"] = int(np.count_nonzero(similarities > own)) + 1
+        result["topic_relevance_percentile"] = round(100 * below / max(1, others), 1)
+        return result
+
+
+_index: RelevanceIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_relevance_index() -> RelevanceIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = RelevanceIndex(get_topic_index().topics)
+    return _index
@@ -0,0 +1,58 @@
+import time
+from backend.metrics import METRIC_GROUPS, compute_metrics_report, metric_versions, stale_metric_groups
+
+
+def rescore_session(session: dict, versions: dict[str, str] | None = None, force: bool = False) -> list[str]:
+    """Recompute the stale metric groups of a stored session in place; returns the groups that ran."""
+    transcript = session.get("transcript")
+    if not transcript:
+        raise ValueError("Session has no stored transcript.")
+
+    versions = versions or metric_versions()
+    stored = session.get("metric_versions") or {}
+    stale = list(versions) if force else stale_metric_groups(stored, versions)
+    if not session.get("word_timestamps"):
+        stale = [g for g in stale if "timestamps" not in METRIC_GROUPS[g].inputs]
+    if not stale:
+        return []
+
+    metrics, timings = compute_metrics_report(
+        transcript,
+        session.get("duration_seconds") or 0,
+        session.get("word_timestamps"),
+        session.get("topic"),
+        stale,
+        share_intermediates=True,
+        language=session.get("language"),
+    )
+    session["metrics"] = {**(session.get("metrics") or {}), **metrics}
+    session["metric_versions"] = {**stored, **{g: versions[g] for g in timings}}
+    return list(timings)
+
+
+def rescore_sessions(sessions: list[dict], force: bool = False) -> dict:
+    started = time.perf_counter()
+    versions = metric_versions()
+    rescored = 0
+    skipped = 0
+    group_counts: dict[str, int] = {}
+
+    for session in sessions:
+        try:
+            groups = rescore_session(session, versions, force)
+        except ValueError:
+            skipped += 1
+            continue
+        if groups:
+            rescored += 1
+        for group in groups:
+            group_counts[group] = group_counts.get(group, 0) + 1
+
+    return {
+        "count": len(sessions),
+        "rescored": rescored,
+        "skipped": skipped,
+        "groups": group_counts,
+        "metric_versions": versions,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -0,0 +1,79 @@
+import gzip
+import numpy as np
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from backend.config import COMPRESSION_MIN_BYTES, GZIP_LEVEL, BROTLI_QUALITY
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def _msgpack_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialize {type(value).__name__} to MessagePack")
+
+
+class MsgPackResponse(Response):
+    media_type = "application/msgpack"
+
+    def render(self, content) -> bytes:
+        return msgpack.packb(content, use_bin_type=True, default=_msgpack_default)
+
+
+def _accepts(header: str, token: str) -> bool:
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() == token and "q=0" not in params.replace(" ", "").split(";"):
+            return True
+    return False
+
+
+def negotiated_response(request: Request, content, status_code: int = 200, headers: dict | None = None) -> Response:
+    accept = request.headers.get("accept", "")
+    if msgpack is not None and any(_accepts(accept, t) for t in MSGPACK_MEDIA_TYPES):
+        response = MsgPackResponse(content, status_code=status_code, headers=headers)
+    else:
+        response = ORJSONResponse(content, status_code=status_code, headers=headers)
+    response.headers["vary"] = "Accept, Accept-Encoding"
+
+    body = response.body
+    if len(body) < COMPRESSION_MIN_BYTES:
+        return response
+
+    accept_encoding = request.headers.get("accept-encoding", "")
+    if brotli is not None and _accepts(accept_encoding, "br"):
+        encoding, body = "br", brotli.compress(body, quality=BROTLI_QUALITY)
+    elif _accepts(accept_encoding, "gzip"):
+        encoding, body = "gzip", gzip.compress(body, compresslevel=GZIP_LEVEL)
+    else:
+        return response
+
+    response.body = body
+    response.headers["content-encoding"] = encoding
+    response.headers["content-length"] = str(len(body))
+    return response
@@ -0,0 +1,191 @@
+import orjson
+from backend.responses import ORJSON_OPTIONS
+from backend.config import SESSION_EXPORT_BATCH_SIZE, SESSION_IMPORT_MAX_ERRORS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+BASE_COLUMNS = ("id", "date", "topic", "topic_id", "category", "model_used", "language", "duration_seconds", "transcript")
+
+
+def iter_ndjson(sessions: list[dict], batch_size: int = SESSION_EXPORT_BATCH_SIZE):
+    for i in range(0, len(sessions), batch_size):
+        yield b"".join(
+            orjson.dumps(session, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+            for session in sessions[i:i + batch_size]
+        )
+
+
+def _is_scalar(value) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def session_row(session: dict) -> dict:
+    """One flat row per session: identifiers plus every scalar metric as its own column."""
+    topic = session.get("topic") or {}
+    row = {
+        "id": str(session.get("id", "")),
+        "date": session.get("date"),
+        "topic": topic.get("topic") if isinstance(topic, dict) else topic,
+        "topic_id": topic.get("id") if isinstance(topic, dict) else None,
+        "category": topic.get("category") if isinstance(topic, dict) else None,
+        "model_used": session.get("model_used"),
+        "language": session.get("language"),
+        "duration_seconds": session.get("duration_seconds"),
+        "transcript": session.get("transcript"),
+    }
+    for key, value in (session.get("metrics") or {}).items():
+        if key not in row and _is_scalar(value):
+            row[key] = value
+    return row
+
+
+def _schema(sessions: list[dict]):
+    """First pass: column types from every session, building one row at a time."""
+    fields = {name: pa.string() for name in BASE_COLUMNS}
+    fields["duration_seconds"] = pa.float64()
+    for session in sessions:
+        for key, value in session_row(session).items():
+            if key in fields or value is None:
+                continue
+            fields[key] = pa.string() if isinstance(value, str) else pa.float64()
+    return pa.schema(list(fields.items()))
+
+
+def _column(rows: list[dict], field) -> list:
+    values = [row.get(field.name) for row in rows]
+    if pa.types.is_floating(field.type):
+        return [float(v) if isinstance(v, (int, float)) else None for v in values]
+    return [None if v is None else str(v) for v in values]
+
+
+class _StreamSink:
+    """Write-only file object that hands buffered bytes to the response as they are produced."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _iter_columnar(sessions: list[dict], open_writer, batch_size: int):
+    schema = _schema(sessions)
+    sink = _StreamSink()
+    writer = open_writer(sink, schema)
+
+    for i in range(0, len(sessions), batch_size):
+        batch = [session_row(s) for s in sessions[i:i + batch_size]]
+        writer.write_batch(pa.record_batch([_column(batch, f) for f in schema], schema=schema))
+        data = sink.drain()
+        if data:
+            yield data
+    writer.close()
+    yield sink.drain()
+
+
+def iter_parquet(sessions: list[dict], batch_size: int = SESSION_EXPORT_BATCH_SIZE):
+    return _iter_columnar(sessions, lambda sink, schema: pq.ParquetWriter(sink, schema), batch_size)
+
+
+def iter_arrow(sessions: list[dict], batch_size: int = SESSION_EXPORT_BATCH_SIZE):
+    return _iter_columnar(sessions, pa.ipc.new_stream, batch_size)
+
+
+def validate_session(session) -> dict:
+    if not isinstance(session, dict):
+        raise ValueError("expected a JSON object")
+    if not isinstance(session.get("id"), (int, str)) or isinstance(session.get("id"), bool):
+        raise ValueError("'id' must be a number or string")
+    checks = {
+        "date": str,
+        "transcript": str,
+        "metrics": dict,
+        "metric_versions": dict,
+        "word_timestamps": (list, dict),
+        "topic": (dict, type(None)),
+    }
+    for key, expected in checks.items():
+        if key in session and not isinstance(session[key], expected):
+            raise ValueError(f"'{key}' has the wrong type")
+    duration = session.get("duration_seconds", 0)
+    if not isinstance(duration, (int, float)) or isinstance(duration, bool) or duration < 0:
+        raise ValueError("'duration_seconds' must be a non-negative number")
+    return session
+
+
+class SessionImport:
+    """Incremental NDJSON parser: feed raw body chunks, collect validated sessions batch by batch.
+
+    Parsing is streamed, but the validated sessions are kept until the merge because the
+    store writes each user's history as one document.
+    """
+
+    def __init__(self, batch_size: int = SESSION_EXPORT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.sessions: dict[str, dict] = {}
+        self.rejected = 0
+        self.errors: list[str] = []
+        self._line = 0
+        self._buffer = b""
+        self._pending: list[bytes] = []
+
+    def feed(self, chunk: bytes):
+        lines = (self._buffer + chunk).split(b"\n")
+        self._buffer = lines.pop()
+        self._pending.extend(lines)
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def finish(self) -> list[dict]:
+        if self._buffer.strip():
+            self._pending.append(self._buffer)
+        self._buffer = b""
+        self._flush()
+        return list(self.sessions.values())
+
+    def _flush(self):
+        for raw in self._pending:
+            self._line += 1
+            if not raw.strip():
+                continue
+            try:
+                session = validate_session(orjson.loads(raw))
+            except (orjson.JSONDecodeError, ValueError) as e:
+                self.rejected += 1
+                if len(self.errors) < SESSION_IMPORT_MAX_ERRORS:
+                    self.errors.append(f"line {self._line}: {e}")
+                continue
+            self.sessions[str(session["id"])] = session
+        self._pending.clear()
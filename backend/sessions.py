@@ -0,0 +1,72 @@
+import os
+import re
+import threading
+import orjson
+from backend.responses import dumps
+from backend.config import SESSION_FILE, SESSIONS_DIR, MULTI_TENANT
+
+USER_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+class InvalidUserError(Exception):
+    pass
+
+
+class SessionStore:
+    """Session history per user namespace; the desktop app keeps the single legacy file."""
+
+    def __init__(self, legacy_file: str = SESSION_FILE, root: str = SESSIONS_DIR, multi_tenant: bool = MULTI_TENANT):
+        self.legacy_file = legacy_file
+        self.root = root
+        self.multi_tenant = multi_tenant
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def path_for(self, user: str | None) -> str:
+        if not self.multi_tenant:
+            return self.legacy_file
+        if not user or not USER_ID_PATTERN.fullmatch(user):
+            raise InvalidUserError("A valid session cookie is required.")
+        return os.path.join(self.root, f"{user}.json")
+
+    def _lock_for(self, path: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def load(self, user: str | None) -> list:
+        try:
+            with open(self.path_for(user), "rb") as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            return []
+
+    def _write_unlocked(self, path: str, payload: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def write(self, user: str | None, payload: bytes):
+        path = self.path_for(user)
+        with self._lock_for(path):
+            self._write_unlocked(path, payload)
+
+    def update(self, user: str | None, mutate):
+        """Read-modify-write under the path lock; `mutate(sessions)` returns (result, changed)."""
+        path = self.path_for(user)
+        with self._lock_for(path):
+            sessions = self.load(user)
+            result, changed = mutate(sessions)
+            if changed:
+                self._write_unlocked(path, dumps(sessions))
+            return result
+
+    def clear(self, user: str | None):
+        path = self.path_for(user)
+        with self._lock_for(path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+session_store = SessionStore()
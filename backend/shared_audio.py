@@ -0,0 +1,83 @@
+import threading
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+import numpy as np
+
+
+class SharedPcm:
+    """float32 PCM held in shared memory; views into it cross process boundaries as (name, offset, length)."""
+
+    _live: dict[str, "SharedPcm"] = {}
+    _live_lock = threading.Lock()
+
+    def __init__(self, pcm: np.ndarray):
+        self.shm = shared_memory.SharedMemory(create=True, size=max(pcm.nbytes, 4))
+        self.array = np.ndarray(pcm.shape, dtype=np.float32, buffer=self.shm.buf)
+        self.array[:] = pcm
+        with self._live_lock:
+            self._live[self.shm.name] = self
+
+    def ref(self, view: np.ndarray) -> dict | None:
+        base = self.array.__array_interface__["data"][0]
+        address = view.__array_interface__["data"][0]
+        offset, remainder = divmod(address - base, self.array.itemsize)
+        if view.dtype != np.float32 or view.ndim != 1 or not view.flags.c_contiguous or remainder:
+            return None
+        if offset < 0 or offset + view.size > self.array.size:
+            return None
+        return {"shm": self.shm.name, "offset": offset, "length": view.size}
+
+    def close(self):
+        with self._live_lock:
+            self._live.pop(self.shm.name, None)
+        self.array = None
+        self.shm.unlink()
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # chunk views still alive; the mapping goes away with the last of them
+
+    def __enter__(self) -> "SharedPcm":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def shared_ref(view) -> dict | None:
+    """Reference to `view` if it lives inside a live SharedPcm of this process."""
+    if not isinstance(view, np.ndarray):
+        return None
+    with SharedPcm._live_lock:
+        buffers = list(SharedPcm._live.values())
+    for buffer in buffers:
+        ref = buffer.ref(view)
+        if ref is not None:
+            return ref
+    return None
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        from multiprocessing import resource_tracker
+
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+@contextmanager
+def attached_pcm(ref: dict):
+    """Zero-copy view of a SharedPcm slice owned by another process."""
+    shm = _attach(ref["shm"])
+    view = np.ndarray((ref["length"],), dtype=np.float32, buffer=shm.buf, offset=ref["offset"] * 4)
+    try:
+        yield view
+    finally:
+        del view
+        try:
+            shm.close()
+        except BufferError:
+            print(f"[SharedPcm] Segment {ref['shm']} still referenced; it is released when the last view goes away.")
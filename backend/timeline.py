@@ -0,0 +1,126 @@
+import numpy as np
+
+
+class WordTimeline:
+    __slots__ = ("vocabulary", "word_ids", "starts", "ends", "features")
+
+    def __init__(self, vocabulary: list[str], word_ids, starts, ends, features: dict | None = None):
+        self.vocabulary = vocabulary
+        self.word_ids = np.asarray(word_ids, dtype=np.int32)
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        self.features = {
+            name: np.asarray(values, dtype=np.float64)
+            for name, values in (features or {}).items()
+        }
+
+    def __len__(self) -> int:
+        return self.starts.shape[0]
+
+    @classmethod
+    def empty(cls) -> "WordTimeline":
+        return cls([], [], [], [])
+
+    @classmethod
+    def from_words(cls, words: list[str], starts, ends, features: dict | None = None) -> "WordTimeline":
+        index: dict[str, int] = {}
+        word_ids = [index.setdefault(w, len(index)) for w in words]
+        return cls(list(index), word_ids, starts, ends, features)
+
+    @classmethod
+    def from_records(cls, records: list[dict]) -> "WordTimeline":
+        if not records:
+            return cls.empty()
+        feature_names = [k for k in records[0] if k not in ("word", "start", "end")]
+        return cls.from_words(
+            [r.get("word", "") for r in records],
+            [r.get("start", 0) for r in records],
+            [r.get("end", 0) for r in records],
+            {name: [r.get(name, 0) for r in records] for name in feature_names},
+        )
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> "WordTimeline":
+        reserved = ("vocabulary", "ids", "start", "end")
+        return cls(
+            list(columns.get("vocabulary", [])),
+            columns.get("ids", []),
+            columns.get("start", []),
+            columns.get("end", []),
+            {k: v for k, v in columns.items() if k not in reserved},
+        )
+
+    @classmethod
+    def coerce(cls, value) -> "WordTimeline":
+        if value is None:
+            return cls.empty()
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, dict):
+            return cls.from_columns(value)
+        return cls.from_records(value)
+
+    @classmethod
+    def concat(cls, timelines: list["WordTimeline"], offsets: list[float] | None = None) -> "WordTimeline":
+        if offsets is None:
+            offsets = [0.0] * len(timelines)
+        if not timelines:
+            return cls.empty()
+
+        index: dict[str, int] = {}
+        word_ids = []
+        for timeline in timelines:
+            remap = np.array([index.setdefault(w, len(index)) for w in timeline.vocabulary], dtype=np.int32)
+            word_ids.append(remap[timeline.word_ids] if len(timeline) else timeline.word_ids)
+
+        # Union of feature columns: a chunk without a column (e.g. an empty, never-annotated one) gets NaNs.
+        feature_names = dict.fromkeys(name for t in timelines for name in t.features)
+        return cls(
+            list(index),
+            np.concatenate(word_ids),
+            np.concatenate([t.starts + o for t, o in zip(timelines, offsets)]),
+            np.concatenate([t.ends + o for t, o in zip(timelines, offsets)]),
+            {
+                name: np.concatenate([t.features.get(name, np.full(len(t), np.nan)) for t in timelines])
+                for name in feature_names
+            },
+        )
+
+    def select(self, selector) -> "WordTimeline":
+        return WordTimeline(
+            self.vocabulary,
+            self.word_ids[selector],
+            self.starts[selector],
+            self.ends[selector],
+            {name: values[selector] for name, values in self.features.items()},
+        )
+
+    @property
+    def words(self) -> list[str]:
+        vocabulary = self.vocabulary
+        return [vocabulary[i] for i in self.word_ids.tolist()]
+
+    def word(self, i: int) -> str:
+        return self.vocabulary[self.word_ids[i]]
+
+    def gaps(self) -> np.ndarray:
+        return self.starts[1:] - self.ends[:-1]
+
+    def to_records(self) -> list[dict]:
+        columns = self.to_columns()
+        names = [k for k in columns if k not in ("vocabulary", "ids", "start", "end")]
+        return [
+            {"word": w, "start": s, "end": e, **{n: columns[n][i] for n in names}}
+            for i, (w, s, e) in enumerate(zip(self.words, columns["start"], columns["end"]))
+        ]
+
+    def to_columns(self) -> dict:
+        columns = {
+            "vocabulary": self.vocabulary,
+            "ids": self.word_ids.tolist(),
+            "start": np.round(self.starts, 3).tolist(),
+            "end": np.round(self.ends, 3).tolist(),
+        }
+        for name, values in self.features.items():
+            columns[name] = np.round(values, 3).tolist()
+        return columns
@@ -1,97 +1,456 @@
-import tempfile
-import os
-from dotenv import load_dotenv
+import threading
+import numpy as np
+from concurrent.futures import wait
+from io import BytesIO
 from typing import Optional
-from faster_whisper import WhisperModel
-from backend.config import AVAILABLE_MODELS, DEFAULT_MODEL, WHISPER_DEVICE, WHISPER_COMPUTE_TYPE
+from backend.alignment import snap_word_boundaries
+from backend.timeline import WordTimeline
+from backend.models import model_manager
+from backend.languages import initial_prompt, normalize_language
+from backend.inference import inference_address, remote_transcribe, remote_detect_language
+from backend.batching import batch_scheduler
+from backend.config import (
+    AVAILABLE_MODELS,
+    DEFAULT_MODEL,
+    WHISPER_DEVICE,
+    HYBRID_MODEL,
+    HYBRID_DRAFT_MODEL,
+    HYBRID_REFINE_MODEL,
+    HYBRID_LOGPROB_THRESHOLD,
+    HYBRID_NO_SPEECH_THRESHOLD,
+    HYBRID_PADDING_SECONDS,
+    BATCH_ENABLED,
+    BATCH_MAX_CLIP_SECONDS,
+    BATCH_CANCEL_POLL_SECONDS,
+    ALIGNMENT_ENABLED,
+    ENGLISH_ONLY_SUFFIX,
+)
 
-load_dotenv()
+SAMPLE_RATE = 16000
+
+
+def decode_pcm16(data: bytes, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Raw little-endian mono PCM16 -> float32 at SAMPLE_RATE, without going through ffmpeg."""
+    pcm = np.frombuffer(data[:len(data) // 2 * 2], dtype="<i2").astype(np.float32) / 32768.0
+    if sample_rate != SAMPLE_RATE and pcm.size:
+        target = np.arange(int(pcm.size * SAMPLE_RATE / sample_rate)) * (sample_rate / SAMPLE_RATE)
+        pcm = np.interp(target, np.arange(pcm.size), pcm).astype(np.float32)
+    return pcm
+
+
+def load_audio(audio) -> np.ndarray:
+    if isinstance(audio, np.ndarray):
+        return audio.astype(np.float32, copy=False)
+
+    from faster_whisper import decode_audio
+
+    return decode_audio(BytesIO(audio), sampling_rate=SAMPLE_RATE)
+
+
+class TranscriptionCancelled(Exception):
+    pass
+
+
+def _check_cancelled(cancel: threading.Event | None):
+    if cancel is not None and cancel.is_set():
+        raise TranscriptionCancelled("Transcription cancelled")
+
+
+def _check_all_cancelled(cancels: list[threading.Event | None]):
+    """A shared batch pass stops only once every caller in it has given up."""
+    if all(cancel is not None and cancel.is_set() for cancel in cancels):
+        raise TranscriptionCancelled("Transcription cancelled")
+
+
+def _collect_segments(
+    segments,
+    offset: float = 0.0,
+    cancel: threading.Event | None = None,
+) -> tuple[list[dict], WordTimeline]:
+    collected = []
+    words, starts, ends, probabilities = [], [], [], []
+
+    for segment in segments:
+        if cancel is not None and cancel.is_set():
+            if hasattr(segments, "close"):
+                segments.close()
+            raise TranscriptionCancelled("Transcription cancelled")
+        first_word = len(words)
+        for word_info in segment.words or ():
+            words.append(word_info.word.strip())
+            starts.append(word_info.start)
+            ends.append(word_info.end)
+            probabilities.append(word_info.probability)
+        collected.append({
+            "text": segment.text.strip(),
+            "start": segment.start + offset,
+            "end": segment.end + offset,
+            "avg_logprob": segment.avg_logprob,
+            "no_speech_prob": segment.no_speech_prob,
+            "words": (first_word, len(words)),
+        })
+
+    timeline = WordTimeline.from_words(
+        words,
+        np.asarray(starts, dtype=np.float64) + offset,
+        np.asarray(ends, dtype=np.float64) + offset,
+        {"probability": probabilities},
+    )
+    return collected, timeline
+
+
+def _is_low_confidence(segment: dict) -> bool:
+    return (
+        segment["avg_logprob"] < HYBRID_LOGPROB_THRESHOLD
+        or segment["no_speech_prob"] > HYBRID_NO_SPEECH_THRESHOLD
+    )
+
+
+def _low_confidence_spans(segments: list[dict]) -> list[tuple[float, float]]:
+    spans = []
+    for segment in segments:
+        if not _is_low_confidence(segment):
+            continue
+        if spans and segment["start"] - spans[-1][1] <= 2 * HYBRID_PADDING_SECONDS:
+            spans[-1] = (spans[-1][0], segment["end"])
+        else:
+            spans.append((segment["start"], segment["end"]))
+    return spans
 
 
 class TranscriptionService:
 
     _instance: Optional["TranscriptionService"] = None
     _models: dict = {}
+    _variants: dict = {}
+    _lock = threading.Lock()
+    batching: bool = BATCH_ENABLED
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._models = {}
+            cls._variants = {}
         return cls._instance
 
     def _ensure_model(self, model_size: str):
-        if model_size not in AVAILABLE_MODELS:
+        if model_size.removesuffix(ENGLISH_ONLY_SUFFIX) not in AVAILABLE_MODELS:
             raise ValueError(
                 f"Unknown model: {model_size}. Available: {AVAILABLE_MODELS}"
             )
 
-        if model_size not in self._models:
-            print(f"[TranscriptionService] Loading whisper model: {model_size}")
-            model_path = os.getenv(model_size.upper())
+        if model_size in self._models:
+            return
+
+        with self._lock:
+            if model_size in self._models:
+                return
+
+            from faster_whisper import WhisperModel
+
+            variant = model_manager.resolve(model_size)
+            print(f"[TranscriptionService] Loading whisper model: {model_size} ({variant['name']})")
             self._models[model_size] = WhisperModel(
-                model_path,
+                variant["path"],
                 device=WHISPER_DEVICE,
-                compute_type=WHISPER_COMPUTE_TYPE,
+                compute_type=variant["compute_type"],
             )
+            self._variants[model_size] = variant["name"]
             print(f"[TranscriptionService] Model '{model_size}' loaded successfully.")
 
+    def install_model(self, model_size: str, variant_name: str, model):
+        with self._lock:
+            self._models[model_size] = model
+            self._variants[model_size] = variant_name
+
     def get_loaded_models(self) -> list[str]:
         return list(self._models.keys())
 
-    def transcribe(self, audio_bytes: bytes, model_size: str = DEFAULT_MODEL) -> dict:
+    def get_loaded_variants(self) -> dict:
+        return dict(self._variants)
+
+    def _model_for(self, model_size: str, language: str) -> str:
+        """English recordings go to the .en checkpoint when one is configured."""
+        english_only = model_size + ENGLISH_ONLY_SUFFIX
+        if language == "en" and (english_only in self._models or model_manager.variants(english_only)):
+            return english_only
+        return model_size
+
+    def detect_language(
+        self,
+        audio,
+        model_size: str = DEFAULT_MODEL,
+        cancel: threading.Event | None = None,
+    ) -> tuple[str, float]:
+        """Language of the first 30 s of speech, from the multilingual model."""
+        _check_cancelled(cancel)
+        model_size = HYBRID_DRAFT_MODEL if model_size == HYBRID_MODEL else model_size
+        self._ensure_model(model_size)
+        language, probability, _ = self._models[model_size].detect_language(load_audio(audio))
+        return language, round(float(probability), 3)
+
+    def _run_model(
+        self,
+        model_size: str,
+        audio,
+        offset: float = 0.0,
+        cancel: threading.Event | None = None,
+        language: str | None = None,
+    ) -> tuple[list[dict], WordTimeline, float]:
+        _check_cancelled(cancel)
         self._ensure_model(model_size)
         model = self._models[model_size]
 
-        tmp_path = None
-        try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp:
-                tmp.write(audio_bytes)
-                tmp_path = tmp.name
+        segments, info = model.transcribe(
+            audio,
+            language=language,
+            beam_size=5,
+            word_timestamps=True,
+            vad_filter=False,
+            initial_prompt=initial_prompt(language),
+        )
+        collected, timeline = _collect_segments(segments, offset, cancel)
+        return collected, timeline, info.duration
+
+    def _detect_languages(self, model_size: str, clips: list[np.ndarray]) -> list[tuple[str, float]]:
+        """Language of each clip's first 30 s from one batched encoder pass, as detect_language does per clip."""
+        from faster_whisper.audio import pad_or_trim
+
+        model = self._models[model_size]
+        extractor = model.feature_extractor
+        features = np.stack([
+            pad_or_trim(extractor(clip[:extractor.n_samples])[..., :extractor.nb_max_frames]) for clip in clips
+        ])
+        results = model.model.detect_language(model.encode(features))
+        return [(normalize_language(ranked[0][0][2:-2]), round(float(ranked[0][1]), 3)) for ranked in results]
+
+    def _run_batch(
+        self,
+        key: tuple[str, str | None],
+        clips: list[np.ndarray],
+        cancels: list[threading.Event | None],
+        piece_samples: int,
+    ) -> list[tuple[list[dict], WordTimeline, float, str, float | None] | None]:
+        """One batched pass over several clips laid end to end, each cut into <=30 s pieces.
+
+        A None language is detected for all clips in one encoder pass, then each language runs on its own model.
+        Stops as soon as every caller has cancelled; clips cancelled mid-pass come back as None.
+        """
+        model_size, language = key
+        self._ensure_model(model_size)
+        if language is None:
+            _check_all_cancelled(cancels)
+            detected = self._detect_languages(model_size, clips)
+        else:
+            detected = [(language, None)] * len(clips)
+
+        results = [None] * len(clips)
+        for clip_language in dict.fromkeys(lang for lang, _ in detected):
+            members = [i for i, (lang, _) in enumerate(detected) if lang == clip_language]
+            runs = self._run_pipeline(
+                self._model_for(model_size, clip_language),
+                clip_language,
+                [clips[i] for i in members],
+                [cancels[i] for i in members],
+                piece_samples,
+                cancels,
+            )
+            for i, run in zip(members, runs):
+                if run is not None:
+                    results[i] = (*run, *detected[i])
+        return results
+
+    def _run_pipeline(
+        self,
+        model_size: str,
+        language: str,
+        clips: list[np.ndarray],
+        cancels: list[threading.Event | None],
+        piece_samples: int,
+        batch_cancels: list[threading.Event | None],
+    ) -> list[tuple[list[dict], WordTimeline, float] | None]:
+        from faster_whisper import BatchedInferencePipeline
+
+        self._ensure_model(model_size)
+        pipeline = BatchedInferencePipeline(self._models[model_size])
+
+        bases = np.cumsum([0] + [clip.size for clip in clips[:-1]]) / SAMPLE_RATE
+        clip_timestamps = [
+            {"start": base + start / SAMPLE_RATE, "end": base + min(clip.size, start + piece_samples) / SAMPLE_RATE}
+            for base, clip in zip(bases, clips)
+            for start in range(0, clip.size, piece_samples)
+        ]
 
-            segments, info = model.transcribe(
-                tmp_path,
+        grouped = [[] for _ in clips]
+        if clip_timestamps:
+            _check_all_cancelled(batch_cancels)
+            segments, _ = pipeline.transcribe(
+                np.concatenate(clips),
+                clip_timestamps=clip_timestamps,
+                batch_size=len(clip_timestamps),
+                language=language,
                 beam_size=5,
                 word_timestamps=True,
+                without_timestamps=False,
                 vad_filter=False,
-                initial_prompt="Um, uh, like, you know, basically, actually, so,",
+                initial_prompt=initial_prompt(language),
             )
+            for segment in segments:
+                if all(cancel is not None and cancel.is_set() for cancel in batch_cancels):
+                    if hasattr(segments, "close"):
+                        segments.close()
+                    raise TranscriptionCancelled("Transcription cancelled")
+                owner = np.searchsorted(bases, (segment.start + segment.end) / 2, side="right") - 1
+                grouped[max(owner, 0)].append(segment)
 
-            transcript_parts = []
-            word_timestamps = []
+        return [
+            None if cancel is not None and cancel.is_set()
+            else (*_collect_segments(group, offset=-base), clip.size / SAMPLE_RATE)
+            for base, clip, cancel, group in zip(bases, clips, cancels, grouped)
+        ]
 
-            for segment in segments:
-                transcript_parts.append(segment.text.strip())
-                if segment.words:
-                    for word_info in segment.words:
-                        word_timestamps.append({
-                            "word": word_info.word.strip(),
-                            "start": round(word_info.start, 3),
-                            "end": round(word_info.end, 3),
-                        })
-
-            transcript = " ".join(transcript_parts)
-            duration = round(info.duration, 2)
-
-            return {
-                "transcript": transcript,
-                "duration_seconds": duration,
-                "word_timestamps": word_timestamps,
-                "model_used": model_size,
-            }
-
-        finally:
-            if tmp_path and os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-
-
-def transcribe_audio(audio_bytes: bytes, model_size: str = DEFAULT_MODEL) -> dict:
-    service = TranscriptionService()
-    return service.transcribe(audio_bytes, model_size)
+    def _run_batched(
+        self,
+        model_size: str,
+        audio: np.ndarray,
+        cancel: threading.Event | None = None,
+        language: str | None = None,
+    ) -> tuple[list[dict], WordTimeline, float, str, float | None]:
+        """`model_size` is the multilingual size; a None language is detected inside the shared pass."""
+        self._ensure_model(model_size)
+        future = batch_scheduler.submit((model_size, language), audio, self._run_batch, cancel)
+        # Poll so a cancelled caller returns now instead of when the shared pass finishes.
+        while not future.done():
+            _check_cancelled(cancel)
+            wait([future], timeout=BATCH_CANCEL_POLL_SECONDS)
+        return future.result()
+
+    def warm_up(self, model_size: str = DEFAULT_MODEL):
+        self._ensure_model(model_size)
+        self._run_model(model_size, np.zeros(SAMPLE_RATE, dtype=np.float32))
+
+    def transcribe(
+        self,
+        audio_bytes: bytes | np.ndarray,
+        model_size: str = DEFAULT_MODEL,
+        cancel: threading.Event | None = None,
+        language: str | None = None,
+    ) -> dict:
+        """Pass `language` to pin it (e.g. for every chunk after the first); otherwise it is detected here."""
+        _check_cancelled(cancel)
+        audio = load_audio(audio_bytes)
 
+        probability = None
+        language = normalize_language(language) if language else None
+        batched = self.batching and model_size != HYBRID_MODEL and audio.size <= BATCH_MAX_CLIP_SECONDS * SAMPLE_RATE
+        if language is None and not batched:
+            language, probability = self.detect_language(audio, model_size, cancel)
+            language = normalize_language(language)
 
-def transcribe_audio_chunk(chunk: dict) -> dict:
+        if model_size == HYBRID_MODEL:
+            result = self._transcribe_hybrid(audio, cancel, language)
+        else:
+            if batched:
+                segments, timeline, duration, language, probability = self._run_batched(
+                    model_size, audio, cancel, language
+                )
+            else:
+                runner = self._model_for(model_size, language)
+                segments, timeline, duration = self._run_model(runner, audio, cancel=cancel, language=language)
+            result = self._assemble([s["text"] for s in segments], timeline, duration, audio)
+            result["model_used"] = model_size
+        result["language"] = language
+        result["language_probability"] = probability
+        return result
+
+    def _transcribe_hybrid(self, audio, cancel: threading.Event | None = None, language: str = "en") -> dict:
+        draft_model = self._model_for(HYBRID_DRAFT_MODEL, language)
+        refine_model = self._model_for(HYBRID_REFINE_MODEL, language)
+        segments, timeline, duration = self._run_model(draft_model, audio, cancel=cancel, language=language)
+        pieces = [
+            {"start": s["start"], "end": s["end"], "text": s["text"], "timeline": timeline.select(slice(*s["words"]))}
+            for s in segments
+        ]
+
+        spans = _low_confidence_spans(segments)
+        refined_seconds = 0.0
+
+        for span_start, span_end in spans:
+            window_start = max(0.0, span_start - HYBRID_PADDING_SECONDS)
+            window_end = min(duration, span_end + HYBRID_PADDING_SECONDS)
+            window = audio[int(window_start * SAMPLE_RATE):int(window_end * SAMPLE_RATE)]
+            if window.size == 0:
+                continue
+
+            _, refined, _ = self._run_model(refine_model, window, window_start, cancel, language)
+            refined_seconds += window_end - window_start
+
+            midpoints = (refined.starts + refined.ends) / 2
+            refined = refined.select((midpoints >= span_start) & (midpoints <= span_end))
+
+            pieces = [p for p in pieces if not span_start <= (p["start"] + p["end"]) / 2 <= span_end]
+            pieces.append({"start": span_start, "end": span_end, "text": " ".join(refined.words), "timeline": refined})
+            pieces.sort(key=lambda p: p["start"])
+
+        result = self._assemble(
+            [p["text"] for p in pieces],
+            WordTimeline.concat([p["timeline"] for p in pieces]),
+            duration,
+            audio,
+        )
+        result["model_used"] = HYBRID_MODEL
+        result["hybrid"] = {
+            "draft_model": draft_model,
+            "refine_model": refine_model,
+            "refined_spans": len(spans),
+            "refined_seconds": round(refined_seconds, 2),
+            "draft_seconds": round(duration, 2),
+            "logprob_threshold": HYBRID_LOGPROB_THRESHOLD,
+            "no_speech_threshold": HYBRID_NO_SPEECH_THRESHOLD,
+        }
+        return result
+
+    @staticmethod
+    def _assemble(texts: list[str], timeline: WordTimeline, duration: float, audio) -> dict:
+        alignment = snap_word_boundaries(audio, SAMPLE_RATE, timeline) if ALIGNMENT_ENABLED else None
+
+        return {
+            "transcript": " ".join(t for t in texts if t),
+            "duration_seconds": round(duration, 2),
+            "word_timestamps": timeline,
+            "alignment": alignment,
+        }
+
+
+def transcribe_audio(
+    audio_bytes: bytes | np.ndarray,
+    model_size: str = DEFAULT_MODEL,
+    cancel: threading.Event | None = None,
+    language: str | None = None,
+) -> dict:
+    if inference_address():
+        return remote_transcribe(audio_bytes, model_size, cancel, language)
     service = TranscriptionService()
-    result = service.transcribe(chunk["audio_bytes"])
+    return service.transcribe(audio_bytes, model_size, cancel, language)
+
+
+def detect_audio_language(
+    audio: bytes | np.ndarray,
+    model_size: str = DEFAULT_MODEL,
+    cancel: threading.Event | None = None,
+) -> tuple[str, float]:
+    if inference_address():
+        return remote_detect_language(audio, model_size)
+    return TranscriptionService().detect_language(audio, model_size, cancel)
+
+
+def transcribe_audio_chunk(
+    chunk: dict,
+    model_size: str = DEFAULT_MODEL,
+    cancel: threading.Event | None = None,
+    language: str | None = None,
+) -> dict:
+    result = transcribe_audio(chunk["pcm"], model_size, cancel, language)
 
     return {
         "result": result,
@@ -0,0 +1,79 @@
+import threading
+import time
+from backend.config import DEFAULT_MODEL, MODEL_CALIBRATE_ON_STARTUP
+
+
+class WarmupState:
+    def __init__(self):
+        self.started_at = time.time()
+        self.stage = "pending"
+        self.progress = 0.0
+        self.error: str | None = None
+        self.ready_at: float | None = None
+        self._lock = threading.Lock()
+
+    def update(self, stage: str, progress: float):
+        with self._lock:
+            self.stage = stage
+            self.progress = progress
+            if stage == "ready":
+                self.ready_at = time.time()
+
+    def fail(self, error: Exception):
+        with self._lock:
+            self.stage = "failed"
+            self.error = str(error)
+
+    @property
+    def ready(self) -> bool:
+        return self.stage == "ready"
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.stage == "ready",
+                "stage": self.stage,
+                "progress": round(self.progress, 2),
+                "error": self.error,
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                "warmup_seconds": round(self.ready_at - self.started_at, 1) if self.ready_at else None,
+            }
+
+
+warmup_state = WarmupState()
+
+
+def _warm_up(model_size: str):
+    try:
+        warmup_state.update("importing", 0.1)
+        from backend.transcription import TranscriptionService
+        from backend.models import model_manager
+
+        service = TranscriptionService()
+        # The multilingual model detects the language; English audio is then transcribed by the .en one if configured.
+        sizes = list(dict.fromkeys([model_size, service._model_for(model_size, "en")]))
+        for index, size in enumerate(sizes):
+            base, span = 0.1 + 0.9 * index / len(sizes), 0.9 / len(sizes)
+            if MODEL_CALIBRATE_ON_STARTUP and model_manager.needs_calibration(size):
+                warmup_state.update("calibrating", base + 0.1 * span)
+                calibrated = model_manager.calibrate(size)
+                if calibrated:
+                    service.install_model(size, *calibrated)
+
+            warmup_state.update("loading_model", base + 0.5 * span)
+            service._ensure_model(size)
+
+            warmup_state.update("dummy_inference", base + 0.75 * span)
+            service.warm_up(size)
+
+        warmup_state.update("ready", 1.0)
+        print(f"[Warmup] Models {sizes} warm after {warmup_state.snapshot()['warmup_seconds']}s")
+    except Exception as e:
+        warmup_state.fail(e)
+        print(f"[Warmup] Failed to warm up model '{model_size}': {e}")
+
+
+def start_warmup(model_size: str = DEFAULT_MODEL) -> threading.Thread:
+    thread = threading.Thread(target=_warm_up, args=(model_size,), name="model-warmup", daemon=True)
+    thread.start()
+    return thread
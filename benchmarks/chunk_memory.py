@@ -0,0 +1,146 @@
+"""Peak RSS and allocations of chunking a long recording and handing the chunks to workers.
+
+    python benchmarks/chunk_memory.py --minutes 10 [--json results.json]
+
+`copy` reproduces the old layout, where every chunk carried its own WAV copy that was
+pickled to the worker. `view` is the current in-process layout: (offset, length) views
+into one PCM buffer. `shared` is the server-mode layout: the buffer lives in a SharedPcm
+and the inference process receives only references.
+"""
+import argparse
+import io
+import json
+import os
+import pickle
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+import wave
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from backend.audio_chunks import AudioChunker, SAMPLE_RATE
+from backend.shared_audio import SharedPcm
+
+MODES = ("copy", "view", "shared")
+
+
+def synthetic_speech(minutes: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    pcm = rng.standard_normal(total, dtype=np.float32)
+    pcm *= 0.005
+    position = 0
+    while position < total:
+        length = int(rng.uniform(1.5, 6.0) * SAMPLE_RATE)
+        t = np.arange(min(length, total - position)) / SAMPLE_RATE
+        pcm[position:position + t.size] += (0.3 * np.sin(2 * np.pi * 190 * t)).astype(np.float32)
+        position += t.size + int(rng.uniform(0.4, 1.5) * SAMPLE_RATE)
+    return pcm
+
+
+def _wav(pcm: np.ndarray) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((np.clip(pcm, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+    return buf.getvalue()
+
+
+def run_copy(pcm: np.ndarray):
+    chunks, _ = AudioChunker().split_pcm(pcm)
+    chunks = [{"start_time": c["start_time"], "end_time": c["end_time"], "audio_bytes": _wav(c["pcm"])} for c in chunks]
+    return chunks, [pickle.dumps(c) for c in chunks], None
+
+
+def run_view(pcm: np.ndarray):
+    chunks, _ = AudioChunker().split_pcm(pcm)
+    return chunks, [], None
+
+
+def run_shared(pcm: np.ndarray):
+    shared = SharedPcm(pcm)
+    chunks, _ = AudioChunker().split_pcm(shared.array)
+    return chunks, [pickle.dumps(shared.ref(c["pcm"])) for c in chunks], shared
+
+
+def measure(mode: str, minutes: float) -> dict:
+    pcm = synthetic_speech(minutes)
+    run = {"copy": run_copy, "view": run_view, "shared": run_shared}[mode]
+    warmup = run(pcm[:SAMPLE_RATE * 40].copy())
+    if warmup[2] is not None:
+        warmup[2].close()
+    del warmup
+
+    tracemalloc.start()
+    baseline_blocks = len(tracemalloc.take_snapshot().traces)
+    baseline_bytes, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+
+    chunks, messages, shared = run(pcm)
+
+    elapsed = time.perf_counter() - started
+    held_bytes, peak = tracemalloc.get_traced_memory()
+    held_blocks = len(tracemalloc.take_snapshot().traces) - baseline_blocks
+    tracemalloc.stop()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    handoff_bytes = sum(len(m) for m in messages)
+    chunk_count = len(chunks)
+    del chunks, messages
+    if shared is not None:
+        shared.close()
+
+    return {
+        "mode": mode,
+        "minutes": minutes,
+        "pcm_mb": round(pcm.nbytes / 2**20, 1),
+        "chunks": chunk_count,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "peak_traced_mb": round(peak / 2**20, 2),
+        "chunk_mb": round((held_bytes - baseline_bytes) / 2**20, 2),
+        "chunk_blocks": held_blocks,
+        "peak_rss_mb": round(peak_rss / 1024, 1),
+        "handoff_bytes": handoff_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=10.0, help="Length of the synthetic recording")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.minutes)))
+        return
+
+    results = []
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--minutes", str(args.minutes)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    columns = ("mode", "chunks", "elapsed_ms", "peak_traced_mb", "chunk_mb", "chunk_blocks", "peak_rss_mb", "handoff_bytes")
+    print(f"{args.minutes:g} min recording, {results[0]['pcm_mb']} MB of float32 PCM")
+    print("  ".join(f"{c:>15}" for c in columns))
+    for result in results:
+        print("  ".join(f"{result[c]!s:>15}" for c in columns))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
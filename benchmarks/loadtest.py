@@ -0,0 +1,543 @@
+"""Throughput, latency percentiles, CPU and RSS of the HTTP API under concurrent clients.
+
+    python benchmarks/loadtest.py [--concurrency 1,8,32,128] [--mixes short,mixed,long] [--json results.json]
+    python benchmarks/loadtest.py --transcriber real --audio speech.wav     # configured BASE model
+    python benchmarks/loadtest.py --url http://127.0.0.1:8000 --pid 1234    # an already running server
+
+By default the app is started under uvicorn on localhost in a child process with a stub
+transcriber: it returns filler-laden words every 0.4 s and holds one of `--stub-slots`
+inference slots for `--stub-rtf` x audio seconds, so queueing, admission, chunking, metrics
+and serialisation are exercised without model weights. The stub sleeps instead of burning
+CPU, so CPU figures are the app's own overhead. `--in-process` drives the ASGI app directly
+(no sockets; client and server then share the process that is sampled).
+
+Each (mix, concurrency) level runs for `--seconds`. Clients loop over /api/analyze,
+/api/sessions (GET and POST) and /api/topic according to `--weights`; `--compare` prints
+the change against an earlier results file.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from backend.audio_chunks import SAMPLE_RATE
+from chunk_memory import synthetic_speech
+
+MIXES = {
+    "short": (5.0,),
+    "mixed": (5.0, 5.0, 15.0, 30.0, 60.0),
+    "long": (60.0, 120.0),
+}
+DEFAULT_WEIGHTS = "analyze=2,sessions=2,sessions_save=1,topic=3"
+STUB_WORDS = ("so", "um", "the", "idea", "is", "like", "you", "know", "basically", "we", "should", "try", "it")
+
+
+# --- stub transcriber --------------------------------------------------------------------
+
+class _StubFeatures:
+    n_samples = 30 * SAMPLE_RATE
+    nb_max_frames = 3000
+
+    def __call__(self, audio):
+        return np.zeros((80, audio.size // 160), dtype=np.float32)
+
+
+class _StubWhisper:
+    """Stands in for a WhisperModel: fixed real-time factor, bounded parallelism."""
+
+    def __init__(self, rtf: float, slots: int):
+        self.rtf = rtf
+        self._slots = threading.Semaphore(max(1, slots))
+        self.feature_extractor = _StubFeatures()
+        self.model = types.SimpleNamespace(detect_language=lambda encoded: [[("<|en|>", 0.99)]] * len(encoded))
+
+    def _hold(self, seconds: float):
+        with self._slots:
+            time.sleep(seconds * self.rtf)
+
+    @staticmethod
+    def _segments(start: float, end: float) -> list:
+        segments = []
+        for seg_start in np.arange(start, end, 10.0):
+            seg_end = min(end, seg_start + 10.0)
+            times = np.arange(seg_start, seg_end - 0.3, 0.4)
+            words = [
+                types.SimpleNamespace(word=f" {STUB_WORDS[int(t * 2.5) % len(STUB_WORDS)]}", start=t, end=t + 0.3, probability=0.9)
+                for t in times
+            ]
+            segments.append(types.SimpleNamespace(
+                text="".join(w.word for w in words), start=seg_start, end=seg_end,
+                avg_logprob=-0.2, no_speech_prob=0.01, words=words,
+            ))
+        return segments
+
+    def detect_language(self, audio=None, **kwargs):
+        self._hold(min(30.0, audio.size / SAMPLE_RATE) * 0.1)
+        return "en", 0.99, [("en", 0.99)]
+
+    def encode(self, features):
+        # One padded 30 s window per pass, as a batched encoder run costs about the same as a single one.
+        self._hold(3.0)
+        return features
+
+    def transcribe(self, audio, **kwargs):
+        duration = audio.size / SAMPLE_RATE
+        self._hold(duration)
+        return iter(self._segments(0.0, duration)), types.SimpleNamespace(duration=duration)
+
+
+class _StubPipeline:
+    def __init__(self, model: _StubWhisper):
+        self.model = model
+
+    def transcribe(self, audio, clip_timestamps=(), **kwargs):
+        self.model._hold(audio.size / SAMPLE_RATE)
+        segments = [s for clip in clip_timestamps for s in self.model._segments(clip["start"], clip["end"])]
+        return iter(segments), None
+
+
+def install_stub(rtf: float, slots: int):
+    import faster_whisper
+    from backend import main
+    from backend.config import AVAILABLE_MODELS
+    from backend.transcription import TranscriptionService
+
+    stub = _StubWhisper(rtf, slots)
+    for model_size in AVAILABLE_MODELS:
+        TranscriptionService().install_model(model_size, "stub", stub)
+    faster_whisper.BatchedInferencePipeline = _StubPipeline
+    main.WARMUP_ON_STARTUP = False
+
+
+def isolate_storage(root: str):
+    """Keep load-test sessions and checkpoints out of the real data directories."""
+    from backend.checkpoints import checkpoints
+    from backend.sessions import session_store
+
+    session_store.root = os.path.join(root, "sessions")
+    session_store.multi_tenant = True
+    checkpoints.root = os.path.join(root, "checkpoints")
+
+
+def prepare_app(args, root: str):
+    isolate_storage(root)
+    if args.transcriber == "stub":
+        install_stub(args.stub_rtf, args.stub_slots)
+    from backend.main import app
+
+    return app
+
+
+def serve(args):
+    import uvicorn
+
+    root = tempfile.mkdtemp(prefix="speechlab-loadtest-")
+    try:
+        app = prepare_app(args, root)
+        uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+# --- resource sampling -------------------------------------------------------------------
+
+def _proc_sample(pid: int) -> tuple[float, float] | None:
+    """(cpu seconds, rss bytes) of `pid`."""
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            times = process.cpu_times()
+            return times.user + times.system, process.memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rpartition(")")[2].split()
+        with open(f"/proc/{pid}/statm") as f:
+            rss_pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    return (int(fields[11]) + int(fields[12])) / ticks, rss_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class ResourceSampler:
+    def __init__(self, pid: int | None, interval: float):
+        self.pid = pid
+        self.interval = interval
+        self.samples: list[dict] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="loadtest-sampler", daemon=True)
+
+    def _run(self):
+        started = time.perf_counter()
+        previous = _proc_sample(self.pid)
+        previous_at = started
+        while not self._stop.wait(self.interval):
+            current = _proc_sample(self.pid)
+            now = time.perf_counter()
+            if current is None or previous is None:
+                previous, previous_at = current, now
+                continue
+            self.samples.append({
+                "t": round(now - started, 2),
+                "cpu_percent": round((current[0] - previous[0]) / (now - previous_at) * 100, 1),
+                "rss_mb": round(current[1] / 2**20, 1),
+            })
+            previous, previous_at = current, now
+
+    def __enter__(self) -> "ResourceSampler":
+        if self.pid is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def summary(self) -> dict:
+        if not self.samples:
+            return {"cpu_percent_mean": None, "cpu_percent_max": None, "rss_mb_max": None, "samples": []}
+        cpu = np.array([s["cpu_percent"] for s in self.samples])
+        return {
+            "cpu_percent_mean": round(float(cpu.mean()), 1),
+            "cpu_percent_max": round(float(cpu.max()), 1),
+            "rss_mb_max": max(s["rss_mb"] for s in self.samples),
+            "samples": self.samples,
+        }
+
+
+# --- workload ----------------------------------------------------------------------------
+
+class AudioPool:
+    """One PCM16 recording per length, made unique per request so checkpoints never collide."""
+
+    def __init__(self, lengths, source: np.ndarray | None = None):
+        self._audio = {}
+        for seconds in set(lengths):
+            samples = int(seconds * SAMPLE_RATE)
+            if source is None:
+                pcm = synthetic_speech(seconds / 60, seed=int(seconds))
+            else:
+                pcm = np.resize(source, samples)
+            self._audio[seconds] = (np.clip(pcm, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+        self._counter = 0
+
+    def take(self, seconds: float) -> bytes:
+        self._counter += 1
+        return self._counter.to_bytes(8, "little") + self._audio[seconds][8:]
+
+
+def _parse_weights(text: str) -> dict[str, float]:
+    weights = {}
+    for item in text.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() not in ("analyze", "sessions", "sessions_save", "topic"):
+            raise SystemExit(f"Unknown endpoint in --weights: {name.strip()}")
+        weights[name.strip()] = float(value or 1)
+    return {k: v for k, v in weights.items() if v > 0}
+
+
+def _session_payload(count: int) -> bytes:
+    sessions = [
+        {
+            "id": i,
+            "date": "2026-01-01T00:00:00Z",
+            "transcript": " ".join(STUB_WORDS * 8),
+            "duration_seconds": 60,
+            "metrics": {"wpm": 130 + i % 20, "filler_count": i % 7},
+            "topic": {"topic": f"Load test topic {i % 5}", "category": "loadtest"},
+        }
+        for i in range(count)
+    ]
+    return json.dumps(sessions).encode()
+
+
+async def _issue_users(client, count: int) -> list[dict]:
+    """One server-signed user cookie per simulated user, sent explicitly so the client jar never mixes them."""
+    from backend.config import USER_COOKIE_NAME
+
+    users = []
+    for _ in range(count):
+        client.cookies.clear()
+        response = await client.get("/api/health")
+        users.append({"Cookie": f"{USER_COOKIE_NAME}={response.cookies[USER_COOKIE_NAME]}"})
+    client.cookies.clear()
+    return users
+
+
+async def _request(client, endpoint: str, headers: dict, mix, pool: AudioPool, sessions_body: bytes, rng: random.Random):
+    if endpoint == "analyze":
+        seconds = rng.choice(mix)
+        return await client.post(
+            "/api/analyze",
+            headers=headers,
+            files={"audio": ("loadtest.pcm", pool.take(seconds), "application/octet-stream")},
+            data={"sample_rate": str(SAMPLE_RATE), "duration": str(seconds)},
+        )
+    if endpoint == "sessions":
+        return await client.get("/api/sessions", headers=headers)
+    if endpoint == "sessions_save":
+        return await client.post("/api/sessions", headers={**headers, "Content-Type": "application/json"}, content=sessions_body)
+    return await client.get("/api/topic", headers=headers)
+
+
+async def run_level(client, users: list[dict], concurrency: int, mix, seconds: float, weights: dict, pool: AudioPool, sessions_body: bytes) -> list[dict]:
+    records = []
+    endpoints, endpoint_weights = list(weights), list(weights.values())
+    started = time.perf_counter()
+    deadline = started + seconds
+
+    async def worker(index: int):
+        rng = random.Random(index)
+        headers = users[index]
+        while time.perf_counter() < deadline:
+            endpoint = rng.choices(endpoints, endpoint_weights)[0]
+            sent = time.perf_counter()
+            try:
+                response = await _request(client, endpoint, headers, mix, pool, sessions_body, rng)
+                status, size = response.status_code, len(response.content)
+            except Exception as e:
+                status, size = type(e).__name__, 0
+            records.append({
+                "endpoint": endpoint,
+                "t": round(sent - started, 3),
+                "latency": time.perf_counter() - sent,
+                "status": status,
+                "bytes": size,
+            })
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return records
+
+
+def summarize(records: list[dict], elapsed: float) -> dict:
+    by_endpoint = {}
+    for endpoint in sorted({r["endpoint"] for r in records}):
+        rows = [r for r in records if r["endpoint"] == endpoint]
+        ok = np.array([r["latency"] for r in rows if r["status"] == 200]) * 1000
+        statuses = {}
+        for r in rows:
+            statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+        by_endpoint[endpoint] = {
+            "requests": len(rows),
+            "ok": int(ok.size),
+            "throughput_rps": round(ok.size / elapsed, 2),
+            "statuses": statuses,
+            **{
+                f"p{q}_ms": round(float(np.percentile(ok, q)), 1) if ok.size else None
+                for q in (50, 90, 95, 99)
+            },
+            "max_ms": round(float(ok.max()), 1) if ok.size else None,
+            "mean_ms": round(float(ok.mean()), 1) if ok.size else None,
+        }
+    ok_total = sum(e["ok"] for e in by_endpoint.values())
+    return {
+        "requests": len(records),
+        "ok": ok_total,
+        "errors": len(records) - ok_total,
+        "throughput_rps": round(ok_total / elapsed, 2),
+        "endpoints": by_endpoint,
+    }
+
+
+# --- driver ------------------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(args) -> tuple[subprocess.Popen, str]:
+    from server import wait_for_port
+
+    port = _free_port()
+    command = [
+        sys.executable, os.path.abspath(__file__), "--serve", "--port", str(port),
+        "--transcriber", args.transcriber, "--stub-rtf", str(args.stub_rtf), "--stub-slots", str(args.stub_slots),
+    ]
+    process = subprocess.Popen(command, cwd=PROJECT_ROOT)
+    if not wait_for_port("127.0.0.1", port, timeout=120):
+        process.kill()
+        raise SystemExit("[LoadTest] Server did not start.")
+    return process, f"http://127.0.0.1:{port}"
+
+
+def _load_source(path: str | None) -> np.ndarray | None:
+    if not path:
+        return None
+    from faster_whisper import decode_audio
+
+    return decode_audio(path, sampling_rate=SAMPLE_RATE)
+
+
+async def sweep(args, base_url: str | None, app, pid: int | None) -> list[dict]:
+    import httpx
+
+    weights = _parse_weights(args.weights)
+    mixes = [m.strip() for m in args.mixes.split(",") if m.strip()]
+    unknown = [m for m in mixes if m not in MIXES]
+    if unknown:
+        raise SystemExit(f"Unknown mixes: {unknown}. Available: {list(MIXES)}")
+    pool = AudioPool([s for m in mixes for s in MIXES[m]], _load_source(args.audio))
+    sessions_body = _session_payload(args.seed_sessions)
+    concurrencies = [int(c) for c in args.concurrency.split(",")]
+
+    transport = httpx.ASGITransport(app=app) if app is not None else None
+    limits = httpx.Limits(max_connections=max(concurrencies), max_keepalive_connections=max(concurrencies))
+    async with httpx.AsyncClient(
+        base_url=base_url or "http://loadtest", transport=transport, limits=limits, timeout=args.timeout
+    ) as client:
+        users = await _issue_users(client, max(concurrencies))
+        for headers in users:
+            await client.post("/api/sessions", headers={**headers, "Content-Type": "application/json"}, content=sessions_body)
+
+        results = []
+        for mix in mixes:
+            for concurrency in concurrencies:
+                with ResourceSampler(pid, args.sample_interval) as sampler:
+                    started = time.perf_counter()
+                    records = await run_level(client, users, concurrency, MIXES[mix], args.seconds, weights, pool, sessions_body)
+                    elapsed = time.perf_counter() - started
+                result = {
+                    "mix": mix,
+                    "concurrency": concurrency,
+                    "elapsed_seconds": round(elapsed, 2),
+                    **summarize(records, elapsed),
+                    "resources": sampler.summary(),
+                }
+                results.append(result)
+                _print_level(result)
+    return results
+
+
+def _print_level(result: dict):
+    resources = result["resources"]
+    print(
+        f"[LoadTest] mix={result['mix']:<6} c={result['concurrency']:<4} "
+        f"{result['throughput_rps']:>8.2f} req/s  ok={result['ok']:<6} errors={result['errors']:<5} "
+        f"cpu={resources['cpu_percent_mean']}%  rss_max={resources['rss_mb_max']} MB"
+    )
+    for endpoint, stats in result["endpoints"].items():
+        print(
+            f"           {endpoint:<14} n={stats['requests']:<6} p50={stats['p50_ms']}  p95={stats['p95_ms']}  "
+            f"p99={stats['p99_ms']}  max={stats['max_ms']} ms  statuses={stats['statuses']}"
+        )
+
+
+def compare(previous_path: str, results: list[dict]):
+    with open(previous_path) as f:
+        previous = {(r["mix"], r["concurrency"]): r for r in json.load(f)["levels"]}
+    print(f"[LoadTest] Compared with {previous_path}:")
+    for result in results:
+        before = previous.get((result["mix"], result["concurrency"]))
+        if before is None:
+            continue
+        for endpoint, stats in result["endpoints"].items():
+            old = before["endpoints"].get(endpoint)
+            if not old or not old["p95_ms"] or not stats["p95_ms"]:
+                continue
+            print(
+                f"           mix={result['mix']:<6} c={result['concurrency']:<4} {endpoint:<14} "
+                f"rps {old['throughput_rps']} -> {stats['throughput_rps']}  "
+                f"p95 {old['p95_ms']} -> {stats['p95_ms']} ms ({(stats['p95_ms'] / old['p95_ms'] - 1) * 100:+.0f}%)"
+            )
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="1,8,32,128", help="Comma-separated client counts")
+    parser.add_argument("--mixes", default="short,mixed", help=f"Audio-length mixes to sweep: {', '.join(MIXES)}")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Duration of each level")
+    parser.add_argument("--weights", default=DEFAULT_WEIGHTS, help="Relative endpoint weights")
+    parser.add_argument("--seed-sessions", type=int, default=50, help="Sessions stored per simulated user")
+    parser.add_argument("--transcriber", choices=("stub", "real"), default="stub")
+    parser.add_argument("--stub-rtf", type=float, default=0.05, help="Stub seconds of inference per second of audio")
+    parser.add_argument("--stub-slots", type=int, default=1, help="Concurrent stub inferences (CTranslate2 runs one per model)")
+    parser.add_argument("--audio", help="Speech recording looped to each length (recommended with --transcriber real)")
+    parser.add_argument("--in-process", action="store_true", help="Drive the ASGI app without a server")
+    parser.add_argument("--url", help="Load an already running server instead of starting one")
+    parser.add_argument("--pid", type=int, help="Process to sample when using --url")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-request timeout in seconds")
+    parser.add_argument("--sample-interval", type=float, default=0.5, help="CPU/RSS sampling interval in seconds")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.serve:
+        serve(args)
+        return
+
+    server = root = app = None
+    if args.url:
+        base_url, pid = args.url, args.pid
+    elif args.in_process:
+        root = tempfile.mkdtemp(prefix="speechlab-loadtest-")
+        app, base_url, pid = prepare_app(args, root), None, os.getpid()
+    else:
+        server, base_url = start_server(args)
+        pid = server.pid
+
+    try:
+        results = asyncio.run(sweep(args, base_url, app, pid))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        if root is not None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "revision": _git_revision(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": {"system": platform.system(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "config": {k: v for k, v in vars(args).items() if k not in ("serve", "port", "json", "compare")},
+        "levels": results,
+    }
+    if args.compare:
+        compare(args.compare, results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[LoadTest] Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
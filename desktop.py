@@ -42,7 +42,7 @@ def wait_for_server(host: str, port: int, timeout: float = 30.0):
             with socket.create_connection((host, port), timeout=1):
                 return True
         except (ConnectionRefusedError, OSError):
-            time.sleep(0.3)
+            time.sleep(0.05)
     return False
 
 
@@ -51,14 +51,14 @@ def main():
     server_thread.start()
 
     print("[SpeechLab] Starting server...")
+    import webview
+
     if not wait_for_server(SERVER_HOST, SERVER_PORT):
         print("[SpeechLab] ERROR: Server failed to start within 30 seconds.")
         sys.exit(1)
 
     print(f"[SpeechLab] Server running at http://{SERVER_HOST}:{SERVER_PORT}")
 
-    import webview
-
     window = webview.create_window(
         title="SpeechLab",
         url=f"http://{SERVER_HOST}:{SERVER_PORT}",
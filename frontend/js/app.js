@@ -5,6 +5,13 @@
   const API_BASE = "";
   const MAX_RECORDING_SECONDS = 300;
   const MIN_RECORDING_SECONDS = 30;
+  const PCM_SAMPLE_RATE = 16000;
+  const OPUS_BITRATE = 24000;
+  // Raw PCM skips server-side decoding; over a real network opus is ~10x smaller.
+  const PREFER_PCM = ["localhost", "127.0.0.1"].includes(location.hostname);
+  // Energy-envelope metrics streamed over /api/live while recording; no transcription involved.
+  const LIVE_FEEDBACK = "WebSocket" in window;
+  const LIVE_LONG_PAUSE_SECONDS = 1.0;
 
   const FILLER_WORDS = new Set(["uh", "um", "like", "basically", "actually"]);
 
@@ -14,6 +21,7 @@
     isRecording: false,
     recordingTime: 0,
     audioBlob: null,
+    pcmData: null,
     isAnalyzing: false,
     analysisResult: null,
     activeView: "record",
@@ -22,6 +30,9 @@
 
   let mediaRecorder = null;
   let audioChunks = [];
+  let pcmNode = null;
+  let pcmBlocks = [];
+  let liveSocket = null;
   let timerInterval = null;
   let audioContext = null;
   let analyserNode = null;
@@ -45,6 +56,11 @@
     visualizerContainer: $("visualizerContainer"),
     visualizerCanvas: $("visualizerCanvas"),
     visualizerLabel: $("visualizerLabel"),
+    liveMetrics: $("liveMetrics"),
+    liveSpeaking: $("liveSpeaking"),
+    livePause: $("livePause"),
+    liveLoudness: $("liveLoudness"),
+    liveRate: $("liveRate"),
     playbackContainer: $("playbackContainer"),
     audioPlayback: $("audioPlayback"),
     analyzeBtn: $("analyzeBtn"),
@@ -57,6 +73,8 @@
     copyBtnText: $("copyBtnText"),
     fillerBreakdown: $("fillerBreakdown"),
     fillerBreakdownContent: $("fillerBreakdownContent"),
+    timeseriesGroup: $("timeseriesGroup"),
+    timeseriesCanvas: $("timeseriesCanvas"),
 
     // Coach view
     coachContent: $("coachContent"),
@@ -71,6 +89,7 @@
 
     // Model
     modelSelect: $("modelSelect"),
+    modelStatus: $("modelStatus"),
 
     // Analysis progress (inline)
     analysisProgress: $("analysisProgress"),
@@ -147,22 +166,27 @@
 
   async function startRecording() {
     try {
-      const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+      const stream = await navigator.mediaDevices.getUserMedia({
+        audio: { channelCount: 1 },
+      });
       audioChunks = [];
 
       const mimeType = MediaRecorder.isTypeSupported("audio/webm;codecs=opus")
         ? "audio/webm;codecs=opus"
         : "";
 
-      mediaRecorder = new MediaRecorder(stream, mimeType ? { mimeType } : {});
+      const recorderOptions = { audioBitsPerSecond: OPUS_BITRATE };
+      if (mimeType) recorderOptions.mimeType = mimeType;
+      mediaRecorder = new MediaRecorder(stream, recorderOptions);
 
       mediaRecorder.ondataavailable = (e) => {
         if (e.data.size > 0) audioChunks.push(e.data);
       };
 
-      mediaRecorder.onstop = () => {
+      mediaRecorder.onstop = async () => {
         const blob = new Blob(audioChunks, { type: mediaRecorder.mimeType });
         state.audioBlob = blob;
+        state.pcmData = await stopPcmCapture();
         stream.getTracks().forEach((t) => t.stop());
         stopVisualizer();
         onRecordingComplete(blob);
@@ -172,6 +196,7 @@
       state.isRecording = true;
       state.recordingTime = 0;
       state.audioBlob = null;
+      state.pcmData = null;
 
       dom.recordBtn.classList.add("recording");
       dom.stopBtn.classList.remove("hidden");
@@ -180,6 +205,8 @@
       dom.timerLabel.textContent = "Recording...";
 
       startVisualizer(stream);
+      if (LIVE_FEEDBACK) startLiveFeedback();
+      if (PREFER_PCM || LIVE_FEEDBACK) await startPcmCapture(stream);
 
       timerInterval = setInterval(() => {
         state.recordingTime++;
@@ -200,6 +227,7 @@
       mediaRecorder.stop();
     }
     clearInterval(timerInterval);
+    stopLiveFeedback();
     state.isRecording = false;
 
     dom.recordBtn.classList.remove("recording");
@@ -270,6 +298,93 @@
     }
   }
 
+  // ─── PCM Capture ──────────────────────────────────────────
+  async function startPcmCapture(stream) {
+    pcmBlocks = [];
+    if (!audioContext || !audioContext.audioWorklet) return;
+    try {
+      await audioContext.audioWorklet.addModule("/js/pcm-worklet.js");
+      pcmNode = new AudioWorkletNode(audioContext, "pcm-downsampler", {
+        processorOptions: { targetRate: PCM_SAMPLE_RATE },
+      });
+      pcmNode.port.onmessage = (e) => {
+        if (!(e.data instanceof Int16Array)) return;
+        sendLiveBlock(e.data);
+        if (PREFER_PCM) pcmBlocks.push(e.data);
+      };
+      audioContext.createMediaStreamSource(stream).connect(pcmNode);
+      pcmNode.connect(audioContext.destination);
+    } catch (err) {
+      console.warn("PCM capture unavailable, falling back to opus upload:", err);
+      pcmNode = null;
+    }
+  }
+
+  function stopPcmCapture() {
+    if (!pcmNode) return Promise.resolve(null);
+    const node = pcmNode;
+    pcmNode = null;
+
+    return new Promise((resolve) => {
+      node.port.onmessage = (e) => {
+        if (e.data instanceof Int16Array) {
+          pcmBlocks.push(e.data);
+          return;
+        }
+        node.disconnect();
+        const total = pcmBlocks.reduce((n, b) => n + b.length, 0);
+        const pcm = new Int16Array(total);
+        let offset = 0;
+        for (const block of pcmBlocks) {
+          pcm.set(block, offset);
+          offset += block.length;
+        }
+        pcmBlocks = [];
+        resolve(PREFER_PCM && total ? pcm : null);
+      };
+      node.port.postMessage("flush");
+    });
+  }
+
+  // ─── Live Feedback ────────────────────────────────────────
+  function startLiveFeedback() {
+    const protocol = location.protocol === "https:" ? "wss:" : "ws:";
+    try {
+      liveSocket = new WebSocket(
+        `${protocol}//${location.host}${API_BASE}/api/live?sample_rate=${PCM_SAMPLE_RATE}`
+      );
+    } catch (err) {
+      console.warn("Live feedback unavailable:", err);
+      liveSocket = null;
+      return;
+    }
+    liveSocket.onopen = () => dom.liveMetrics.classList.remove("hidden");
+    liveSocket.onmessage = (e) => renderLiveMetrics(JSON.parse(e.data));
+    liveSocket.onclose = () => dom.liveMetrics.classList.add("hidden");
+  }
+
+  function sendLiveBlock(block) {
+    if (liveSocket && liveSocket.readyState === WebSocket.OPEN) {
+      liveSocket.send(block);
+    }
+  }
+
+  function stopLiveFeedback() {
+    if (liveSocket) {
+      liveSocket.close();
+      liveSocket = null;
+    }
+    dom.liveMetrics.classList.add("hidden");
+  }
+
+  function renderLiveMetrics(live) {
+    dom.liveSpeaking.textContent = `${Math.round(live.speaking_ratio * 100)}%`;
+    dom.livePause.textContent = `${live.current_pause_seconds.toFixed(1)}s`;
+    dom.livePause.classList.toggle("live-alert", live.current_pause_seconds >= LIVE_LONG_PAUSE_SECONDS);
+    dom.liveLoudness.textContent = live.loudness_db === null ? "–" : `${Math.round(live.loudness_db)} dB`;
+    dom.liveRate.textContent = live.syllable_rate.toFixed(1);
+  }
+
   function stopVisualizer() {
     if (visualizerRAF) {
       cancelAnimationFrame(visualizerRAF);
@@ -306,8 +421,18 @@
 
     try {
       const formData = new FormData();
-      formData.append("audio", state.audioBlob, "recording.webm");
+      if (state.pcmData) {
+        const pcmBlob = new Blob([state.pcmData.buffer], { type: "application/octet-stream" });
+        formData.append("audio", pcmBlob, "recording.pcm");
+        formData.append("sample_rate", PCM_SAMPLE_RATE);
+      } else {
+        formData.append("audio", state.audioBlob, "recording.webm");
+      }
       formData.append("duration", state.recordingTime);
+      if (state.currentTopic) {
+        formData.append("topic_id", state.currentTopic.id || "");
+        formData.append("topic", state.currentTopic.topic);
+      }
 
       setTimeout(() => {
         if (state.isAnalyzing) {
@@ -317,7 +442,7 @@
 
       const selectedModel = dom.modelSelect ? dom.modelSelect.value : "base";
       const res = await fetch(
-        `${API_BASE}/api/analyze?model=${selectedModel}`,
+        `${API_BASE}/api/analyze?model=${selectedModel}&word_format=columnar`,
         {
           method: "POST",
           body: formData,
@@ -386,7 +511,15 @@
     setMetric("metricArticulationRate", metrics.articulation_rate);
     setMetric("metricSpeakingRatio", metrics.speaking_time_ratio);
 
+    // Delivery metrics
+    setMetric("metricWordConfidence", metrics.avg_word_confidence);
+    setMetric("metricMonotony", metrics.monotony_score);
+    setMetric("metricVolumeConsistency", metrics.volume_consistency);
+    setMetric("metricSyllableRate", metrics.avg_syllable_rate);
+    setMetric("metricTopicRelevance", metrics.topic_relevance_percentile);
+
     renderFillerBreakdown(metrics.filler_details || {});
+    renderTimeseries(metrics.timeseries);
     generateLLMContext(data);
   }
 
@@ -433,6 +566,64 @@
       .join("");
   }
 
+  function downsample(time, values, maxPoints) {
+    if (time.length <= maxPoints) return { time, values };
+    const bucket = time.length / maxPoints;
+    const outTime = [];
+    const outValues = [];
+    for (let b = 0; b < maxPoints; b++) {
+      const start = Math.floor(b * bucket);
+      const end = Math.max(start + 1, Math.floor((b + 1) * bucket));
+      let sum = 0;
+      for (let i = start; i < end; i++) sum += values[i];
+      outTime.push(time[Math.floor((start + end - 1) / 2)]);
+      outValues.push(sum / (end - start));
+    }
+    return { time: outTime, values: outValues };
+  }
+
+  function renderTimeseries(series) {
+    if (!series || !series.time || series.time.length < 2) {
+      dom.timeseriesGroup.classList.add("hidden");
+      return;
+    }
+    dom.timeseriesGroup.classList.remove("hidden");
+
+    const canvas = dom.timeseriesCanvas;
+    const ctx = canvas.getContext("2d");
+    const { width, height } = canvas;
+    const pad = 24;
+    const maxPoints = Math.floor(width / 3);
+    const t0 = series.time[0];
+    const t1 = series.time[series.time.length - 1];
+
+    ctx.clearRect(0, 0, width, height);
+    ctx.font = "10px sans-serif";
+    ctx.fillStyle = "#63636b";
+    ctx.fillText(`${Math.round(t0)}s`, pad, height - 6);
+    ctx.fillText(`${Math.round(t1)}s`, width - pad - 24, height - 6);
+
+    const lines = [
+      { values: series.words_per_minute, color: "#14b8a6" },
+      { values: series.filler_density, color: "#f59e0b" },
+    ];
+
+    for (const line of lines) {
+      const { time, values } = downsample(series.time, line.values, maxPoints);
+      const max = Math.max(1, ...values);
+      ctx.strokeStyle = line.color;
+      ctx.lineWidth = 1.5;
+      ctx.beginPath();
+      time.forEach((t, i) => {
+        const x = pad + ((t - t0) / Math.max(1e-6, t1 - t0)) * (width - 2 * pad);
+        const y = height - pad - (values[i] / max) * (height - 2 * pad);
+        if (i === 0) ctx.moveTo(x, y);
+        else ctx.lineTo(x, y);
+      });
+      ctx.stroke();
+    }
+  }
+
   function setMetric(id, value) {
     const el = $(id);
     if (el) el.textContent = value ?? "—";
@@ -525,6 +716,32 @@
     );
     lines.push("");
 
+    lines.push("Delivery:");
+    lines.push(
+      `  Avg Word Confidence: ${metrics.avg_word_confidence ?? "N/A"} (recognizer certainty, 0-1)`,
+    );
+    lines.push(
+      `  Pitch Variability: ${metrics.pitch_variability_semitones ?? "N/A"} semitones (monotony ${metrics.monotony_score ?? "N/A"}/100)`,
+    );
+    lines.push(
+      `  Volume Consistency: ${metrics.volume_consistency ?? "N/A"}/100`,
+    );
+    lines.push(
+      `  Syllable Rate: ${metrics.avg_syllable_rate ?? "N/A"} per second`,
+    );
+    lines.push("");
+
+    if (metrics.topic_relevance !== null && metrics.topic_relevance !== undefined) {
+      lines.push("Topic Relevance:");
+      lines.push(
+        `  Relevance Score: ${metrics.topic_relevance} (cosine similarity to the topic)`,
+      );
+      lines.push(
+        `  Relevance Percentile: ${metrics.topic_relevance_percentile} (rank ${metrics.topic_relevance_rank} among all topics)`,
+      );
+      lines.push("");
+    }
+
     lines.push("--- INSTRUCTIONS FOR AI ---");
     lines.push("Based on the transcript and metrics above, please:");
     lines.push("1. Identify my top 3 speaking weaknesses.");
@@ -612,7 +829,11 @@
       topic: state.currentTopic,
       transcript: data.transcript,
       duration_seconds: data.duration_seconds,
+      word_timestamps: data.word_timestamps,
+      model_used: data.model_used,
+      language: data.language,
       metrics: data.metrics,
+      metric_versions: data.metric_versions,
     };
     state.sessions.unshift(session);
     if (state.sessions.length > 50)
@@ -654,9 +875,12 @@
 
     // Click to load session
     dom.historyList.querySelectorAll(".history-item").forEach((el) => {
-      el.addEventListener("click", () => {
+      el.addEventListener("click", async () => {
         const id = parseInt(el.dataset.id);
-        const session = state.sessions.find((s) => s.id === id);
+        let session = state.sessions.find((s) => s.id === id);
+        if (session && session.transcript) {
+          session = (await rescoreSession(session)) || session;
+        }
         if (session) {
           state.analysisResult = session;
           if (session.topic) {
@@ -670,11 +894,30 @@
     });
   }
 
+  // Recomputes metrics whose thresholds changed since the session was saved.
+  async function rescoreSession(session) {
+    try {
+      const res = await fetch(`${API_BASE}/api/sessions/${session.id}/rescore`, {
+        method: "POST",
+      });
+      if (!res.ok) return null;
+      const data = await res.json();
+      const index = state.sessions.findIndex((s) => s.id === session.id);
+      if (index !== -1) state.sessions[index] = data.session;
+      return data.session;
+    } catch (err) {
+      console.error("Failed to rescore session:", err);
+      return null;
+    }
+  }
+
   async function clearHistory() {
     if (confirm("Clear all session history?")) {
       state.sessions = [];
       try {
-        await fetch(`${API_BASE}/api/sessions`, { method: "DELETE" });
+        await fetch(`${API_BASE}/api/sessions`, {
+          method: "DELETE",
+        });
       } catch (err) {
         console.error("Failed to clear sessions:", err);
       }
@@ -715,6 +958,29 @@
     return escapeHtml(words.length > count ? slice + "..." : slice);
   }
 
+  // ─── Readiness ────────────────────────────────────────────
+  async function checkReadiness() {
+    try {
+      const res = await fetch(`${API_BASE}/api/ready`);
+      const data = await res.json();
+      if (data.ready) {
+        dom.modelStatus.textContent = "Model ready";
+        dom.modelStatus.className = "model-status ready";
+        return;
+      }
+      if (data.stage === "failed") {
+        dom.modelStatus.textContent = "Model failed to load";
+        dom.modelStatus.className = "model-status failed";
+        return;
+      }
+      dom.modelStatus.textContent = `Warming up… ${Math.round(data.progress * 100)}%`;
+    } catch (err) {
+      dom.modelStatus.textContent = "Connecting…";
+    }
+    setTimeout(checkReadiness, 1000);
+  }
+
   // ─── Init ─────────────────────────────────────────────────
   loadSessionsFromAPI();
+  checkReadiness();
 })();
@@ -0,0 +1,61 @@
+// Downmixes the microphone to mono, resamples to 16 kHz (box-filtered
+// decimation) and posts PCM16 blocks to the main thread.
+
+class PcmDownsampler extends AudioWorkletProcessor {
+  constructor(options) {
+    super();
+    const opts = (options && options.processorOptions) || {};
+    this.ratio = sampleRate / (opts.targetRate || 16000);
+    this.position = 0;
+    this.pending = new Float32Array(0);
+    this.block = new Int16Array(opts.blockSize || 4096);
+    this.blockLength = 0;
+
+    this.port.onmessage = (e) => {
+      if (e.data === "flush") {
+        this.postBlock();
+        this.port.postMessage("flushed");
+      }
+    };
+  }
+
+  postBlock() {
+    if (!this.blockLength) return;
+    const out = this.block.slice(0, this.blockLength);
+    this.port.postMessage(out, [out.buffer]);
+    this.blockLength = 0;
+  }
+
+  process(inputs) {
+    const input = inputs[0];
+    if (!input || input.length === 0) return true;
+
+    const frames = input[0].length;
+    const offset = this.pending.length;
+    const mono = new Float32Array(offset + frames);
+    mono.set(this.pending);
+    for (let c = 0; c < input.length; c++) {
+      const channel = input[c];
+      for (let i = 0; i < frames; i++) mono[offset + i] += channel[i] / input.length;
+    }
+
+    let pos = this.position;
+    while (pos + this.ratio <= mono.length) {
+      const start = Math.floor(pos);
+      const end = Math.max(start + 1, Math.floor(pos + this.ratio));
+      let sum = 0;
+      for (let i = start; i < end; i++) sum += mono[i];
+      const v = Math.max(-1, Math.min(1, sum / (end - start)));
+      this.block[this.blockLength++] = v < 0 ? v * 0x8000 : v * 0x7fff;
+      if (this.blockLength === this.block.length) this.postBlock();
+      pos += this.ratio;
+    }
+
+    const consumed = Math.floor(pos);
+    this.pending = mono.slice(consumed);
+    this.position = pos - consumed;
+    return true;
+  }
+}
+
+registerProcessor("pcm-downsampler", PcmDownsampler);
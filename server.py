@@ -0,0 +1,126 @@
+import argparse
+import multiprocessing
+import os
+import secrets
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from backend.config import (
+    SERVER_PORT,
+    SERVER_WORKERS,
+    SERVER_DRAIN_SECONDS,
+    SERVER_GRACEFUL_TIMEOUT,
+    INFERENCE_HOST,
+    INFERENCE_PORT,
+    DEFAULT_MODEL,
+    SERVER_BATCHING,
+)
+
+
+def parse_args(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Run SpeechLab as a multi-user HTTP server.")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to bind the HTTP server to")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="HTTP port")
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS, help="Number of uvicorn worker processes")
+    parser.add_argument("--inference-port", type=int, default=INFERENCE_PORT, help="Local port of the shared inference backend")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Model to warm up in the inference backend")
+    parser.add_argument("--drain-seconds", type=float, default=SERVER_DRAIN_SECONDS,
+                        help="How long /api/ready reports 503 before workers stop accepting connections")
+    parser.add_argument("--graceful-timeout", type=int, default=SERVER_GRACEFUL_TIMEOUT,
+                        help="Maximum seconds to wait for in-flight requests on shutdown")
+    parser.add_argument("--no-batching", dest="batching", action="store_false", default=SERVER_BATCHING,
+                        help="Transcribe each short clip on its own instead of micro-batching concurrent ones")
+    return parser.parse_args(argv)
+
+
+def wait_for_port(host: str, port: int, timeout: float = 30.0) -> bool:
+    start = time.time()
+    while time.time() - start < timeout:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def start_inference(args, authkey: str) -> multiprocessing.Process:
+    from backend.inference import serve_inference
+
+    inference = multiprocessing.Process(
+        target=serve_inference,
+        args=((INFERENCE_HOST, args.inference_port), authkey.encode(), args.model, args.batching),
+        name="speechlab-inference",
+        daemon=True,
+    )
+    inference.start()
+    return inference
+
+
+def main():
+    args = parse_args()
+    authkey = secrets.token_hex(16)
+
+    inference = start_inference(args, authkey)
+
+    if not wait_for_port(INFERENCE_HOST, args.inference_port):
+        print("[SpeechLab] ERROR: Inference backend failed to start.")
+        inference.kill()
+        sys.exit(1)
+
+    os.environ.update({
+        "SPEECHLAB_INFERENCE_ADDRESS": f"{INFERENCE_HOST}:{args.inference_port}",
+        "SPEECHLAB_INFERENCE_AUTHKEY": authkey,
+        "SPEECHLAB_MULTI_TENANT": "1",
+        "SPEECHLAB_WORKERS": str(args.workers),
+    })
+    web = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "backend.main:app",
+            "--host", args.host,
+            "--port", str(args.port),
+            "--workers", str(args.workers),
+            "--timeout-graceful-shutdown", str(args.graceful_timeout),
+            "--log-level", "warning",
+        ],
+        cwd=PROJECT_ROOT,
+        start_new_session=True,
+    )
+    print(f"[SpeechLab] Serving on http://{args.host}:{args.port} with {args.workers} workers")
+
+    stopping = False
+
+    def drain(signum, frame):
+        nonlocal stopping
+        if stopping:
+            return
+        stopping = True
+        print(f"[SpeechLab] Draining for {args.drain_seconds:.0f}s before shutdown...")
+        try:
+            from backend.inference import remote_backend
+
+            remote_backend().drain()
+        except Exception as e:
+            print(f"[SpeechLab] Could not mark inference backend as draining: {e!r}")
+        time.sleep(args.drain_seconds)
+        web.send_signal(signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, drain)
+    signal.signal(signal.SIGINT, drain)
+
+    code = web.wait()
+    inference.kill()
+    inference.join(timeout=10)
+    print("[SpeechLab] Shut down.")
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
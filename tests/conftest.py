@@ -0,0 +1,3 @@
+import os
+
+os.environ.setdefault("SPEECHLAB_SESSION_SECRET", "test-secret")
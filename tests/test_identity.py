@@ -0,0 +1,12 @@
+from backend import identity
+
+
+def test_signed_user_round_trips():
+    assert identity.verify_user(identity.sign_user("abc123")) == "abc123"
+
+
+def test_forged_or_bare_ids_are_rejected():
+    token = identity.sign_user("abc123")
+    assert identity.verify_user("someone-else" + token[len("abc123"):]) is None
+    assert identity.verify_user("abc123") is None
+    assert identity.verify_user(None) is None
@@ -0,0 +1,19 @@
+import pytest
+from backend import metrics
+from backend.metrics import MetricContext, MetricGroup, _run_group, register_metric_group
+
+
+def test_unknown_inputs_are_rejected_at_registration():
+    with pytest.raises(ValueError, match="unknown inputs"):
+        register_metric_group("bad_inputs", inputs=("pcmm",))(lambda ctx, results: {})
+    assert "bad_inputs" not in metrics.METRIC_GROUPS
+
+
+def test_group_cannot_read_undeclared_inputs():
+    ctx = MetricContext("hello there", 2.0, pcm=None)
+    declared = MetricGroup("declared", lambda ctx, results: {"n": len(ctx.tokens)}, ("tokens",))
+    undeclared = MetricGroup("undeclared", lambda ctx, results: {"d": ctx.duration}, ("tokens",))
+
+    assert _run_group(declared, ctx, {})[0] == {"n": 2}
+    with pytest.raises(AttributeError, match="without declaring input 'duration'"):
+        _run_group(undeclared, ctx, {})
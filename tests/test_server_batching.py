@@ -0,0 +1,65 @@
+import multiprocessing
+import os
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import loadtest
+import server
+from backend import main
+from backend.models import model_manager
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="the stub transcriber reaches the child by fork")
+def test_server_inference_process_batches_short_clips(monkeypatch):
+    loadtest.install_stub(rtf=0.2, slots=1)
+    args = server.parse_args(["--inference-port", str(_free_port())])
+    assert args.batching
+
+    authkey = "test-authkey"
+    inference = server.start_inference(args, authkey)
+    try:
+        assert server.wait_for_port(server.INFERENCE_HOST, args.inference_port)
+        monkeypatch.setenv("SPEECHLAB_INFERENCE_ADDRESS", f"{server.INFERENCE_HOST}:{args.inference_port}")
+        monkeypatch.setenv("SPEECHLAB_INFERENCE_AUTHKEY", authkey)
+        client = TestClient(main.app)
+        pcm = (np.sin(np.arange(16000 * 3) / 10) * 8000).astype("<i2").tobytes()
+
+        def analyze(_):
+            return client.post(
+                "/api/analyze",
+                files={"audio": ("clip.pcm", pcm, "application/octet-stream")},
+                data={"sample_rate": "16000"},
+            ).status_code
+
+        with ThreadPoolExecutor(4) as pool:
+            assert list(pool.map(analyze, range(4))) == [200] * 4
+
+        # A selection only this web worker knows about must not leak into /api/models.
+        monkeypatch.setattr(model_manager, "_selection", {"base": {"variant": "stale-worker-copy"}})
+        models = client.get("/api/models").json()
+        assert models["loaded"] == {"base": "stub", "medium": "stub"}
+        assert models["variants"]["sizes"]["base"]["selected"] != "stale-worker-copy"
+
+        health = client.get("/api/health").json()
+        assert health["ready"] and health["stage"] == "ready"
+
+        stats = client.get("/api/batching").json()
+        assert stats["requests"] == 4
+        assert 1 <= stats["batches"] < 4
+    finally:
+        inference.kill()
+        inference.join(timeout=10)
@@ -0,0 +1,18 @@
+from fastapi.testclient import TestClient
+from backend import main
+from backend.sessions import session_store
+
+
+def test_replace_keeps_history_when_lines_are_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_store, "legacy_file", str(tmp_path / "sessions.json"))
+    monkeypatch.setattr(session_store, "multi_tenant", False)
+    client = TestClient(main.app)
+    client.post("/api/sessions", json=[{"id": 1}, {"id": 2}])
+
+    assert client.post("/api/sessions/import?replace=true", content=b"not json\n").status_code == 422
+    assert client.post("/api/sessions/import?replace=true", content=b"").status_code == 422
+    assert [s["id"] for s in client.get("/api/sessions").json()] == [1, 2]
+
+    response = client.post("/api/sessions/import?replace=true", content=b'{"id": 3}\n')
+    assert response.status_code == 200
+    assert [s["id"] for s in client.get("/api/sessions").json()] == [3]
@@ -0,0 +1,51 @@
+import numpy as np
+from backend.acoustics import annotate_timeline
+from backend.metrics import compute_acoustic_metrics
+from backend.timeline import WordTimeline
+
+SAMPLE_RATE = 16000
+
+
+def _spoken_chunk() -> tuple[np.ndarray, WordTimeline]:
+    t = np.arange(2 * SAMPLE_RATE) / SAMPLE_RATE
+    pcm = (0.3 * np.sin(2 * np.pi * 180 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 4 * t))).astype(np.float32)
+    timeline = WordTimeline.from_words(
+        ["hello", "there", "world"], [0.1, 0.6, 1.2], [0.5, 1.1, 1.8], {"probability": [0.9, 0.3, 0.8]}
+    )
+    annotate_timeline(pcm, SAMPLE_RATE, timeline)
+    return pcm, timeline
+
+
+def test_concat_keeps_features_when_a_chunk_is_silent():
+    pcm, spoken = _spoken_chunk()
+    silent = WordTimeline.from_words([], [], [], {"probability": []})
+    annotate_timeline(np.zeros(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE, silent)
+
+    merged = WordTimeline.concat([spoken, silent], [0.0, 2.0])
+
+    assert set(merged.features) == set(spoken.features)
+    assert len(merged) == 3
+    np.testing.assert_array_equal(merged.features["rms_db"], spoken.features["rms_db"])
+
+
+def test_concat_fills_missing_columns_with_nan():
+    _, spoken = _spoken_chunk()
+    unannotated = WordTimeline.from_words(["again"], [0.2], [0.6], {"probability": [0.7]})
+
+    merged = WordTimeline.concat([spoken, unannotated], [0.0, 2.0])
+
+    assert np.isnan(merged.features["rms_db"][-1])
+    assert np.isfinite(merged.features["rms_db"][:-1]).all()
+
+
+def test_acoustic_metrics_survive_a_silent_chunk():
+    _, spoken = _spoken_chunk()
+    silent = WordTimeline.from_words([], [], [], {"probability": []})
+    unannotated = WordTimeline.from_words(["again"], [0.2], [0.6], {"probability": [0.7]})
+
+    metrics = compute_acoustic_metrics(WordTimeline.concat([spoken, silent, unannotated], [0.0, 2.0, 3.0]))
+
+    assert metrics["avg_word_confidence"] == 0.68
+    assert metrics["low_confidence_word_count"] == 1
+    assert metrics["volume_variability_db"] > 0
+    assert metrics["avg_syllable_rate"] > 0